@@ -0,0 +1,253 @@
+"""
+效能基準測試：在 SDL dummy 視訊驅動下跑固定情境，回報 ticks/s、fps 與記憶體配置，
+並與儲存的 baseline JSON 比較，速度下降超過容許範圍時以非 0 結束碼離開。
+
+    python -m benchmarks.run                 # 執行並與 benchmarks/baseline.json 比較
+    python -m benchmarks.run --save          # 以本次結果覆寫 baseline
+    python -m benchmarks.run --only storm    # 只跑名稱包含 storm 的情境
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.game.game_manager import GameManager
+from src.game.enemy_store import np
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.towers.machine_tower import MachineTower
+from src.entities.towers.cannon_tower import CannonTower
+from src.entities.towers.freeze_tower import FreezeTower
+from src.utils.constants import TILE_SIZE, SIM_DT, MAP_SIZE_EASY, MAP_SIZE_NORMAL, MAP_SIZE_HARD
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+MAPS = (("easy", MAP_SIZE_EASY), ("normal", MAP_SIZE_NORMAL), ("hard", MAP_SIZE_HARD))
+TOWER_CYCLE = (MachineTower, CannonTower, FreezeTower)
+SEED = 12345
+
+
+def make_game(difficulty, map_size, enemies, towers, screen=None, vectorized=False, scheduled=False):
+    """
+    建立固定情境：關掉出怪，沿路徑均勻放 enemies 隻不會死的敵人，
+    在最靠近路徑的格子蓋 towers 座塔
+    """
+    gm = GameManager(screen, map_size=map_size, difficulty=difficulty, headless=screen is None, seed=SEED,
+                     vectorized=vectorized, scheduled_projectiles=scheduled)
+    gm.wave_manager.update = lambda dt: None
+    gm.money = 10 ** 9
+    gm.life = 10 ** 9
+    mm = gm.map_manager
+    path = set(mm.path_tiles)
+    spots = sorted(mm.tower_spots, key=lambda rc: (
+        min(abs(rc[0] - r) + abs(rc[1] - c) for r, c in path), rc))
+    for i, (row, col) in enumerate(spots[:towers]):
+        pos = (col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+        gm.build_tower(pos, TOWER_CYCLE[i % len(TOWER_CYCLE)])
+    fill_enemies(gm, enemies)
+    return gm
+
+
+def fill_enemies(gm, count):
+    """
+    補滿敵人到 count 隻，新敵人依序分散在路徑上
+    """
+    path = gm.map_manager.path
+    start = gm.map_manager.path_tiles[0]
+    missing = count - len(gm.enemies)
+    for i in range(missing):
+        enemy = gm.spawn_enemy(BasicEnemy, start)
+        enemy.hp = enemy.max_hp = 10 ** 9
+        enemy.distance = path.exit_distance * (i / max(missing, 1)) * 0.95
+
+
+def measure_alloc(fn):
+    """
+    以 tracemalloc 量測 fn() 的記憶體尖峰與淨新增區塊數
+    """
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    tracemalloc.reset_peak()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename") if stat.count_diff > 0)
+    return {"alloc_peak_kb": round(peak / 1024, 1), "alloc_blocks": blocks}
+
+
+def sim_scenario(difficulty, map_size, enemies, towers, ticks, vectorized=False):
+    def run(gm, n):
+        elapsed = 0.0
+        for _ in range(n):
+            start = time.perf_counter()
+            gm.update(SIM_DT)
+            elapsed += time.perf_counter() - start
+            if len(gm.enemies) < enemies:
+                fill_enemies(gm, enemies)  # 補怪不計入時間
+        return elapsed
+
+    def bench():
+        gm = make_game(difficulty, map_size, enemies, towers, vectorized=vectorized)
+        run(gm, 10)  # 暖身
+        elapsed = run(gm, ticks)
+        result = {"rate": round(ticks / elapsed, 1), "unit": "ticks/s"}
+        gm2 = make_game(difficulty, map_size, enemies, towers, vectorized=vectorized)
+        result.update(measure_alloc(lambda: run(gm2, max(1, ticks // 4))))
+        return result
+    return bench
+
+
+def projectile_storm(ticks, scheduled=False):
+    def bench():
+        gm = make_game("normal", MAP_SIZE_NORMAL, 300, 80, scheduled=scheduled)
+        for tower in gm.towers:
+            tower.attack_speed = 0.05  # 每座塔每秒 20 發
+        for _ in range(30):
+            gm.update(SIM_DT)
+        start = time.perf_counter()
+        peak = 0
+        for _ in range(ticks):
+            gm.update(SIM_DT)
+            peak = max(peak, gm.entity_counts()["projectiles"])
+        elapsed = time.perf_counter() - start
+        result = {"rate": round(ticks / elapsed, 1), "unit": "ticks/s", "peak_projectiles": peak}
+        result.update(measure_alloc(lambda: [gm.update(SIM_DT) for _ in range(max(1, ticks // 4))]))
+        return result
+    return bench
+
+
+def render_full(frames):
+    def bench():
+        rows, cols = MAP_SIZE_HARD
+        screen = pygame.display.set_mode((cols * TILE_SIZE, rows * TILE_SIZE))
+        gm = make_game("hard", MAP_SIZE_HARD, 500, 40, screen=screen)
+        gm.draw()  # 第一次會建立背景快取
+        start = time.perf_counter()
+        for _ in range(frames):
+            gm.draw()
+        elapsed = time.perf_counter() - start
+        result = {"rate": round(frames / elapsed, 1), "unit": "fps"}
+        result.update(measure_alloc(lambda: [gm.draw() for _ in range(max(1, frames // 4))]))
+        return result
+    return bench
+
+
+def render_camera(frames, map_size=(100, 150)):
+    def bench():
+        screen = pygame.display.set_mode((1280, 800))
+        gm = make_game("hard", map_size, 2000, 100, screen=screen)
+        gm.camera.pan(2000, 1500)  # 捲到地圖中間，只畫可見範圍
+        gm.draw()
+        start = time.perf_counter()
+        for i in range(frames):
+            gm.camera.pan(4 if i % 60 < 30 else -4, 0)
+            gm.draw()
+        elapsed = time.perf_counter() - start
+        result = {"rate": round(frames / elapsed, 1), "unit": "fps"}
+        result.update(measure_alloc(lambda: [gm.draw() for _ in range(max(1, frames // 4))]))
+        return result
+    return bench
+
+
+def spawn_burst(count):
+    def bench():
+        def burst():
+            gm = make_game("normal", MAP_SIZE_NORMAL, 0, 0)
+            start_tile = gm.map_manager.path_tiles[0]
+            start = time.perf_counter()
+            for _ in range(count):
+                gm.spawn_enemy(BasicEnemy, start_tile)
+            gm.update(SIM_DT)
+            return time.perf_counter() - start
+        elapsed = burst()
+        result = {"rate": round(count / elapsed, 1), "unit": "spawns/s"}
+        result.update(measure_alloc(burst))
+        return result
+    return bench
+
+
+def scenarios(scale=1.0):
+    ticks = max(10, int(300 * scale))
+    found = {}
+    for name, map_size in MAPS:
+        for enemies, towers in ((100, 10), (1000, 40)):
+            found[f"sim_{name}_{enemies}x{towers}"] = sim_scenario(name, map_size, enemies, towers, ticks)
+    # 塔多、敵人少：大部分塔冷卻中或停放
+    found["sim_hard_100x300"] = sim_scenario("hard", MAP_SIZE_HARD, 100, 300, ticks)
+    if np is not None:
+        found["sim_normal_10000x40_vectorized"] = sim_scenario("normal", MAP_SIZE_NORMAL, 10000, 40, ticks,
+                                                               vectorized=True)
+    found["projectile_storm"] = projectile_storm(ticks)
+    found["projectile_storm_scheduled"] = projectile_storm(ticks, scheduled=True)
+    found["render_full"] = render_full(max(10, int(120 * scale)))
+    found["render_camera_100x150"] = render_camera(max(10, int(120 * scale)))
+    found["spawn_burst"] = spawn_burst(max(100, int(2000 * scale)))
+    return found
+
+
+def compare(results, baseline, tolerance):
+    """
+    回傳退步的情境說明；rate 低於 baseline*(1-tolerance) 或記憶體尖峰高於 baseline*(1+tolerance) 即算退步
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if result["rate"] < base["rate"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['rate']} {result['unit']} < baseline {base['rate']}")
+        if "alloc_peak_kb" in base and result["alloc_peak_kb"] > base["alloc_peak_kb"] * (1 + tolerance) + 64:
+            regressions.append(f"{name}: 記憶體尖峰 {result['alloc_peak_kb']} KB > baseline {base['alloc_peak_kb']} KB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="塔防遊戲效能基準測試")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON 路徑")
+    parser.add_argument("--save", action="store_true", help="把本次結果寫入 baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="容許的退步比例")
+    parser.add_argument("--only", default=None, help="只跑名稱包含此字串的情境")
+    parser.add_argument("--scale", type=float, default=1.0, help="情境長度倍率（<1 可快速檢查）")
+    parser.add_argument("--repeat", type=int, default=3, help="每個情境重複次數，取最快的一次")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    results = {}
+    for name, bench in scenarios(args.scale).items():
+        if args.only and args.only not in name:
+            continue
+        runs = [bench() for _ in range(args.repeat)]
+        results[name] = max(runs, key=lambda r: r["rate"])
+        r = results[name]
+        print(f"{name:<34} {r['rate']:>10.1f} {r['unit']:<9} peak {r['alloc_peak_kb']:>8.1f} KB  "
+              f"blocks {r['alloc_blocks']}")
+    pygame.quit()
+
+    if args.save:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"已寫入 {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print("找不到 baseline，略過比較（可用 --save 建立）")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    for line in regressions:
+        print("退步:", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
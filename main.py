@@ -6,48 +6,161 @@ SRC_PATH = os.path.join(os.path.dirname(__file__), "src")
 if SRC_PATH not in sys.path:
     sys.path.insert(0, SRC_PATH)
 
+import argparse
+import math
 import pygame
 from src.game.game_manager import GameManager
+from src.game.replay import Replay, ReplayRecorder, ReplayPlayer
+from src.game.simulator import HeadlessSimulator
+from src.game import snapshot
+from src.game.map_compiler import load_map, MapFormatError
+from src.game.spawn_scheduler import load_waves
 from src.ui.menu import MainMenu
-from src.utils.constants import TILE_SIZE, FPS
-from src.utils.audio_manager import AudioManager 
+from src.utils.constants import TILE_SIZE, FPS, MAX_SIM_STEPS_PER_FRAME, MAX_WINDOW_WIDTH, MAX_WINDOW_HEIGHT
+from src.utils.audio_manager import create_audio_manager
+from src.utils.profiler import FrameProfiler
+
+PROFILE_KEY = pygame.K_F3  # 切換效能疊加資訊
+PROFILE_DIR = "profiles"   # 結束時匯出逐幀資料的位置
+QUICKSAVE_KEY = pygame.K_F5  # 快速存檔
+QUICKSAVE_PATH = os.path.join("saves", "quicksave.bin")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tower Defense OOP Project")
+    parser.add_argument("--seed", type=int, default=None, help="指定亂數種子（相同種子與操作會得到相同結果）")
+    parser.add_argument("--record", metavar="FILE", help="把這一局的操作錄成重播檔")
+    parser.add_argument("--replay", metavar="FILE", help="播放重播檔")
+    parser.add_argument("--map-size", metavar="ROWSxCOLS",
+                        help="自訂地圖格數，例如 100x150（仍需在選單選難度；依難度產生路徑，不可小於內建地圖）")
+    parser.add_argument("--map", metavar="FILE", help="使用自訂地圖檔（JSON，格式見 assets/maps）")
+    parser.add_argument("--waves", metavar="FILE", help="使用自訂波次檔（JSON，範例見 assets/waves）")
+    parser.add_argument("--scheduled-projectiles", action="store_true",
+                        help="投射物發射時即預排命中時間，飛行中不逐幀追蹤（大量砲塔時較快，結果為近似）")
+    parser.add_argument("--load", metavar="FILE", help="從存檔繼續遊戲（F5 快速存檔）")
+    parser.add_argument("--speed", type=float, default=1.0,
+                        help="重播的時間倍率；0 表示不開視窗以最快速度跑完")
+    return parser.parse_args(argv)
+
+def run_headless_replay(replay):
+    sim = HeadlessSimulator.from_replay(replay)
+    result = sim.run_replay()
+    print(", ".join(f"{key}={value}" for key, value in result.items()))
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        play(args)
+    except MapFormatError as e:
+        # 地圖檔格式錯誤，或指定的地圖大小無法產生合法路徑
+        pygame.quit()
+        print(f"無法載入地圖: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+def play(args):
+    replay = Replay.load(args.replay) if args.replay else None
+    if replay is not None and args.speed <= 0:
+        run_headless_replay(replay)
+        return
+    # 自訂地圖在開視窗前先讀，格式錯誤時不必等選單
+    custom_map = load_map(args.map) if args.map and not args.load and replay is None else None
+    # 讀檔與重播時改用存檔、重播檔中的波次
+    waves = load_waves(args.waves) if args.waves and not args.load and replay is None else None
+    scheduled_projectiles = args.scheduled_projectiles
 
-def main():
     pygame.init()
-    pygame.mixer.init() 
     # 預設小視窗顯示主選單
     dummy_screen = pygame.display.set_mode((800, 600))
     menu = MainMenu(dummy_screen)
-    difficulty, map_size = menu.run()  # map_size = (rows, cols)
+    saved = None
+    if args.load:
+        with open(args.load, "rb") as f:
+            saved = f.read()
+        difficulty, map_size, _ = snapshot.read_settings(saved)
+    elif replay is not None:
+        difficulty, map_size = replay.difficulty, replay.map_size  # 重播時沿用錄製時的設定
+        custom_map = replay.map
+        waves = replay.waves
+        scheduled_projectiles = replay.scheduled_projectiles
+    else:
+        difficulty, map_size = menu.run()  # map_size = (rows, cols)
+        if args.map_size:
+            map_size = tuple(int(n) for n in args.map_size.lower().split("x"))
+        if custom_map is not None:
+            map_size = (custom_map.rows, custom_map.cols)
     rows, cols = map_size
 
-    # 根據地圖格數動態設置視窗大小
-    SCREEN_WIDTH = cols * TILE_SIZE
-    SCREEN_HEIGHT = rows * TILE_SIZE
+    # 根據地圖格數動態設置視窗大小，超過上限時改用鏡頭捲動
+    SCREEN_WIDTH = min(cols * TILE_SIZE, MAX_WINDOW_WIDTH)
+    SCREEN_HEIGHT = min(rows * TILE_SIZE, MAX_WINDOW_HEIGHT)
 
     # 以新尺寸重新建立遊戲主視窗
     screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
     pygame.display.set_caption("Tower Defense OOP Project")
     clock = pygame.time.Clock()
     
-    audio_manager = AudioManager()
+    audio_manager = create_audio_manager()  # 沒有音效裝置時不出聲
+    profiler = FrameProfiler()
+    seed = replay.seed if replay is not None else args.seed
     # 遊戲主迴圈
-    game_manager = GameManager(screen, map_size=map_size, difficulty=difficulty, audio_manager=audio_manager)
+    if saved is not None:
+        game_manager = snapshot.loads(saved, screen, audio_manager=audio_manager, dirty_rects=True, profiler=profiler)
+    else:
+        game_manager = GameManager(screen, map_size=map_size, difficulty=difficulty, audio_manager=audio_manager,
+                                   seed=seed, dirty_rects=True, profiler=profiler, map_file=custom_map,
+                                   waves=waves,
+                                   scheduled_projectiles=scheduled_projectiles)
+    speed = 1.0
+    if replay is not None:
+        game_manager.input_source = ReplayPlayer(replay)
+        speed = args.speed
+        # 加速播放時每幀要跑更多 tick
+        game_manager.clock.max_steps = max(MAX_SIM_STEPS_PER_FRAME, math.ceil(speed) * 2)
+    elif args.record:
+        game_manager.recorder = ReplayRecorder(game_manager)
     running = True
     while running:
-        dt = clock.tick(FPS) / 1000  # 每幀秒數
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                running = False
-            game_manager.handle_event(event)
-        game_manager.update(dt)
-        game_manager.draw()
-        pygame.display.flip()
+        frame_dt = clock.tick(FPS) / 1000  # 每幀秒數（只用來累加，模擬一律以固定步長執行）
+        profiler.begin_frame()
+        with profiler.section("events"):
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
+                elif event.type == pygame.KEYDOWN and event.key == PROFILE_KEY:
+                    profiler.toggle()
+                    game_manager.renderer.invalidate()
+                    continue
+                elif event.type == pygame.KEYDOWN and event.key == QUICKSAVE_KEY:
+                    os.makedirs(os.path.dirname(QUICKSAVE_PATH), exist_ok=True)
+                    snapshot.save(game_manager, QUICKSAVE_PATH)
+                    continue
+                if replay is None:  # 重播時不接受玩家操作
+                    game_manager.handle_event(event)
+        game_manager.camera.update_keys(pygame.key.get_pressed(), frame_dt)
+        game_manager.advance(frame_dt * speed)
+        dirty = game_manager.draw()
+        if profiler.visible:
+            profiler.draw_overlay(screen)
+            game_manager.renderer.invalidate()  # 疊加資訊蓋住的區域下一幀需整個重畫
+            dirty = None
+        with profiler.section("flip"):
+            if dirty is None:
+                pygame.display.flip()
+            else:
+                pygame.display.update(dirty)  # 只更新有變動的區域
+        profiler.end_frame(**game_manager.entity_counts())
+        if replay is not None and game_manager.input_source.finished(game_manager):
+            running = False
         if game_manager.is_game_over():
             menu.show_game_over(game_manager.get_final_score())
             running = False
 
+    if game_manager.recorder is not None:
+        game_manager.recorder.save(args.record)
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.export(os.path.join(PROFILE_DIR, "frames.csv"))
+    profiler.export(os.path.join(PROFILE_DIR, "frames.json"))
     pygame.quit()
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,14 +1,20 @@
 import pygame
 
 class BaseEntity(pygame.sprite.Sprite):
-    def __init__(self, x, y, image=None, hp=1):
+    def __init__(self, x, y, image=None, hp=1, size=None):
         super().__init__()
         self.x = x
         self.y = y
         self.hp = hp
         self.max_hp = hp
-        self.image = image if image else pygame.Surface((32, 32))
-        self.rect = self.image.get_rect(center=(x, y))
+        if size is not None:
+            # 指定 size 時 rect 以 size 為準（圖片可較小）；無畫面模式下 image 為 None
+            self.image = image
+            self.rect = pygame.Rect((0, 0), size)
+            self.rect.center = (x, y)
+        else:
+            self.image = image if image else pygame.Surface((32, 32))
+            self.rect = self.image.get_rect(center=(x, y))
         self.alive = True
 
     def update(self, dt):
@@ -17,11 +23,19 @@ class BaseEntity(pygame.sprite.Sprite):
         """
         pass
 
-    def draw(self, surface):
+    def draw(self, surface, offset=(0, 0)):
         """
-        畫出物件（僅本體，血條在子類覆寫）
+        畫出物件（僅本體，血條在子類覆寫）；offset 為世界座標到 surface 的位移（鏡頭用）
         """
-        surface.blit(self.image, self.rect.topleft)
+        surface.blit(self.image, (self.rect.x + offset[0], self.rect.y + offset[1]))
+
+    def draw_bounds(self):
+        """
+        draw() 實際畫到的範圍（圖片可能比 rect 大），髒矩形更新時使用
+        """
+        if self.image is None:
+            return self.rect.copy()
+        return self.rect.union(self.image.get_rect(topleft=self.rect.topleft))
 
     def take_damage(self, dmg):
         """
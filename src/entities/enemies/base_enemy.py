@@ -1,12 +1,17 @@
+import os
 import pygame
 from src.entities.base_entity import BaseEntity
 from src.utils.constants import TILE_SIZE  # 改為引入專案的 TILE_SIZE
+from src.utils.helpers import is_headless, load_image, render_text
+from src.game.path import PathPolyline
+from src.game.status_effects import EFFECT_SLOW
 
 class BaseEnemy(BaseEntity):
     name = "BaseEnemy"
     base_speed = 60  # pix/sec
     base_hp = 30
     reward = 10
+    image_name = None  # assets/images/enemies 下的圖檔，None 時畫預設圓形
 
     def __init__(self, start_tile, game_manager):
         difficulty = getattr(game_manager, "difficulty", "normal")
@@ -21,19 +26,29 @@ class BaseEnemy(BaseEntity):
             self.hp_default = self.base_hp
         x = start_tile[1] * TILE_SIZE + TILE_SIZE // 2
         y = start_tile[0] * TILE_SIZE + TILE_SIZE // 2
-        image = pygame.Surface((TILE_SIZE - 6, TILE_SIZE - 6), pygame.SRCALPHA)
-        pygame.draw.circle(
-            image,
-            (180, 80, 80),
-            ((TILE_SIZE - 6) // 2, (TILE_SIZE - 6) // 2),
-            (TILE_SIZE - 6) // 2
-        )
-        super().__init__(x, y, image, self.hp_default)
+        size = (TILE_SIZE - 6, TILE_SIZE - 6)
+        if is_headless(game_manager):
+            image = None
+        elif self.image_name:
+            image = load_image(os.path.join("assets", "images", "enemies", self.image_name), (24, 24))
+        else:
+            image = pygame.Surface(size, pygame.SRCALPHA)
+            pygame.draw.circle(
+                image,
+                (180, 80, 80),
+                ((TILE_SIZE - 6) // 2, (TILE_SIZE - 6) // 2),
+                (TILE_SIZE - 6) // 2
+            )
+        super().__init__(x, y, image, self.hp_default, size=size)
         self.game_manager = game_manager
-        self.path = list(game_manager.map_manager.path_tiles) if hasattr(game_manager, "map_manager") else []
-        self.target_idx = 0
-        self.slow_timer = 0
-        self.slow_ratio = 1.0  # 初始化
+        self.path = self.get_path(game_manager)  # 所有敵人共用同一條編譯好的路徑
+        self.distance = 0.0  # 沿路徑已走的距離
+        # 狀態效果由 StatusEffects 管理，效果改變時才更新下面兩個倍率
+        self.speed_factor = 1.0
+        self.damage_taken = 1.0
+        self.spawn_id = 0
+        self.grid_cell = None
+        self.enemy_grid = getattr(game_manager, "enemy_grid", None)
 
 
     def update(self, dt):
@@ -44,40 +59,42 @@ class BaseEnemy(BaseEntity):
         else:
             move_speed = self.speed
         '''
-        if self.slow_timer > 0:
-            move_speed = self.speed * self.slow_ratio
-            self.slow_timer -= dt
-            if self.slow_timer <= 0:
-                self.slow_ratio = 1.0  # 恢復正常速度
-        else:
-            move_speed = self.speed
-            
-        if self.target_idx >= len(self.path):
+        move_speed = self.speed * self.speed_factor  # 減速、暈眩已反映在倍率中
+        if self.path is None or self.distance >= self.path.length:
             return
-        target_tile = self.path[self.target_idx]
-        target_x = target_tile[1] * TILE_SIZE + TILE_SIZE // 2
-        target_y = target_tile[0] * TILE_SIZE + TILE_SIZE // 2
-        dx, dy = target_x - self.x, target_y - self.y
-        dist = (dx * dx + dy * dy) ** 0.5
-        if dist < move_speed * dt:
-            self.x, self.y = target_x, target_y
-            self.target_idx += 1
-        else:
-            self.x += dx / dist * move_speed * dt
-            self.y += dy / dist * move_speed * dt
+        self.distance = min(self.distance + move_speed * dt, self.path.length)
+        self.x, self.y = self.path.position_at(self.distance)
         self.rect.center = (self.x, self.y)
+        if self.enemy_grid is not None:
+            self.enemy_grid.move(self)
+
+    @staticmethod
+    def get_path(game_manager):
+        map_manager = getattr(game_manager, "map_manager", None)
+        if map_manager is None:
+            return None
+        path = getattr(map_manager, "path", None)
+        if path is None:
+            path = PathPolyline.from_tiles(map_manager.path_tiles)
+        return path
+
+    def kill(self):
+        super().kill()
+        if self.enemy_grid is not None:
+            self.enemy_grid.remove(self)
 
     def get_hp_percent(self):
         return self.hp / self.max_hp if self.max_hp > 0 else 0
 
-    def draw(self, surface):
+    def draw(self, surface, offset=(0, 0)):
         # 畫敵人本體
-        surface.blit(self.image, self.rect.topleft)
+        rect = self.rect.move(offset)
+        surface.blit(self.image, rect.topleft)
         # 血條座標與尺寸
-        bar_width = self.rect.width
+        bar_width = rect.width
         bar_height = 7
-        bar_x = self.rect.x
-        bar_y = self.rect.y - 12
+        bar_x = rect.x
+        bar_y = rect.y - 12
 
         # 血條底
         pygame.draw.rect(surface, (100, 100, 100), (bar_x, bar_y, bar_width, bar_height))
@@ -86,13 +103,17 @@ class BaseEnemy(BaseEntity):
         pygame.draw.rect(surface, (220, 30, 30), (bar_x, bar_y, int(bar_width * percent), bar_height))
 
         # 顯示百分比數字
-        font = pygame.font.SysFont("Arial", 12)
-        percent_txt = font.render(f"{int(percent * 100)}%", True, (255, 255, 255))
-        txt_rect = percent_txt.get_rect(center=(self.rect.centerx, bar_y + bar_height // 2))
+        percent_txt = render_text(f"{int(percent * 100)}%", 12, (255, 255, 255), "Arial", sysfont=True)
+        txt_rect = percent_txt.get_rect(center=(rect.centerx, bar_y + bar_height // 2))
         surface.blit(percent_txt, txt_rect)
 
+    def draw_bounds(self):
+        # 加上本體上方的血條與百分比文字
+        bounds = super().draw_bounds()
+        return bounds.union((bounds.x, self.rect.y - 20, bounds.width, 20))
+
     def take_damage(self, dmg):
-        super().take_damage(dmg)
+        super().take_damage(dmg * self.damage_taken)
         if self.hp <= 0 and hasattr(self.game_manager, "earn_money"):
             if hasattr(self.game_manager, "audio_manager"):
                 self.game_manager.audio_manager.play("enemy_die")
@@ -101,9 +122,15 @@ class BaseEnemy(BaseEntity):
     
     # base_enemy.py
     def slow(self, slow_ratio, t):
+        self.add_effect(EFFECT_SLOW, slow_ratio, t)
 
-        self.slow_ratio = min(self.slow_ratio, slow_ratio)
-        self.slow_timer = max(self.slow_timer, t)
+    def add_effect(self, kind, magnitude, duration):
+        """
+        施加狀態效果（由遊戲的 StatusEffects 管理計時與疊加）
+        """
+        status_effects = getattr(self.game_manager, "status_effects", None)
+        if status_effects is not None:
+            status_effects.apply(self, kind, magnitude, duration)
 
     def get_map_grid_pos(self):
         return (int(self.y) // TILE_SIZE, int(self.x) // TILE_SIZE)
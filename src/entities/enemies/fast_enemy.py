@@ -1,5 +1,3 @@
-import pygame
-import os
 from src.entities.enemies.base_enemy import BaseEnemy
 
 class FastEnemy(BaseEnemy):
@@ -7,10 +5,4 @@ class FastEnemy(BaseEnemy):
     base_speed = 110
     base_hp = 20
     reward = 12
-
-    def __init__(self, start_tile, game_manager):
-        super().__init__(start_tile, game_manager)
-        img_path = os.path.join("assets", "images", "enemies", "enemy_fast.png")
-        image = pygame.image.load(img_path).convert_alpha()
-        image = pygame.transform.scale(image, (24, 24))
-        self.image = image
+    image_name = "enemy_fast.png"
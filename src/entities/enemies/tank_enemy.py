@@ -1,5 +1,3 @@
-import pygame
-import os
 from src.entities.enemies.base_enemy import BaseEnemy
 
 
@@ -8,10 +6,4 @@ class TankEnemy(BaseEnemy):
     base_speed = 35
     base_hp = 90
     reward = 22
-
-    def __init__(self, start_tile, game_manager):
-        super().__init__(start_tile, game_manager)
-        img_path = os.path.join("assets", "images", "enemies", "enemy_tank.png")
-        image = pygame.image.load(img_path).convert_alpha()
-        image = pygame.transform.scale(image, (24, 24))
-        self.image = image
+    image_name = "enemy_tank.png"
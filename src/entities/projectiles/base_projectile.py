@@ -1,18 +1,67 @@
-
 import pygame
 from src.entities.base_entity import BaseEntity
+from src.utils.helpers import is_headless, cached_surface
 
 class BaseProjectile(BaseEntity):
     speed = 320
     piercing = False
+    status_effects = ()  # 命中時施加的狀態效果 ((種類, 強度, 秒數), ...)
+    pool_size = 256  # 每種投射物最多保留的閒置物件數
+    _pool = []  # 閒置物件池，每個子類別各自一份（見 __init_subclass__）
 
-    def __init__(self, x, y, target, damage, game_manager):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._pool = []
+
+    @classmethod
+    def spawn(cls, x, y, target, damage, game_manager):
+        """
+        從物件池取出投射物重新使用，池中沒有時才新建
+        """
+        if cls._pool:
+            projectile = cls._pool.pop()
+            projectile.reset(x, y, target, damage, game_manager)
+            return projectile
+        return cls(x, y, target, damage, game_manager)
+
+    @classmethod
+    def build_image(cls):
         image = pygame.Surface((12, 12), pygame.SRCALPHA)
         pygame.draw.circle(image, (200, 200, 200), (6, 6), 6)
-        super().__init__(x, y, image)
+        return image
+
+    @classmethod
+    def get_image(cls):
+        # 同類投射物共用一張圖
+        return cached_surface(("projectile", cls), cls.build_image)
+
+    def __init__(self, x, y, target, damage, game_manager):
+        super().__init__(x, y, None, size=(12, 12))
+        self.reset(x, y, target, damage, game_manager)
+
+    def reset(self, x, y, target, damage, game_manager):
+        self.x = x
+        self.y = y
+        self.rect.center = (x, y)
         self.target = target
         self.damage = damage
         self.game_manager = game_manager
+        # 物件池跨遊戲共用，圖片依當下的 game_manager 重新取得
+        self.image = None if is_headless(game_manager) else self.get_image()
+        self.alive = True
+        self.pooled = False
+
+    def kill(self):
+        super().kill()
+        if self.pooled:
+            return
+        # 放回物件池，並放掉對目標與遊戲的參考（物件池跨遊戲共用，不可讓結束的遊戲留在記憶體中）
+        self.pooled = True
+        self.target = None
+        self.game_manager = None
+        pool = type(self)._pool
+        if len(pool) < self.pool_size:
+            pool.append(self)
 
     def update(self, dt):
         if not self.target or not self.target.is_alive():
@@ -33,3 +82,6 @@ class BaseProjectile(BaseEntity):
 
     def on_hit(self, target):
         target.take_damage(self.damage)
+        if self.status_effects and hasattr(target, "add_effect"):
+            for kind, magnitude, duration in self.status_effects:
+                target.add_effect(kind, magnitude, duration)
@@ -6,14 +6,19 @@ class CannonBall(BaseProjectile):
     piercing = False
     splash_radius = 32
 
-    def __init__(self, x, y, target, damage, game_manager):
-        super().__init__(x, y, target, damage, game_manager)
-        image = pygame.Surface((16, 16), pygame.SRCALPHA)
-        pygame.draw.circle(self.image, (255, 0, 0), (8, 8), 8)
-        
+    @classmethod
+    def build_image(cls):
+        image = super().build_image()
+        pygame.draw.circle(image, (255, 0, 0), (8, 8), 8)
+        return image
 
     def on_hit(self, target):
         # 範圍傷害
+        grid = getattr(self.game_manager, "enemy_grid", None)
+        if grid is not None:
+            for enemy in grid.query_circle(self.x, self.y, self.splash_radius):
+                enemy.take_damage(self.damage)
+            return
         for enemy in self.game_manager.enemies:
             dx = enemy.x - self.x
             dy = enemy.y - self.y
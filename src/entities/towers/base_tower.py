@@ -1,6 +1,11 @@
+import os
 import pygame
 from src.entities.base_entity import BaseEntity
 from src.utils.constants import TILE_SIZE
+from src.utils.helpers import is_headless, load_image
+
+# 目標選擇方式：first 走最遠、last 走最少、strongest 血量最高
+TARGET_MODES = ("first", "last", "strongest")
 
 class BaseTower(BaseEntity):
     name = "BaseTower"
@@ -12,14 +17,42 @@ class BaseTower(BaseEntity):
     upgrade_cost_base = 40
     upgrade_damage = 8
     upgrade_attack_speed = 0.12  # 每級攻速提升（秒變短）
+    image_names = None  # (1 級圖檔, 2 級以上圖檔)，位於 assets/images/towers
+    target_mode = "first"
 
     def __init__(self, x, y, game_manager):
-        image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-        pygame.draw.circle(image, (120, 120, 120), (TILE_SIZE//2, TILE_SIZE//2), TILE_SIZE//2)
-        super().__init__(x, y, image)
+        if is_headless(game_manager) or self.image_names:
+            image = None  # 有圖檔的塔由 set_image 設定
+        else:
+            image = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+            pygame.draw.circle(image, (120, 120, 120), (TILE_SIZE//2, TILE_SIZE//2), TILE_SIZE//2)
+        super().__init__(x, y, image, size=(TILE_SIZE, TILE_SIZE))
         self.game_manager = game_manager
         self.attack_cooldown = 0
         self.level = 1
+        self.update_coverage()
+        if self.image_names:
+            self.set_image()
+
+    def update_coverage(self):
+        """
+        預先算出射程涵蓋的路徑進度區間（塔不會移動，只有射程改變時才需重算）
+        """
+        map_manager = getattr(self.game_manager, "map_manager", None)
+        path = getattr(map_manager, "path", None)
+        self.coverage = path.coverage(self.x, self.y, self.range) if path is not None else None
+
+    def set_image(self):
+        """
+        依等級換圖（圖片由快取取得，建塔/升級不再重複讀檔）
+        """
+        if is_headless(self.game_manager):
+            self.rect = pygame.Rect(0, 0, 24, 24)
+            self.rect.center = (self.x, self.y)
+            return
+        imgname = self.image_names[0] if self.level == 1 else self.image_names[1]
+        self.image = load_image(os.path.join("assets", "images", "towers", imgname), (24, 24))
+        self.rect = self.image.get_rect(center=(self.x, self.y))
 
     def update(self, dt):
         self.attack_cooldown -= dt
@@ -30,10 +63,25 @@ class BaseTower(BaseEntity):
                 self.attack_cooldown = self.attack_speed
 
     def find_target(self):
-        for enemy in self.game_manager.enemies:
-            if self.distance_to(enemy) <= self.range:
-                return enemy
-        return None
+        index = getattr(self.game_manager, "progress_index", None)
+        if index is not None and self.coverage is not None:
+            if not self.coverage:
+                return None
+            return getattr(index, self.target_mode)(self.coverage)
+        grid = getattr(self.game_manager, "enemy_grid", None)
+        if grid is None:
+            r2 = self.range * self.range
+            for enemy in self.game_manager.enemies:
+                dx = self.x - enemy.x
+                dy = self.y - enemy.y
+                if dx*dx + dy*dy <= r2:
+                    return enemy
+            return None
+        # 只查與射程圓重疊的格子，取最早出場的敵人（與逐一掃描 group 的結果相同）
+        candidates = grid.query_circle(self.x, self.y, self.range)
+        if not candidates:
+            return None
+        return min(candidates, key=lambda enemy: enemy.spawn_id)
 
     def shoot(self, target):
         pass  # 子類覆寫
@@ -43,6 +91,11 @@ class BaseTower(BaseEntity):
         dy = self.y - entity.y
         return (dx*dx + dy*dy) ** 0.5
 
+    def play_sound(self, name):
+        audio_manager = getattr(self.game_manager, "audio_manager", None)
+        if audio_manager is not None:
+            audio_manager.play(name)
+
     def can_upgrade(self):
         return self.level < self.max_level
 
@@ -55,7 +108,9 @@ class BaseTower(BaseEntity):
             self.level += 1
             self.damage += self.upgrade_damage
             self.attack_speed = max(0.1, self.attack_speed - self.upgrade_attack_speed)
-            self.game_manager.audio_manager.play("upgrade")
-            # 可增加升級動畫或音效
+            self.update_coverage()  # 升級若改變射程，涵蓋區間需重算
+            self.play_sound("upgrade")
+            if self.image_names:
+                self.set_image()  # 升級時自動換圖
             return True
         return False
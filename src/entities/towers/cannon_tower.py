@@ -1,5 +1,3 @@
-import pygame
-import os
 from src.entities.towers.base_tower import BaseTower
 from src.entities.projectiles.cannon_ball import CannonBall
 
@@ -13,6 +11,7 @@ class CannonTower(BaseTower):
     upgrade_cost_base = 100
     upgrade_damage = 15
     upgrade_attack_speed = 0.1
+    image_names = ("cannon_tower.png", "cannon_tower_lv2.png")
     '''
     def __init__(self, x, y, game_manager):
         image = pygame.Surface((40, 40), pygame.SRCALPHA)
@@ -30,28 +29,7 @@ class CannonTower(BaseTower):
         self.image = image
         self.rect = self.image.get_rect(center=(x, y))
     '''   
-    def __init__(self, x, y, game_manager):
-        self.level = 1
-        super().__init__(x, y, game_manager)
-        self.set_image()
-
-    def set_image(self):
-        if self.level == 1:
-            imgname = "cannon_tower.png"
-        elif self.level >= 2:
-            imgname = "cannon_tower_lv2.png"
-        img_path = os.path.join("assets", "images", "towers", imgname)
-        image = pygame.image.load(img_path).convert_alpha()
-        image = pygame.transform.scale(image, (24, 24))
-        self.image = image
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-
-    def upgrade(self):
-        if super().upgrade():
-            self.set_image()  # 升級時自動換圖
-            return True
-        return False
     def shoot(self, target):
-        ball = CannonBall(self.x, self.y, target, self.damage, self.game_manager)
+        ball = CannonBall.spawn(self.x, self.y, target, self.damage, self.game_manager)
         self.game_manager.add_projectile(ball)
-        self.game_manager.audio_manager.play("shoot_cannon")
+        self.play_sound("shoot_cannon")
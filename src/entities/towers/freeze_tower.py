@@ -1,7 +1,5 @@
-import pygame
 from src.entities.towers.base_tower import BaseTower
 from src.entities.projectiles.ice_ball import IceBall
-import os
 
 class FreezeTower(BaseTower):
     name = "Freeze Tower"
@@ -13,6 +11,7 @@ class FreezeTower(BaseTower):
     upgrade_cost_base = 60
     upgrade_damage = 5
     upgrade_attack_speed = 0.12
+    image_names = ("freeze_tower.png", "freeze_tower_lv2.png")
     '''
     def __init__(self, x, y, game_manager):
         img_path = os.path.join("assets", "images", "towers", "freeze_tower.png")
@@ -22,33 +21,10 @@ class FreezeTower(BaseTower):
         self.image = image
         self.rect = self.image.get_rect(center=(x, y))
     '''
-    def __init__(self, x, y, game_manager):
-        self.level = 1
-        super().__init__(x, y, game_manager)
-        self.set_image()
-
-    def set_image(self):
-        if self.level == 1:
-            imgname = "freeze_tower.png"
-        elif self.level >= 2:
-            imgname = "freeze_tower_lv2.png"
-        img_path = os.path.join("assets", "images", "towers", imgname)
-        image = pygame.image.load(img_path).convert_alpha()
-        image = pygame.transform.scale(image, (24, 24))
-        self.image = image
-        self.rect = self.image.get_rect(center=(self.x, self.y))
-
-    def upgrade(self):
-        if super().upgrade():
-            self.set_image()  # 升級時自動換圖
-            return True
-        return False
-    
-        
     def shoot(self, target):
-        ice_ball = IceBall(self.x, self.y, target, self.damage, self.game_manager)
+        ice_ball = IceBall.spawn(self.x, self.y, target, self.damage, self.game_manager)
         self.game_manager.add_projectile(ice_ball)
-        self.game_manager.audio_manager.play("shoot_freeze")
+        self.play_sound("shoot_freeze")
     '''
     def __init__(self, x, y, game_manager):
         image = pygame.Surface((36, 36), pygame.SRCALPHA)
@@ -0,0 +1,210 @@
+"""
+批次平衡模擬：依設定檔展開「參數覆寫 × 塔配置 × 難度 × seed」的所有組合，
+以 ProcessPoolExecutor 平行跑無畫面遊戲，再依組合彙整存活波數、分數、金錢曲線與漏怪數。
+
+    python -m src.game.batch_runner sweep.json --workers 32 --out sweep.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from src.game.simulator import HeadlessSimulator
+from src.game.replay import TOWER_TYPES
+from src.game.spawn_scheduler import ENEMY_NAMES
+from src.utils.constants import INIT_LIFE, SIM_DT, MAP_SIZE_EASY, MAP_SIZE_NORMAL, MAP_SIZE_HARD
+
+MAP_SIZES = {"easy": MAP_SIZE_EASY, "normal": MAP_SIZE_NORMAL, "hard": MAP_SIZE_HARD}
+# 可覆寫數值的類別，設定檔以 "類別名稱.屬性" 指定，例如 "CannonTower.damage"
+TUNABLE_CLASSES = {cls.__name__: cls for cls in TOWER_TYPES + tuple(ENEMY_NAMES.values())}
+TOWER_NAMES = {cls.__name__: cls for cls in TOWER_TYPES}
+
+
+@contextmanager
+def apply_overrides(overrides):
+    """
+    暫時改寫類別屬性，離開時還原（同一個工作程序會連續跑多個組合）
+    """
+    saved = []
+    try:
+        for key, value in overrides.items():
+            cls, attr = resolve_override(key)
+            # 記下原本是否定義在這個類別上，還原時才不會把繼承來的值寫死
+            saved.append((cls, attr, attr in cls.__dict__, cls.__dict__.get(attr)))
+            setattr(cls, attr, value)
+        yield
+    finally:
+        for cls, attr, own, value in reversed(saved):
+            if own:
+                setattr(cls, attr, value)
+            else:
+                delattr(cls, attr)
+
+
+def resolve_override(key):
+    name, _, attr = key.partition(".")
+    cls = TUNABLE_CLASSES.get(name)
+    if cls is None or not attr or not hasattr(cls, attr):
+        raise ValueError(f"無法覆寫的參數: {key}")
+    return cls, attr
+
+
+def expand_jobs(spec):
+    """
+    把設定檔展開成工作清單。設定檔欄位：
+      overrides     {"類別.屬性": [值, ...]}，取所有值的笛卡兒積
+      layouts       {"名稱": [["MachineTower", row, col], ...]}，開局時依序建塔
+      difficulties  難度清單（預設 ["normal"]）
+      seeds         seed 清單，或整數 N 表示 0..N-1
+      max_time      每局最多模擬秒數（預設 600）
+      max_wave      到達此波數即停止（選填）
+      sample_every  金錢曲線的取樣間隔秒數（預設 10）
+    """
+    overrides = spec.get("overrides", {})
+    for key in overrides:
+        resolve_override(key)
+    keys = sorted(overrides)
+    combos = [dict(zip(keys, values)) for values in itertools.product(*(overrides[k] for k in keys))]
+    layouts = spec.get("layouts") or {"none": []}
+    for name, towers in layouts.items():
+        for tower_name, _, _ in towers:
+            if tower_name not in TOWER_NAMES:
+                raise ValueError(f"配置 {name} 中有未知的塔: {tower_name}")
+    seeds = spec.get("seeds", 1)
+    if isinstance(seeds, int):
+        seeds = list(range(seeds))
+    jobs = []
+    for params, (layout, towers), difficulty, seed in itertools.product(
+            combos, layouts.items(), spec.get("difficulties", ["normal"]), seeds):
+        jobs.append({
+            "params": params,
+            "layout": layout,
+            "towers": towers,
+            "difficulty": difficulty,
+            "seed": seed,
+            "max_time": spec.get("max_time", 600.0),
+            "max_wave": spec.get("max_wave"),
+            "sample_every": spec.get("sample_every", 10.0),
+        })
+    return jobs
+
+
+def run_job(job):
+    """
+    跑一局（在工作程序中執行，參數與結果都是可 pickle 的純資料）
+    """
+    start = time.perf_counter()
+    with apply_overrides(job["params"]):
+        sim = HeadlessSimulator(MAP_SIZES[job["difficulty"]], job["difficulty"], job["seed"])
+        built = sum(sim.build_tower(TOWER_NAMES[name], row, col) for name, row, col in job["towers"])
+        gm = sim.game_manager
+        sample_ticks = max(1, round(job["sample_every"] / SIM_DT))
+        money_curve = [gm.money]
+        while not gm.is_game_over() and sim.time < job["max_time"]:
+            if job["max_wave"] is not None and gm.wave_manager.wave > job["max_wave"]:
+                break
+            sim.step()
+            if gm.tick % sample_ticks == 0:
+                money_curve.append(gm.money)
+        result = sim.result()
+    result.update({
+        "params": job["params"],
+        "layout": job["layout"],
+        "difficulty": job["difficulty"],
+        "waves_survived": result["wave"] - 1,
+        "leaks": INIT_LIFE - max(result["life"], 0),
+        "towers_built": built,
+        "money_curve": money_curve,
+        "elapsed": time.perf_counter() - start,
+    })
+    return result
+
+
+def run_batch(jobs, workers=None):
+    """
+    平行執行所有工作，結果依工作順序回傳；workers=1 時直接在本程序依序執行
+    """
+    if workers == 1:
+        return [run_job(job) for job in jobs]
+    workers = workers or os.cpu_count() or 1
+    # 每局耗時差不多，分成每個工作程序約 4 批以降低傳遞成本
+    chunksize = max(1, len(jobs) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(run_job, jobs, chunksize=chunksize))
+
+
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def aggregate(results):
+    """
+    依（參數、配置、難度）彙整不同 seed 的結果；金錢曲線較短的局（提早結束）以最後的值補齊後取平均
+    """
+    groups = {}
+    for r in results:
+        key = (json.dumps(r["params"], sort_keys=True), r["layout"], r["difficulty"])
+        groups.setdefault(key, []).append(r)
+    rows = []
+    for (params, layout, difficulty), runs in groups.items():
+        length = max(len(r["money_curve"]) for r in runs)
+        curves = [r["money_curve"] + r["money_curve"][-1:] * (length - len(r["money_curve"])) for r in runs]
+        waves = [r["waves_survived"] for r in runs]
+        rows.append({
+            "params": params,
+            "layout": layout,
+            "difficulty": difficulty,
+            "runs": len(runs),
+            "waves_mean": round(_mean(waves), 2),
+            "waves_min": min(waves),
+            "waves_max": max(waves),
+            "score_mean": round(_mean([r["score"] for r in runs]), 1),
+            "leaks_mean": round(_mean([r["leaks"] for r in runs]), 2),
+            "money_end_mean": round(_mean([r["money"] for r in runs]), 1),
+            "game_over_rate": round(_mean([r["game_over"] for r in runs]), 2),
+            "money_curve": [round(_mean(column), 1) for column in zip(*curves)],
+        })
+    return rows
+
+
+def write_csv(rows, path):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0]) if rows else ["params"])
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(dict(row, money_curve=" ".join(str(v) for v in row["money_curve"])))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="塔防遊戲批次平衡模擬")
+    parser.add_argument("spec", help="sweep 設定檔（JSON）")
+    parser.add_argument("--workers", type=int, default=None, help="工作程序數（預設為 CPU 核心數，1 表示不開子程序）")
+    parser.add_argument("--out", default=None, help="彙整結果輸出的 CSV 路徑")
+    parser.add_argument("--raw", default=None, help="每局原始結果輸出的 JSON 路徑")
+    args = parser.parse_args(argv)
+
+    with open(args.spec, encoding="utf-8") as f:
+        jobs = expand_jobs(json.load(f))
+    print(f"共 {len(jobs)} 局")
+    start = time.perf_counter()
+    results = run_batch(jobs, args.workers)
+    rows = aggregate(results)
+    print(f"完成，耗時 {time.perf_counter() - start:.1f} 秒（單局合計 {sum(r['elapsed'] for r in results):.1f} 秒）")
+    for row in rows:
+        print(f"{row['params']:<40} {row['layout']:<12} {row['difficulty']:<7} waves {row['waves_mean']:>6.2f} "
+              f"[{row['waves_min']}-{row['waves_max']}]  score {row['score_mean']:>8.1f}  "
+              f"leaks {row['leaks_mean']:>5.2f}  money {row['money_end_mean']:>8.1f}")
+    if args.out:
+        write_csv(rows, args.out)
+    if args.raw:
+        with open(args.raw, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
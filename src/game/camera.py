@@ -0,0 +1,102 @@
+import pygame
+from src.utils.constants import CAMERA_MIN_ZOOM, CAMERA_MAX_ZOOM, CAMERA_PAN_SPEED
+
+
+class Camera:
+    """
+    地圖視窗：記錄畫面左上角對應的世界座標與縮放倍率，負責世界／螢幕座標換算。
+    未捲動也未縮放時 is_identity 為 True，繪圖直接走原本的流程（可用髒矩形）。
+    """
+    def __init__(self, view_size, world_size, zoom=1.0, min_zoom=CAMERA_MIN_ZOOM, max_zoom=CAMERA_MAX_ZOOM):
+        self.view_w, self.view_h = view_size
+        self.world_w, self.world_h = world_size
+        self.min_zoom = min_zoom
+        self.max_zoom = max_zoom
+        self.x = 0.0
+        self.y = 0.0
+        self.zoom = zoom
+        self.dragging = False
+        self.clamp()
+
+    @property
+    def is_identity(self):
+        return self.zoom == 1.0 and self.x == 0 and self.y == 0
+
+    @property
+    def fits_view(self):
+        """
+        整張地圖都在畫面內（不需要剔除畫面外的實體）
+        """
+        return self.world_w <= self.view_w and self.world_h <= self.view_h
+
+    @property
+    def view_rect(self):
+        """
+        目前可見的世界範圍
+        """
+        return pygame.Rect(int(self.x), int(self.y),
+                           int(self.view_w / self.zoom) + 1, int(self.view_h / self.zoom) + 1)
+
+    def resize(self, view_size):
+        self.view_w, self.view_h = view_size
+        self.clamp()
+
+    def clamp(self):
+        self.zoom = max(self.min_zoom, min(self.max_zoom, self.zoom))
+        # 地圖比可見範圍小時固定在左上角，否則不讓視窗移出地圖
+        max_x = self.world_w - self.view_w / self.zoom
+        max_y = self.world_h - self.view_h / self.zoom
+        self.x = 0.0 if max_x <= 0 else max(0.0, min(self.x, max_x))
+        self.y = 0.0 if max_y <= 0 else max(0.0, min(self.y, max_y))
+
+    def pan(self, dx, dy):
+        """
+        以螢幕像素為單位移動視窗
+        """
+        self.x += dx / self.zoom
+        self.y += dy / self.zoom
+        self.clamp()
+
+    def zoom_at(self, factor, screen_pos):
+        """
+        以螢幕上的 screen_pos 為中心縮放（該點下方的世界座標不變）
+        """
+        wx, wy = self.screen_to_world(screen_pos)
+        self.zoom *= factor
+        self.clamp()
+        self.x = wx - screen_pos[0] / self.zoom
+        self.y = wy - screen_pos[1] / self.zoom
+        self.clamp()
+
+    def world_to_screen(self, pos):
+        return (int((pos[0] - self.x) * self.zoom), int((pos[1] - self.y) * self.zoom))
+
+    def screen_to_world(self, pos):
+        return (int(pos[0] / self.zoom + self.x), int(pos[1] / self.zoom + self.y))
+
+    def handle_event(self, event):
+        """
+        滑鼠滾輪縮放、中鍵拖曳平移；有處理事件時回傳 True
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoom_at(1.25 if event.y > 0 else 0.8, pygame.mouse.get_pos())
+            return True
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == 2:
+            self.dragging = True
+            return True
+        if event.type == pygame.MOUSEBUTTONUP and event.button == 2:
+            self.dragging = False
+            return True
+        if event.type == pygame.MOUSEMOTION and self.dragging:
+            self.pan(-event.rel[0], -event.rel[1])
+            return True
+        return False
+
+    def update_keys(self, pressed, frame_dt):
+        """
+        方向鍵 / WASD 持續平移（每幀呼叫，與模擬 tick 無關）
+        """
+        dx = (pressed[pygame.K_RIGHT] or pressed[pygame.K_d]) - (pressed[pygame.K_LEFT] or pressed[pygame.K_a])
+        dy = (pressed[pygame.K_DOWN] or pressed[pygame.K_s]) - (pressed[pygame.K_UP] or pressed[pygame.K_w])
+        if dx or dy:
+            self.pan(dx * CAMERA_PAN_SPEED * frame_dt, dy * CAMERA_PAN_SPEED * frame_dt)
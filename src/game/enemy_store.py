@@ -0,0 +1,203 @@
+try:
+    import numpy as np
+except ImportError:  # numpy 為選用套件，只有向量化模式需要
+    np = None
+
+from src.utils.constants import TILE_SIZE
+
+# 存放在陣列中的敵人欄位（名稱, dtype）
+FIELDS = (
+    ("x", "float64"),
+    ("y", "float64"),
+    ("hp", "float64"),
+    ("speed", "float64"),
+    ("speed_factor", "float64"),
+    ("distance", "float64"),
+    ("cell_x", "int64"),
+    ("cell_y", "int64"),
+    ("active", "bool"),
+    ("spawn_id", "int64"),
+)
+
+
+def _array_property(name):
+    def fget(self):
+        return getattr(self._store, name)[self._slot]
+
+    def fset(self, value):
+        getattr(self._store, name)[self._slot] = value
+
+    return property(fget, fset)
+
+
+class EnemyView:
+    """
+    敵人的輕量外觀：x, y, hp 與速度倍率都讀寫 EnemyStore 的陣列，
+    移動由 EnemyStore.update 一次向量化完成，本身的 update 不做事。
+    以 mixin 方式與原本的敵人類別組合，因此仍是 BasicEnemy 等類別的實例。
+    """
+    x = _array_property("x")
+    y = _array_property("y")
+    hp = _array_property("hp")
+    speed_factor = _array_property("speed_factor")
+    distance = _array_property("distance")
+    spawn_id = _array_property("spawn_id")
+
+    @property
+    def rect(self):
+        # 繪圖與碰撞時才依陣列座標同步 rect
+        rect = self._rect
+        rect.center = (self._store.x[self._slot], self._store.y[self._slot])
+        return rect
+
+    @rect.setter
+    def rect(self, value):
+        self._rect = value
+
+    def update(self, dt):
+        pass
+
+    def kill(self):
+        super().kill()
+        self._store.release(self)
+
+
+class _DetachedSlot:
+    """
+    已移除敵人的數值備份，讓仍持有該敵人參考的物件（如投射物）讀到最後狀態
+    """
+    def __init__(self, store, slot):
+        for name, _ in FIELDS:
+            setattr(self, name, getattr(store, name)[slot:slot + 1].copy())
+
+
+class EnemyStore:
+    """
+    結構陣列（structure of arrays）形式的敵人資料：位置、速度、路徑進度、血量、
+    速度倍率全部放在 NumPy 陣列，整群敵人每 tick 以一次向量運算沿路徑前進。
+    """
+    def __init__(self, game_manager, capacity=256):
+        if np is None:
+            raise ImportError("向量化敵人模式需要安裝 numpy")
+        self.game_manager = game_manager
+        self.capacity = 0
+        self.size = 0  # 使用過的最大 slot 數
+        self.free_slots = []
+        self.views = []
+        self._view_classes = {}
+        path = game_manager.map_manager.path
+        self.path = path
+        self.path_x = np.array([x for x, _ in path.points], dtype="float64")
+        self.path_y = np.array([y for _, y in path.points], dtype="float64")
+        self.path_cum = np.array(path.cumulative, dtype="float64")
+        dirs = path.directions or ((0.0, 0.0),)
+        self.path_ux = np.array([ux for ux, _ in dirs], dtype="float64")
+        self.path_uy = np.array([uy for _, uy in dirs], dtype="float64")
+        self.path_lookup = np.array(path.lookup, dtype="int64")
+        for name, dtype in FIELDS:
+            setattr(self, name, np.zeros(0, dtype=dtype))
+        self._grow(capacity)
+
+    def __len__(self):
+        return self.size - len(self.free_slots)
+
+    def _grow(self, capacity):
+        for name, dtype in FIELDS:
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.views.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def view_class(self, enemy_cls):
+        view_cls = self._view_classes.get(enemy_cls)
+        if view_cls is None:
+            view_cls = type(enemy_cls.__name__ + "View", (EnemyView, enemy_cls), {})
+            self._view_classes[enemy_cls] = view_cls
+        return view_cls
+
+    def spawn(self, enemy_cls, start_tile):
+        """
+        建立一個由陣列支撐的敵人，回傳其 view（仍需交給 GameManager.add_enemy）
+        """
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow(self.capacity * 2)
+            slot = self.size
+            self.size += 1
+        view_cls = self.view_class(enemy_cls)
+        view = view_cls.__new__(view_cls)
+        view._store = self
+        view._slot = slot
+        view_cls.__init__(view, start_tile, self.game_manager)
+        self.speed[slot] = view.speed
+        self.cell_x[slot] = int(view.x // TILE_SIZE)
+        self.cell_y[slot] = int(view.y // TILE_SIZE)
+        self.active[slot] = True
+        self.views[slot] = view
+        return view
+
+    def release(self, view):
+        slot = view._slot
+        if view._store is not self or not self.active[slot]:
+            return
+        view._store = _DetachedSlot(self, slot)
+        view._slot = 0
+        self.active[slot] = False
+        self.views[slot] = None
+        self.free_slots.append(slot)
+
+    def update(self, dt):
+        n = self.size
+        if n == 0:
+            return
+        active = self.active[:n]
+        x, y = self.x[:n], self.y[:n]
+        # 減速、暈眩等效果已由 StatusEffects 寫入 speed_factor
+        move_speed = self.speed[:n] * self.speed_factor[:n]
+
+        # 沿路徑前進：距離直接相加，再由線段索引表換算座標
+        path = self.path
+        distance = self.distance[:n]
+        moving = np.flatnonzero(active & (distance < path.length))
+        if len(moving) == 0:
+            return
+        d = np.minimum(distance[moving] + move_speed[moving] * dt, path.length)
+        distance[moving] = d
+        k = np.minimum((d // path.bucket).astype("int64"), len(self.path_lookup) - 1)
+        seg = self.path_lookup[k]
+        last = len(self.path_ux) - 1
+        while True:
+            ahead = (seg < last) & (self.path_cum[np.minimum(seg + 1, last + 1)] < d)
+            if not ahead.any():
+                break
+            seg += ahead
+        t = d - self.path_cum[seg]
+        x[moving] = self.path_x[seg] + self.path_ux[seg] * t
+        y[moving] = self.path_y[seg] + self.path_uy[seg] * t
+
+        # 只有跨格的敵人才更新空間索引
+        cx = (x[moving] // TILE_SIZE).astype("int64")
+        cy = (y[moving] // TILE_SIZE).astype("int64")
+        changed = (cx != self.cell_x[moving]) | (cy != self.cell_y[moving])
+        if not changed.any():
+            return
+        self.cell_x[moving] = cx
+        self.cell_y[moving] = cy
+        grid = getattr(self.game_manager, "enemy_grid", None)
+        if grid is not None:
+            views = self.views
+            for slot in moving[changed]:
+                grid.move(views[slot])
+
+    def finished(self):
+        """
+        回傳已走進終點格的敵人
+        """
+        n = self.size
+        at_end = self.active[:n] & (self.distance[:n] >= self.path.exit_distance)
+        views = self.views
+        return [views[slot] for slot in np.flatnonzero(at_end)]
@@ -1,88 +1,280 @@
+import random
 import pygame
 from src.game.map_manager import MapManager
 from src.game.wave_manager import WaveManager
-from src.entities.towers.base_tower import BaseTower
+from src.game.spatial_hash import SpatialHash
+from src.game.enemy_store import EnemyStore
+from src.game.renderer import Renderer
+from src.game.camera import Camera
+from src.game.shot_queue import ShotQueue
+from src.game.tower_scheduler import TowerScheduler
+from src.game.progress_index import ProgressIndex
+from src.game.status_effects import StatusEffects
+from src.game.replay import ACTION_PLACE, ACTION_UPGRADE, ACTION_SELL, ACTION_TARGET_MODE
+from src.entities.towers.base_tower import BaseTower, TARGET_MODES
 from src.entities.enemies.base_enemy import BaseEnemy
 from src.entities.projectiles.base_projectile import BaseProjectile
 from src.ui.game_ui import GameUI
-from src.utils.constants import INIT_MONEY, INIT_LIFE, BG_COLOR
+from src.utils.audio_manager import NullAudioManager
+from src.utils.constants import INIT_MONEY, INIT_LIFE, SIM_DT, TILE_SIZE
+from src.utils.fixed_step import FixedStepClock
+from src.utils.profiler import FrameProfiler
 
 class GameManager:
-    def __init__(self, screen, map_size=(20, 30), difficulty=None, audio_manager=None):
+    def __init__(self, screen=None, map_size=(20, 30), difficulty=None, audio_manager=None, headless=False, seed=None,
+                 vectorized=False, dirty_rects=False, profiler=None, map_file=None,
+                 waves=None, scheduled_projectiles=False):
+        # headless=True 時不建立 UI、不載入圖片與字型，只跑遊戲邏輯
+        self.headless = headless
+        # 每局獨立的亂數產生器，相同 seed 與輸入會得到完全相同的結果
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.tick = 0
+        self.clock = FixedStepClock()
         self.screen = screen
-        self.audio_manager = audio_manager
+        self.audio_manager = audio_manager if audio_manager is not None else NullAudioManager()
+        # 各階段計時；未指定時使用停用的 profiler，section() 不做事
+        self.profiler = profiler if profiler is not None else FrameProfiler(enabled=False)
         self.entities = pygame.sprite.LayeredUpdates()
         self.towers = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
         self.projectiles = pygame.sprite.Group()
+        # 敵人空間索引，敵人移動時自行更新，供塔與範圍傷害查詢
+        self.enemy_grid = SpatialHash(TILE_SIZE)
+        self.next_enemy_id = 0
+        self.enemy_extent = 0  # 目前敵人 rect 的最大邊長，碰撞粗篩時用來擴大查詢範圍
+        # 塔不在 entities 中逐幀更新，由排程器只喚醒冷卻結束、射程內可能有敵人的塔
+        self.tower_scheduler = TowerScheduler(self)
+        # 依路徑進度排序的敵人，塔以射程涵蓋的進度區間找目標
+        self.progress_index = ProgressIndex(self)
+        # 敵人的減速、暈眩、燃燒等效果，結束時間統一排在 heap 中
+        self.status_effects = StatusEffects(self)
         self.difficulty = difficulty
-        self.map_manager = MapManager(self, map_size=map_size, difficulty=difficulty)
-        self.wave_manager = WaveManager(self)
-        self.ui = GameUI(self)
+        # map_file 指定地圖檔（路徑或已編譯的 CompiledMap）；未指定時使用 assets/maps 中與難度、大小相符的地圖，
+        # 沒有相符大小的地圖檔時（包括預設的 20x30 普通難度）由 map_generator 產生
+        self.map_manager = MapManager(self, map_size=map_size, difficulty=difficulty, map_file=map_file)
+        # vectorized=True 時敵人資料放在 NumPy 陣列中整批移動（需要 numpy）
+        self.enemy_store = EnemyStore(self) if vectorized else None
+        # scheduled_projectiles=True 時發射即算出命中的 tick，飛行中不逐幀更新
+        self.shots = ShotQueue(self) if scheduled_projectiles else None
+        # waves 為 load_waves() 讀入的波次定義；未指定時依內建規則產生每一波
+        self.wave_manager = WaveManager(self, waves=waves)
+        self.ui = None if headless else GameUI(self)
+        # 鏡頭：地圖比視窗大時可捲動與縮放；無畫面時不需要
+        self.camera = None
+        if screen is not None and not headless:
+            world_size = (self.map_manager.cols * TILE_SIZE, self.map_manager.rows * TILE_SIZE)
+            self.camera = Camera(screen.get_size(), world_size)
+        # dirty_rects=True 時 draw() 只回傳有變動的矩形，交給 pygame.display.update
+        self.renderer = Renderer(self, dirty=dirty_rects)
         self.money = INIT_MONEY
         self.life = INIT_LIFE
         self.score = 0
         self.selected_tower_type = None
         self.game_over = False
+        # 重播：recorder 記錄玩家操作，input_source 在每個 tick 前送入重播的操作
+        self.recorder = None
+        self.input_source = None
 
     def handle_event(self, event):
-        if self.ui.handle_event(event):
+        if self.ui and self.ui.handle_event(event):
+            return
+        if self.camera and self.camera.handle_event(event):
             return
         if event.type == pygame.MOUSEBUTTONDOWN:
             if event.button == 1:  # left click
-                pos = pygame.mouse.get_pos()
+                pos = self.screen_to_world(pygame.mouse.get_pos())
                 if self.selected_tower_type:
-                    placed = self.map_manager.place_tower(pos, self.selected_tower_type)
-                    if placed:
-                        self.money -= self.selected_tower_type.cost
+                    if self.build_tower(pos, self.selected_tower_type):
                         self.selected_tower_type = None
-                else:
+                elif self.ui:
                     self.ui.handle_click(pos)
             elif event.button == 3:  # right click
                 self.selected_tower_type = None
 
+    def screen_to_world(self, pos):
+        return self.camera.screen_to_world(pos) if self.camera else pos
+
+    def world_to_screen(self, pos):
+        return self.camera.world_to_screen(pos) if self.camera else pos
+
+    def advance(self, frame_dt):
+        """
+        依實際經過時間執行固定步長的 update，回傳本幀執行的 tick 數
+        """
+        steps = self.clock.advance(frame_dt)
+        for _ in range(steps):
+            self.update(SIM_DT)
+        self.audio_manager.flush()  # 同一幀內重複觸發的音效只播一次
+        return steps
+
     def update(self, dt):
         if self.game_over:
             return
-        self.wave_manager.update(dt)
-        self.entities.update(dt)
-        self.check_collisions()
-        self.ui.update(dt)
+        if self.input_source is not None:
+            self.input_source.apply_due(self)
+        self.tick += 1
+        profiler = self.profiler
+        with profiler.section("waves"):
+            self.wave_manager.update(dt)
+        with profiler.section("effects"):
+            self.status_effects.update(dt)
+        if self.enemy_store is not None:
+            with profiler.section("enemy_store"):
+                self.enemy_store.update(dt)
+        with profiler.section("entities"):
+            self.entities.update(dt)
+        with profiler.section("towers"):
+            self.tower_scheduler.update(dt)
+        if self.shots is not None:
+            with profiler.section("shots"):
+                self.shots.update()
+        with profiler.section("collisions"):
+            self.check_collisions()
+        if self.ui:
+            self.ui.update(dt)
         if self.life <= 0:
             self.game_over = True
 
     def draw(self):
-        self.screen.fill(BG_COLOR)
-        self.map_manager.draw(self.screen)
-        self.entities.draw(self.screen)
-        for enemy in self.enemies:
-            enemy.draw(self.screen)
-        for tower in self.towers:
-            tower.draw(self.screen)
-        self.ui.draw(self.screen)
+        """
+        畫出遊戲畫面；回傳需更新的矩形清單，回傳 None 表示需整個畫面 flip
+        """
+        if self.headless:
+            return None
+        return self.renderer.draw(self.screen)
+
+    def entity_counts(self):
+        """
+        各群組實體數量，供 profiler 記錄
+        """
+        projectiles = len(self.projectiles) + (len(self.shots) if self.shots is not None else 0)
+        return {"towers": len(self.towers), "enemies": len(self.enemies), "projectiles": projectiles}
 
     def check_collisions(self):
+        # 粗篩：從敵人空間索引取出投射物附近格子的敵人，再以 rect 精確判定；
+        # 命中依出場順序排序，結果與逐一 spritecollide 相同
+        grid = self.enemy_grid
+        margin = self.enemy_extent
         for projectile in self.projectiles:
-            hits = pygame.sprite.spritecollide(projectile, self.enemies, False)
+            if not grid.count:
+                break
+            rect = projectile.rect
+            candidates = grid.query_rect(rect.left - margin, rect.top - margin,
+                                         rect.right + margin, rect.bottom + margin)
+            if not candidates:
+                continue
+            hits = [enemy for enemy in candidates if rect.colliderect(enemy.rect)]
+            if len(hits) > 1:
+                hits.sort(key=lambda enemy: enemy.spawn_id)
             for enemy in hits:
                 projectile.on_hit(enemy)
-                if not getattr(projectile, "piercing", False):
-                    projectile.kill()
-        for enemy in self.enemies:
-            if self.map_manager.is_enemy_at_end(enemy):
-                self.life -= 1
-                enemy.kill()
+            # 同一 tick 重疊的敵人都會被打到，之後才把投射物放回物件池（入池後不再持有 game_manager）
+            if hits and not getattr(projectile, "piercing", False):
+                projectile.kill()
+        if self.enemy_store is not None:
+            finished = self.enemy_store.finished()
+        else:
+            finished = [enemy for enemy in self.enemies if self.map_manager.is_enemy_at_end(enemy)]
+        for enemy in finished:
+            self.life -= 1
+            enemy.kill()
+
+    def build_tower(self, pos, tower_type):
+        """
+        在像素座標 pos 所在格子建塔並扣款，成功回傳 True
+        """
+        if self.map_manager.place_tower(pos, tower_type):
+            self.money -= tower_type.cost
+            self.record_action(ACTION_PLACE, pos[1] // TILE_SIZE, pos[0] // TILE_SIZE, tower_type)
+            return True
+        return False
+
+    def upgrade_tower(self, tower):
+        if tower.upgrade():
+            self.record_action(ACTION_UPGRADE, tower.y // TILE_SIZE, tower.x // TILE_SIZE)
+            return True
+        return False
+
+    def sell_tower(self, tower):
+        """
+        拆除塔並退還 75% 建造費用
+        """
+        self.money += int(tower.cost * 0.75)
+        self.towers.remove(tower)
+        self.tower_scheduler.remove(tower)
+        self.map_manager.remove_tower(tower)
+        self.record_action(ACTION_SELL, tower.y // TILE_SIZE, tower.x // TILE_SIZE)
+
+    def set_target_mode(self, tower, mode):
+        """
+        設定塔的目標選擇方式（TARGET_MODES 之一）
+        """
+        if mode not in TARGET_MODES:
+            return False
+        tower.target_mode = mode
+        self.record_action(ACTION_TARGET_MODE, tower.y // TILE_SIZE, tower.x // TILE_SIZE,
+                           mode=TARGET_MODES.index(mode))
+        return True
+
+    def tower_at(self, row, col):
+        return self.map_manager.tower_at(row, col)
+
+    def record_action(self, action, row, col, tower_type=None, mode=None):
+        if self.recorder is not None:
+            self.recorder.record(action, row, col, tower_type, mode)
+
+    def apply_action(self, action, row, col, tower_type=None, mode=None):
+        """
+        以格子座標執行一個玩家操作（重播時使用），成功回傳 True；
+        mode 為設定目標方式時的 TARGET_MODES 索引
+        """
+        if action == ACTION_PLACE:
+            return self.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), tower_type)
+        tower = self.tower_at(row, col)
+        if tower is None:
+            return False
+        if action == ACTION_UPGRADE:
+            return self.upgrade_tower(tower)
+        if action == ACTION_SELL:
+            self.sell_tower(tower)
+            return True
+        if action == ACTION_TARGET_MODE and mode is not None and mode < len(TARGET_MODES):
+            return self.set_target_mode(tower, TARGET_MODES[mode])
+        return False
 
     def add_tower(self, tower: BaseTower):
         self.towers.add(tower)
-        self.entities.add(tower)
+        self.tower_scheduler.add(tower)
+        self.map_manager.set_tower(tower)
         self.audio_manager.play("tower_build")
 
+    def spawn_enemy(self, enemy_cls, start_tile):
+        """
+        產生敵人並加入遊戲；向量化模式下由 EnemyStore 建立
+        """
+        if self.enemy_store is not None:
+            enemy = self.enemy_store.spawn(enemy_cls, start_tile)
+        else:
+            enemy = enemy_cls(start_tile, self)
+        self.add_enemy(enemy)
+        return enemy
+
     def add_enemy(self, enemy: BaseEnemy):
+        # spawn_id 依出場順序遞增，查詢結果以此排序以維持與 group 相同的順序
+        enemy.spawn_id = self.next_enemy_id
+        self.next_enemy_id += 1
         self.enemies.add(enemy)
-        self.entities.add(enemy)
+        if self.enemy_store is None:
+            # 向量化模式的敵人不進 entities，避免每幀逐一呼叫空的 update
+            self.entities.add(enemy)
+        self.enemy_grid.insert(enemy)
+        self.enemy_extent = max(self.enemy_extent, enemy.rect.width, enemy.rect.height)
+        self.progress_index.invalidate()
 
     def add_projectile(self, projectile: BaseProjectile):
+        if self.shots is not None and self.shots.fire(projectile):
+            return
         self.projectiles.add(projectile)
         self.entities.add(projectile)
 
@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+from src.utils.constants import TILE_SIZE, MAP_CACHE_DIR
+
+COMPILER_VERSION = 1
+
+
+class MapFormatError(ValueError):
+    """
+    地圖檔內容不合法（路徑不連續、超出地圖、塔位與路徑重疊等）
+    """
+
+
+class CompiledMap:
+    """
+    編譯後的地圖：去除重複並驗證過的路徑格、塔位、出生點與城堡位置，
+    以及路徑折線的像素座標點。全部是純資料，可直接存成快取檔。
+    """
+    def __init__(self, rows, cols, path_tiles, spots, name="", points=None):
+        self.rows = rows
+        self.cols = cols
+        self.name = name
+        self.path_tiles = [tuple(tile) for tile in path_tiles]
+        self.spots = [tuple(spot) for spot in spots]
+        if points is None:
+            points = [(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+                      for row, col in self.path_tiles]
+        self.points = [tuple(point) for point in points]
+
+    @property
+    def spawn(self):
+        return self.path_tiles[0]
+
+    @property
+    def castle(self):
+        return self.path_tiles[-1]
+
+    def to_json(self):
+        mask = bytearray((self.rows * self.cols + 7) // 8)
+        for row, col in self.spots:
+            i = row * self.cols + col
+            mask[i // 8] |= 1 << (i % 8)
+        return {
+            "version": COMPILER_VERSION,
+            "name": self.name,
+            "rows": self.rows,
+            "cols": self.cols,
+            "path_tiles": self.path_tiles,
+            "spot_mask": mask.hex(),  # 塔位以位元遮罩存，大地圖也很小
+            "points": self.points,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        rows, cols = data["rows"], data["cols"]
+        mask = bytes.fromhex(data["spot_mask"])
+        spots = [(i // cols, i % cols) for i in range(rows * cols) if mask[i // 8] >> (i % 8) & 1]
+        return cls(rows, cols, data["path_tiles"], spots, data.get("name", ""), data["points"])
+
+
+def expand_waypoints(waypoints):
+    """
+    把轉折點串成逐格的路徑，相鄰兩點必須在同一列或同一行
+    """
+    if not waypoints:
+        raise MapFormatError("waypoints 不可為空")
+    tiles = [tuple(waypoints[0])]
+    for (r0, c0), (r1, c1) in zip(waypoints, waypoints[1:]):
+        if r0 != r1 and c0 != c1:
+            raise MapFormatError(f"路徑點 {(r0, c0)} -> {(r1, c1)} 不在同一直線上")
+        dr = (r1 > r0) - (r1 < r0)
+        dc = (c1 > c0) - (c1 < c0)
+        r, c = r0, c0
+        while (r, c) != (r1, c1):
+            r, c = r + dr, c + dc
+            tiles.append((r, c))
+    return tiles
+
+
+def compile_tiles(rows, cols, path_tiles, spots=None, name=""):
+    """
+    驗證並整理逐格路徑：去除轉角的重複格，檢查每一步相鄰、不出界、不重複經過；
+    spots 為 None 時所有非路徑格都是塔位
+    """
+    if rows <= 0 or cols <= 0:
+        raise MapFormatError(f"地圖大小不合法: {(rows, cols)}")
+    tiles = []
+    for tile in path_tiles:
+        tile = tuple(tile)
+        if not tiles or tiles[-1] != tile:
+            tiles.append(tile)
+    if not tiles:
+        raise MapFormatError("路徑不可為空")
+    seen = set()
+    for i, (row, col) in enumerate(tiles):
+        if not (0 <= row < rows and 0 <= col < cols):
+            raise MapFormatError(f"路徑格 {(row, col)} 超出地圖 {(rows, cols)}")
+        if (row, col) in seen:
+            raise MapFormatError(f"路徑重複經過 {(row, col)}")
+        seen.add((row, col))
+        if i and abs(row - tiles[i - 1][0]) + abs(col - tiles[i - 1][1]) != 1:
+            raise MapFormatError(f"路徑不連續: {tiles[i - 1]} -> {(row, col)}")
+    if spots is None:
+        spots = [(row, col) for row in range(rows) for col in range(cols) if (row, col) not in seen]
+    else:
+        for spot in spots:
+            if tuple(spot) in seen:
+                raise MapFormatError(f"塔位 {tuple(spot)} 與路徑重疊")
+    return CompiledMap(rows, cols, tiles, spots, name)
+
+
+def _tile(value, what):
+    """
+    檢查 value 是兩個整數組成的座標 [row, col]
+    """
+    if not isinstance(value, (list, tuple)) or len(value) != 2 or \
+            not all(isinstance(n, int) and not isinstance(n, bool) for n in value):
+        raise MapFormatError(f"{what} 必須是兩個整數 [row, col]: {value!r}")
+    return tuple(value)
+
+
+def compile_map(data):
+    """
+    編譯地圖檔內容（dict）：
+      rows, cols     地圖格數
+      waypoints      路徑轉折點 [[row, col], ...]，第一點為出生點、最後一點為城堡
+      spawn, castle  選填，若有則必須與路徑起終點相同
+      spots          選填，每列一個字串，"#" 為塔位；省略時所有非路徑格都是塔位
+    """
+    if not isinstance(data, dict):
+        raise MapFormatError("地圖檔內容必須是 JSON 物件")
+    try:
+        rows, cols = int(data["rows"]), int(data["cols"])
+        waypoints = data["waypoints"]
+    except (KeyError, TypeError, ValueError) as e:
+        raise MapFormatError(f"地圖檔缺少或有錯誤的欄位: {e}") from e
+    if not isinstance(waypoints, list):
+        raise MapFormatError("waypoints 必須是座標清單")
+    tiles = expand_waypoints([_tile(point, "路徑點") for point in waypoints])
+    spots = None
+    if data.get("spots") is not None:
+        mask = data["spots"]
+        if not isinstance(mask, list) or not all(isinstance(line, str) for line in mask):
+            raise MapFormatError("spots 必須是字串清單")
+        if len(mask) != rows or any(len(line) != cols for line in mask):
+            raise MapFormatError("spots 的大小必須與 rows x cols 相同")
+        spots = [(row, col) for row, line in enumerate(mask) for col, ch in enumerate(line) if ch == "#"]
+    compiled = compile_tiles(rows, cols, tiles, spots, data.get("name", ""))
+    for key, tile in (("spawn", compiled.spawn), ("castle", compiled.castle)):
+        if key in data and _tile(data[key], key) != tile:
+            raise MapFormatError(f"{key} {tuple(data[key])} 與路徑端點 {tile} 不符")
+    return compiled
+
+
+def load_map(path, cache_dir=MAP_CACHE_DIR):
+    """
+    讀取地圖檔；以檔案內容的雜湊為 key 快取編譯結果，內容沒變時直接讀快取
+    """
+    with open(path, "rb") as f:
+        raw = f.read()
+    key = hashlib.sha256(raw + f"|{COMPILER_VERSION}|{TILE_SIZE}".encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, key + ".json") if cache_dir else None
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, encoding="utf-8") as f:
+                return CompiledMap.from_json(json.load(f))
+        except (OSError, ValueError, KeyError):
+            pass  # 快取損毀時重新編譯
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except ValueError as e:
+        raise MapFormatError(f"{path} 不是合法的 JSON: {e}") from e
+    compiled = compile_map(data)
+    if cache_path:
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            with open(cache_path, "w", encoding="utf-8") as f:
+                json.dump(compiled.to_json(), f, separators=(",", ":"))
+        except OSError as e:
+            print(f"無法寫入地圖快取 {cache_path}: {e}")
+    return compiled
@@ -0,0 +1,190 @@
+from src.game.map_compiler import MapFormatError, compile_tiles
+from src.utils.constants import MAP_SIZE_EASY, MAP_SIZE_NORMAL, MAP_SIZE_HARD
+
+# 沒有大小相符的地圖檔時（例如 --map-size 100x150）由程式依難度產生路徑。
+# 產生的路徑只在不小於該難度內建地圖的大小時保證合法，更小的大小一律拒絕
+MIN_SIZES = {"easy": MAP_SIZE_EASY, "normal": MAP_SIZE_NORMAL, "hard": MAP_SIZE_HARD}
+
+
+def generate_map(difficulty, rows, cols):
+    """
+    依難度產生 rows x cols 的地圖（所有非路徑格都是塔位），經過與地圖檔相同的驗證
+    """
+    min_rows, min_cols = MIN_SIZES[difficulty]
+    if rows < min_rows or cols < min_cols:
+        raise MapFormatError(f"{difficulty} 難度沒有 {rows}x{cols} 的地圖檔，"
+                             f"產生地圖的大小至少要 {min_rows}x{min_cols}")
+    return compile_tiles(rows, cols, generate_path_tiles(difficulty, rows, cols), name=f"{difficulty}-generated")
+
+
+def generate_path_tiles(difficulty, rows, cols):
+    """
+    依難度的固定樣式（以地圖大小縮放）產生逐格路徑；assets/maps 中的內建地圖即是以內建大小產生的結果
+    """
+    path = []
+    if difficulty == "easy":
+        #右
+        row = rows //2
+        for col in range(0, cols // 4 + 1):
+            path.append((row, col))
+        #上
+        col = cols // 4
+        for r in range(rows //2, 2, -1):
+            path.append((r, col))
+        #右
+        row = 2
+        for col in range(cols // 4 , cols//2-1):
+            path.append((row, col))
+        #下
+        col = cols//2-1
+        for r in range(2, rows-2):
+            path.append((r, col))
+        #右
+        row = rows-2
+        for col in range(cols//2-1 , (cols // 4)*3-1):
+            path.append((row, col))
+        #上
+        col = (cols // 4)*3-1
+        for r in range(rows-2, rows//2, -1):
+            path.append((r, col))
+        #右
+        row = rows//2
+        for col in range((cols // 4)*3-1 , cols):
+            path.append((row, col))
+        return path
+
+    elif difficulty == "normal":
+        #右
+        row = rows //2
+        for col in range(0, cols // 4 -1):
+            path.append((row, col))
+        #下
+        col = cols // 4 -1
+        for r in range(rows //2, rows-1):
+            path.append((r, col))
+        #上
+        col = cols // 4 
+        for r in range(rows-2, 3, -1):
+            path.append((r, col))
+        #右
+        row = 3
+        for col in range(cols // 4 , cols // 2):
+            path.append((row, col))
+        #下
+        col = cols // 2
+        for r in range(3, rows//2 + 1):
+            path.append((r, col))
+        #左
+        row = rows//2 + 1
+        for col in range(cols //2 , cols // 4+2,-1):
+            path.append((row, col))
+        #下
+        col = cols // 4+2
+        for r in range(rows//2 + 1, rows-2):
+            path.append((r, col))
+        #右
+        row = rows-2
+        for col in range(cols // 4+2, cols//4*3-1):
+            path.append((row, col))
+        #上
+        col = cols//4*3-1
+        for r in range(rows-2, rows//3, -1):
+            path.append((r, col))
+        #右
+        row = rows//3
+        for col in range(cols//4*3-1, cols):
+            path.append((row, col))
+        #下
+        col = cols-1
+        for r in range(rows//3, rows):
+            path.append((r, col))
+        return path
+
+    elif difficulty == "hard":
+        path = []
+        #下
+        col = 0
+        for r in range(0, rows//2):
+            path.append((r, col))
+        #右
+        row = rows//2
+        for col in range(0, cols // 4-1):
+            path.append((row, col))
+        #上
+        col = cols // 4-2
+        for r in range(rows//2, 2, -1):
+            path.append((r, col))
+        #右
+        row = 2
+        for col in range(cols // 4-2, cols // 4+1):
+            path.append((row, col))
+        #下
+        col = cols // 4+1
+        for r in range(2, rows//4*3+-1):
+            path.append((r, col))
+        #左
+        row = rows//4*3-1
+        for col in range(cols // 4+1,1,-1):
+            path.append((row, col))
+        #下
+        col = 1
+        for r in range(rows//4*3+-1, rows-1):
+            path.append((r, col))
+        #右
+        row = rows-1
+        for col in range(1, cols -1):
+            path.append((row, col))
+        #上
+        col = cols -1
+        for r in range(rows-1, 1, -1):
+            path.append((r, col))
+        #左
+        row = 1
+        for col in range(cols-1,cols//3+1,-1):
+            path.append((row, col))
+        #下
+        col = cols//3+1
+        for r in range(1, rows-3):
+            path.append((r, col))
+        #右
+        row = rows-3
+        for col in range(cols//3+1, cols -3):
+            path.append((row, col))
+        #上
+        col = cols -3
+        for r in range(rows-3, 3, -1):
+            path.append((r, col))
+        #左
+        row = 3
+        for col in range(cols-3,cols//3+2,-1):
+            path.append((row, col))
+        #下
+        col = cols//3+2
+        for r in range(3, rows-4):
+            path.append((r, col))
+        #右
+        row = rows-4
+        for col in range(cols//3+2, cols -5):
+            path.append((row, col))
+        
+        #上
+        col = cols -5
+        for r in range(rows-4, 5, -1):
+            path.append((r, col))
+        #左
+        row = 5
+        for col in range(cols-5,cols//2-1,-1):
+            path.append((row, col))
+        #下
+        col = cols//2-1
+        for r in range(5, rows-6):
+            path.append((r, col))
+        #右
+        row = rows-6
+        for col in range(cols//2-1, cols//3*2 ):
+            path.append((row, col))
+         #上
+        col = cols//3*2
+        for r in range(rows-6, rows//2-2, -1):
+            path.append((r, col))
+        return path
@@ -1,196 +1,108 @@
 import pygame
 import os
-from src.utils.constants import TILE_SIZE, MAP_BG_COLOR
+from collections import OrderedDict
+from src.utils.constants import TILE_SIZE, MAP_BG_COLOR, MAP_CHUNK_TILES, MAP_CHUNK_CACHE_SIZE, MAP_DIR
+from src.utils.helpers import is_headless, load_image
+from src.game.path import PathPolyline
+from src.game.map_compiler import CompiledMap, load_map
+from src.game.map_generator import generate_map
+from src.entities.towers.base_tower import BaseTower
+
+# 佔用格的內容：空地、路徑、可蓋塔的塔位；已蓋塔的格子直接存塔物件
+TILE_EMPTY = 0
+TILE_PATH = 1
+TILE_SPOT = 2
+
 
 class MapManager:
-    def __init__(self, game_manager, map_size=None, difficulty=None):
+    def __init__(self, game_manager, map_size=None, difficulty=None, map_file=None):
         self.game_manager = game_manager
-        if map_size is None:
-            raise ValueError("map_size 必須指定 (rows, cols)")
-        self.rows, self.cols = map_size
-        self.difficulty = difficulty
-        self.grid = [[0 for _ in range(self.cols)] for _ in range(self.rows)]
-        self.path_tiles = self.generate_path_tiles()
-        self.tower_spots = self.generate_tower_spots()
+        self.difficulty = difficulty or "normal"  # 未指定時視為普通難度
+        if map_file is None:
+            compiled = self.load_builtin_map(map_size)
+        elif isinstance(map_file, CompiledMap):
+            compiled = map_file  # 存檔、重播檔中保存的地圖
+        else:
+            compiled = load_map(map_file)
+        # 自訂地圖（非內建）的編譯結果，存檔與重播時一併保存
+        self.custom_map = compiled if map_file is not None else None
+        if compiled is None:
+            # 沒有大小相符的內建地圖時依難度產生（見 map_generator）
+            if map_size is None:
+                raise ValueError("map_size 必須指定 (rows, cols)")
+            compiled = generate_map(self.difficulty, *map_size)
+        self.load_compiled(compiled)
+        self.background = None  # 預先繪製好的靜態地圖層，地圖改變時需 invalidate_background()
+        self.chunks = OrderedDict()  # 鏡頭模式用的背景區塊快取 {(cx, cy): Surface}，依最近使用排序
+        if is_headless(game_manager):
+            self.tower_spot_img = None
+            return
         spot_img_path = os.path.join("assets", "images", "map", "tower_spot.png")
-        self.tower_spot_img = pygame.image.load(spot_img_path).convert_alpha()
-        self.tower_spot_img = pygame.transform.scale(self.tower_spot_img, (TILE_SIZE, TILE_SIZE))
-    def generate_path_tiles(self):
-        path = []
-        if self.difficulty == "easy":
-            #右
-            row = self.rows //2
-            for col in range(0, self.cols // 4 + 1):
-                path.append((row, col))
-            #上
-            col = self.cols // 4
-            for r in range(self.rows //2, 2, -1):
-                path.append((r, col))
-            #右
-            row = 2
-            for col in range(self.cols // 4 , self.cols//2-1):
-                path.append((row, col))
-            #下
-            col = self.cols//2-1
-            for r in range(2, self.rows-2):
-                path.append((r, col))
-            #右
-            row = self.rows-2
-            for col in range(self.cols//2-1 , (self.cols // 4)*3-1):
-                path.append((row, col))
-            #上
-            col = (self.cols // 4)*3-1
-            for r in range(self.rows-2, self.rows//2, -1):
-                path.append((r, col))
-            #右
-            row = self.rows//2
-            for col in range((self.cols // 4)*3-1 , self.cols):
-                path.append((row, col))
-            return path
+        self.tower_spot_img = load_image(spot_img_path, (TILE_SIZE, TILE_SIZE))
+
+    def load_builtin_map(self, map_size):
+        """
+        assets/maps/<難度>.json 存在且大小相符（或未指定大小）時回傳編譯好的地圖
+        """
+        path = os.path.join(MAP_DIR, f"{self.difficulty}.json")
+        if not os.path.exists(path):
+            return None
+        compiled = load_map(path)
+        if map_size is not None and tuple(map_size) != (compiled.rows, compiled.cols):
+            return None
+        return compiled
+
+    def load_compiled(self, compiled):
+        self.rows, self.cols = compiled.rows, compiled.cols
+        self.path_tiles = list(compiled.path_tiles)
+        self.path = PathPolyline(compiled.points)
+        self.tower_spots = list(compiled.spots)
+        # 佔用格 grid[row][col]：TILE_EMPTY / TILE_PATH / TILE_SPOT 或該格的塔
+        self.grid = [[TILE_EMPTY for _ in range(self.cols)] for _ in range(self.rows)]
+        for row, col in self.path_tiles:
+            self.grid[row][col] = TILE_PATH
+        for row, col in self.tower_spots:
+            self.grid[row][col] = TILE_SPOT
 
-        elif self.difficulty == "normal":
-            #右
-            row = self.rows //2
-            for col in range(0, self.cols // 4 -1):
-                path.append((row, col))
-            #下
-            col = self.cols // 4 -1
-            for r in range(self.rows //2, self.rows-1):
-                path.append((r, col))
-            #上
-            col = self.cols // 4 
-            for r in range(self.rows-2, 3, -1):
-                path.append((r, col))
-            #右
-            row = 3
-            for col in range(self.cols // 4 , self.cols // 2):
-                path.append((row, col))
-            #下
-            col = self.cols // 2
-            for r in range(3, self.rows//2 + 1):
-                path.append((r, col))
-            #左
-            row = self.rows//2 + 1
-            for col in range(self.cols //2 , self.cols // 4+2,-1):
-                path.append((row, col))
-            #下
-            col = self.cols // 4+2
-            for r in range(self.rows//2 + 1, self.rows-2):
-                path.append((r, col))
-            #右
-            row = self.rows-2
-            for col in range(self.cols // 4+2, self.cols//4*3-1):
-                path.append((row, col))
-            #上
-            col = self.cols//4*3-1
-            for r in range(self.rows-2, self.rows//3, -1):
-                path.append((r, col))
-            #右
-            row = self.rows//3
-            for col in range(self.cols//4*3-1, self.cols):
-                path.append((row, col))
-            #下
-            col = self.cols-1
-            for r in range(self.rows//3, self.rows):
-                path.append((r, col))
-            return path
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
 
-        elif self.difficulty == "hard":
-            path = []
-            #下
-            col = 0
-            for r in range(0, self.rows//2):
-                path.append((r, col))
-            #右
-            row = self.rows//2
-            for col in range(0, self.cols // 4-1):
-                path.append((row, col))
-            #上
-            col = self.cols // 4-2
-            for r in range(self.rows//2, 2, -1):
-                path.append((r, col))
-            #右
-            row = 2
-            for col in range(self.cols // 4-2, self.cols // 4+1):
-                path.append((row, col))
-            #下
-            col = self.cols // 4+1
-            for r in range(2, self.rows//4*3+-1):
-                path.append((r, col))
-            #左
-            row = self.rows//4*3-1
-            for col in range(self.cols // 4+1,1,-1):
-                path.append((row, col))
-            #下
-            col = 1
-            for r in range(self.rows//4*3+-1, self.rows-1):
-                path.append((r, col))
-            #右
-            row = self.rows-1
-            for col in range(1, self.cols -1):
-                path.append((row, col))
-            #上
-            col = self.cols -1
-            for r in range(self.rows-1, 1, -1):
-                path.append((r, col))
-            #左
-            row = 1
-            for col in range(self.cols-1,self.cols//3+1,-1):
-                path.append((row, col))
-            #下
-            col = self.cols//3+1
-            for r in range(1, self.rows-3):
-                path.append((r, col))
-            #右
-            row = self.rows-3
-            for col in range(self.cols//3+1, self.cols -3):
-                path.append((row, col))
-            #上
-            col = self.cols -3
-            for r in range(self.rows-3, 3, -1):
-                path.append((r, col))
-            #左
-            row = 3
-            for col in range(self.cols-3,self.cols//3+2,-1):
-                path.append((row, col))
-            #下
-            col = self.cols//3+2
-            for r in range(3, self.rows-4):
-                path.append((r, col))
-            #右
-            row = self.rows-4
-            for col in range(self.cols//3+2, self.cols -5):
-                path.append((row, col))
-            
-            #上
-            col = self.cols -5
-            for r in range(self.rows-4, 5, -1):
-                path.append((r, col))
-            #左
-            row = 5
-            for col in range(self.cols-5,self.cols//2-1,-1):
-                path.append((row, col))
-            #下
-            col = self.cols//2-1
-            for r in range(5, self.rows-6):
-                path.append((r, col))
-            #右
-            row = self.rows-6
-            for col in range(self.cols//2-1, self.cols//3*2 ):
-                path.append((row, col))
-             #上
-            col = self.cols//3*2
-            for r in range(self.rows-6, self.rows//2-2, -1):
-                path.append((r, col))
-            return path
+    def tile_at(self, row, col):
+        """
+        回傳格子內容（TILE_* 或塔），超出地圖回傳 None
+        """
+        if not self.in_bounds(row, col):
+            return None
+        return self.grid[row][col]
 
-    def generate_tower_spots(self):
-        spots = []
-        for row in range(self.rows):
-            for col in range(self.cols):
-                if (row, col) not in self.path_tiles and (row + col) % 1 == 0:
-                    spots.append((row, col))
-        return spots
+    def tower_at(self, row, col):
+        cell = self.tile_at(row, col)
+        return cell if isinstance(cell, BaseTower) else None
+
+    def tower_at_pixel(self, pos):
+        """
+        回傳像素座標 pos 點到的塔（需落在塔的 rect 內）
+        """
+        tower = self.tower_at(int(pos[1]) // TILE_SIZE, int(pos[0]) // TILE_SIZE)
+        if tower is not None and tower.rect.collidepoint(pos):
+            return tower
+        return None
+
+    def set_tower(self, tower):
+        """
+        把塔記到所在格子（建塔、讀檔時呼叫）
+        """
+        row, col = int(tower.y) // TILE_SIZE, int(tower.x) // TILE_SIZE
+        if self.in_bounds(row, col):
+            self.grid[row][col] = tower
+
+    def remove_tower(self, tower):
+        """
+        拆塔後把格子還原成塔位
+        """
+        row, col = int(tower.y) // TILE_SIZE, int(tower.x) // TILE_SIZE
+        if self.in_bounds(row, col) and self.grid[row][col] is tower:
+            self.grid[row][col] = TILE_SPOT
 
     def draw_castle(self, surface, x, y, size):
         # 主體
@@ -223,39 +135,99 @@ class MapManager:
         pygame.draw.ellipse(surface, (100, 100, 120), (x + size * 0.45, y + size * 0.78, size * 0.1, size * 0.08))
 
     def draw(self, surface):
+        # 靜態地圖只畫一次到快取的背景 Surface，之後每幀一次 blit
+        surface.blit(self.get_background(surface.get_size()), (0, 0))
+
+    def get_background(self, size):
+        if self.background is None or self.background.get_size() != size:
+            self.background = self.build_background(size)
+        return self.background
+
+    def invalidate_background(self):
+        self.background = None
+        self.chunks.clear()
+
+    def build_background(self, size):
+        background = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            background = background.convert()
+        self.draw_static(background)
+        return background
+
+    def get_chunk(self, cx, cy):
+        """
+        取得第 (cx, cy) 塊背景（MAP_CHUNK_TILES 格見方），超過快取上限時丟掉最久沒用的
+        """
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        size = MAP_CHUNK_TILES * TILE_SIZE
+        chunk = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            chunk = chunk.convert()
+        row0, col0 = cy * MAP_CHUNK_TILES, cx * MAP_CHUNK_TILES
+        self.draw_tiles(chunk, row0, col0, row0 + MAP_CHUNK_TILES, col0 + MAP_CHUNK_TILES)
+        self.chunks[key] = chunk
+        if len(self.chunks) > MAP_CHUNK_CACHE_SIZE:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def draw_view(self, surface, view):
+        """
+        只把與可見範圍 view（世界座標 Rect）重疊的背景區塊畫到 surface 左上角
+        """
+        size = MAP_CHUNK_TILES * TILE_SIZE
+        max_cx = (self.cols - 1) // MAP_CHUNK_TILES
+        max_cy = (self.rows - 1) // MAP_CHUNK_TILES
+        surface.fill(MAP_BG_COLOR)
+        for cy in range(max(0, view.top // size), min(max_cy, (view.bottom - 1) // size) + 1):
+            for cx in range(max(0, view.left // size), min(max_cx, (view.right - 1) // size) + 1):
+                surface.blit(self.get_chunk(cx, cy), (cx * size - view.x, cy * size - view.y))
+
+    def draw_static(self, surface):
+        """
+        畫出不會變動的地圖內容：底色、格線、路徑、塔位與城堡
+        """
+        self.draw_tiles(surface, 0, 0, self.rows, self.cols)
+
+    def draw_tiles(self, surface, row0, col0, row1, col1):
+        """
+        畫出 [row0, row1) x [col0, col1) 範圍的靜態地圖，(row0, col0) 畫在 surface 左上角
+        """
         surface.fill(MAP_BG_COLOR)
-        for row in range(self.rows):
-            for col in range(self.cols):
+        row1, col1 = min(row1, self.rows), min(col1, self.cols)
+        ox, oy = col0 * TILE_SIZE, row0 * TILE_SIZE
+        for row in range(row0, row1):
+            for col in range(col0, col1):
                 pygame.draw.rect(
                     surface, (200, 200, 200),
-                    (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE),
+                    (col * TILE_SIZE - ox, row * TILE_SIZE - oy, TILE_SIZE, TILE_SIZE),
                     1
                 )
-        for (row, col) in self.path_tiles:
-            pygame.draw.rect(
-                surface, (180, 180, 100),
-                (col * TILE_SIZE, row * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-            )
-        for (row, col) in self.tower_spots:
-            #pygame.draw.rect(
-             #   surface, (100, 200, 100),
-            surface.blit(
-                self.tower_spot_img,
-                (col * TILE_SIZE, row * TILE_SIZE)#, TILE_SIZE, TILE_SIZE)
-            )
+        grid = self.grid
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                if grid[row][col] == TILE_PATH:
+                    pygame.draw.rect(
+                        surface, (180, 180, 100),
+                        (col * TILE_SIZE - ox, row * TILE_SIZE - oy, TILE_SIZE, TILE_SIZE)
+                    )
+        for row in range(row0, row1):
+            for col in range(col0, col1):
+                if grid[row][col] != TILE_PATH and grid[row][col] != TILE_EMPTY:  # 塔位（含已蓋塔）
+                    surface.blit(self.tower_spot_img, (col * TILE_SIZE - ox, row * TILE_SIZE - oy))
         # 畫城堡
         if self.path_tiles:
             end_row, end_col = self.path_tiles[-1]
-            self.draw_castle(surface, end_col * TILE_SIZE, end_row * TILE_SIZE, TILE_SIZE)
+            if row0 <= end_row < row1 and col0 <= end_col < col1:
+                self.draw_castle(surface, end_col * TILE_SIZE - ox, end_row * TILE_SIZE - oy, TILE_SIZE)
 
     def place_tower(self, pos, tower_type):
         col, row = pos[0] // TILE_SIZE, pos[1] // TILE_SIZE
-        if (row, col) in self.tower_spots:
-            for tower in self.game_manager.towers:
-                tcol = tower.rect.x // TILE_SIZE
-                trow = tower.rect.y // TILE_SIZE
-                if (trow, tcol) == (row, col):
-                    return False  # 已有塔
+        # 只有空的塔位可以蓋（已有塔的格子存的是塔物件）
+        if self.tile_at(row, col) == TILE_SPOT:
             if self.game_manager.money >= tower_type.cost:
                 tower = tower_type(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2, self.game_manager)
                 self.game_manager.add_tower(tower)
@@ -263,4 +235,4 @@ class MapManager:
         return False
 
     def is_enemy_at_end(self, enemy):
-        return enemy.get_map_grid_pos() == self.path_tiles[-1]
\ No newline at end of file
+        return enemy.distance >= self.path.exit_distance
@@ -0,0 +1,96 @@
+from bisect import bisect_right
+from src.utils.constants import TILE_SIZE
+
+
+class PathPolyline:
+    """
+    編譯後的敵人路徑：經過各格中心點的折線與累積距離，建立後不再變動，
+    所有敵人共用。敵人只需記錄已走的距離，座標由 position_at 查表取得。
+    """
+    def __init__(self, points, bucket=TILE_SIZE):
+        deduped = []
+        for point in points:
+            if not deduped or deduped[-1] != point:
+                deduped.append(point)  # 轉角重複的格子會造成長度 0 的線段，先去除
+        if not deduped:
+            raise ValueError("路徑至少需要一個點")
+        self.points = tuple((float(x), float(y)) for x, y in deduped)
+        cumulative = [0.0]
+        directions = []
+        for (x0, y0), (x1, y1) in zip(self.points, self.points[1:]):
+            dx, dy = x1 - x0, y1 - y0
+            seg_len = (dx * dx + dy * dy) ** 0.5
+            cumulative.append(cumulative[-1] + seg_len)
+            directions.append((dx / seg_len, dy / seg_len))
+        self.cumulative = tuple(cumulative)
+        self.directions = tuple(directions)
+        self.length = cumulative[-1]
+        # 敵人進入終點格（距終點中心半格）即算抵達城堡
+        self.exit_distance = max(0.0, self.length - TILE_SIZE / 2)
+        # 每 bucket 像素一格的線段索引表，查詢時最多再往後走幾段
+        self.bucket = bucket
+        self.lookup = tuple(
+            min(bisect_right(self.cumulative, k * bucket) - 1, max(len(directions) - 1, 0))
+            for k in range(int(self.length // bucket) + 1)
+        )
+
+    @classmethod
+    def from_tiles(cls, tiles):
+        """
+        由 (row, col) 格子序列建立經過格子中心的折線
+        """
+        return cls([(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2) for row, col in tiles])
+
+    def segment_at(self, distance):
+        """
+        回傳 distance 所在的線段索引
+        """
+        i = self.lookup[min(int(distance // self.bucket), len(self.lookup) - 1)]
+        cumulative = self.cumulative
+        last = len(self.directions) - 1
+        while i < last and cumulative[i + 1] < distance:
+            i += 1
+        return i
+
+    def position_at(self, distance):
+        if distance <= 0 or not self.directions:
+            return self.points[0]
+        if distance >= self.length:
+            return self.points[-1]
+        i = self.segment_at(distance)
+        x0, y0 = self.points[i]
+        ux, uy = self.directions[i]
+        t = distance - self.cumulative[i]
+        return (x0 + ux * t, y0 + uy * t)
+
+    def coverage(self, cx, cy, radius):
+        """
+        回傳路徑上距離 (cx, cy) 不超過 radius 的進度區間 [(start, end), ...]（已合併、由小到大）。
+        敵人座標就是 position_at(distance)，因此「在射程內」等同於 distance 落在這些區間中
+        """
+        r2 = radius * radius
+        intervals = []
+        if not self.directions:
+            x0, y0 = self.points[0]
+            if (x0 - cx) ** 2 + (y0 - cy) ** 2 <= r2:
+                intervals.append((0.0, 0.0))
+            return intervals
+        for i, ((x0, y0), (ux, uy)) in enumerate(zip(self.points, self.directions)):
+            seg_len = self.cumulative[i + 1] - self.cumulative[i]
+            # |p0 + u t - c|^2 <= r^2  =>  t^2 + 2 b t + c0 <= 0
+            px, py = x0 - cx, y0 - cy
+            b = ux * px + uy * py
+            c0 = px * px + py * py - r2
+            disc = b * b - c0
+            if disc < 0:
+                continue
+            root = disc ** 0.5
+            t0, t1 = max(0.0, -b - root), min(seg_len, -b + root)
+            if t0 > t1:
+                continue
+            start, end = self.cumulative[i] + t0, self.cumulative[i] + t1
+            if intervals and start <= intervals[-1][1] + 1e-9:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], end))
+            else:
+                intervals.append((start, end))
+        return intervals
@@ -0,0 +1,120 @@
+from operator import attrgetter
+from src.game.enemy_store import np
+
+_by_distance = attrgetter("distance")
+
+
+def _bisect(enemies, value, right):
+    """
+    在依 distance 排序的敵人清單中二分搜尋；不另外保留 distance 清單，
+    否則每個 tick 都會留住一份已過時的 float
+    """
+    lo, hi = 0, len(enemies)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        distance = enemies[mid].distance
+        if distance < value or (right and distance == value):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+class ProgressIndex:
+    """
+    依路徑進度（distance）排序的敵人清單，供塔以射程涵蓋的進度區間查詢目標。
+    每個 tick 第一次查詢時更新：一般模式沿用上一次的清單就地重新排序（敵人大致維持相對順序，
+    排序幾乎是線性時間），有新敵人加入時才依出場順序重建；向量化模式直接對 EnemyStore 的陣列排序。
+    同進度的敵人依出場順序排列，結果可重現。
+    """
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.tick = -1
+        self.dirty = True
+        self.enemies = []
+        # 向量化模式：依進度排序的 EnemyStore slot 與其 distance
+        self.slots = None
+        self.keys = None
+
+    def invalidate(self):
+        self.dirty = True
+
+    def refresh(self):
+        gm = self.game_manager
+        if not self.dirty and self.tick == gm.tick:
+            return
+        store = getattr(gm, "enemy_store", None)
+        if store is not None:
+            self.refresh_store(store)
+        else:
+            enemies = self.enemies
+            if self.dirty:
+                enemies[:] = gm.enemies  # 已移除的敵人留到下次重建，查詢時略過
+            enemies.sort(key=_by_distance)
+        self.tick = gm.tick
+        self.dirty = False
+
+    def refresh_store(self, store):
+        slots = np.flatnonzero(store.active[:store.size])
+        distance = store.distance[slots]
+        order = np.lexsort((store.spawn_id[slots], distance))
+        self.slots = slots[order]
+        self.keys = distance[order]
+
+    def enemy_at(self, i):
+        # 向量化模式下，這個 tick 中途被移除的敵人其 slot 為 None
+        if self.slots is not None:
+            return self.game_manager.enemy_store.views[self.slots[i]]
+        return self.enemies[i]
+
+    def spans(self, intervals):
+        """
+        回傳各進度區間在排序清單中的 (lo, hi) 範圍
+        """
+        self.refresh()
+        if self.slots is not None:
+            keys = self.keys
+            return [(int(np.searchsorted(keys, start, "left")), int(np.searchsorted(keys, end, "right")))
+                    for start, end in intervals]
+        enemies = self.enemies
+        return [(_bisect(enemies, start, False), _bisect(enemies, end, True)) for start, end in intervals]
+
+    def first(self, intervals):
+        """
+        區間內走得最遠（最接近城堡）的敵人
+        """
+        spans = self.spans(intervals)
+        enemy_at = self.enemy_at
+        for lo, hi in reversed(spans):
+            for i in range(hi - 1, lo - 1, -1):
+                enemy = enemy_at(i)
+                if enemy is not None and enemy.is_alive():
+                    return enemy
+        return None
+
+    def last(self, intervals):
+        """
+        區間內走得最少的敵人
+        """
+        spans = self.spans(intervals)
+        enemy_at = self.enemy_at
+        for lo, hi in spans:
+            for i in range(lo, hi):
+                enemy = enemy_at(i)
+                if enemy is not None and enemy.is_alive():
+                    return enemy
+        return None
+
+    def strongest(self, intervals):
+        """
+        區間內血量最高的敵人，同血量時取走得較遠者
+        """
+        spans = self.spans(intervals)
+        enemy_at = self.enemy_at
+        best = None
+        for lo, hi in reversed(spans):
+            for i in range(hi - 1, lo - 1, -1):
+                enemy = enemy_at(i)
+                if enemy is not None and enemy.is_alive() and (best is None or enemy.hp > best.hp):
+                    best = enemy
+        return best
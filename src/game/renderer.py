@@ -0,0 +1,124 @@
+import pygame
+from src.utils.constants import TILE_SIZE
+
+
+class Renderer:
+    """
+    把地圖、實體與 UI 畫到畫面上，每個 sprite 每幀只畫一次。
+    dirty=True 時使用髒矩形模式：只用背景蓋掉上一幀畫過的區域再重畫，
+    draw() 回傳需更新的矩形供 pygame.display.update(rects)；
+    變動面積超過 full_redraw_ratio 或需要整個重畫時回傳 None，由呼叫端 flip。
+    """
+    def __init__(self, game_manager, dirty=False, full_redraw_ratio=0.5):
+        self.game_manager = game_manager
+        self.dirty = dirty
+        self.full_redraw_ratio = full_redraw_ratio
+        self.prev_rects = None  # 上一幀畫過的區域，None 表示下一幀需整個重畫
+        self.prev_background = None
+        self.canvas = None  # 鏡頭縮放時使用的世界比例畫布
+
+    def invalidate(self):
+        """
+        要求下一幀整個重畫（例如視窗大小或地圖改變）
+        """
+        self.prev_rects = None
+
+    def draw(self, surface):
+        gm = self.game_manager
+        profiler = gm.profiler
+        camera = getattr(gm, "camera", None)
+        if camera is not None and not camera.is_identity:
+            return self.draw_camera(surface, camera)
+        # 地圖比畫面大時，畫面外的實體不畫
+        view = camera.view_rect if camera is not None and not camera.fits_view else None
+        if not self.dirty:
+            with profiler.section("map_draw"):
+                gm.map_manager.draw(surface)
+            with profiler.section("entity_draw"):
+                self.draw_entities(surface, view=view)
+            if gm.ui:
+                with profiler.section("ui_draw"):
+                    gm.ui.draw(surface)
+            return None
+
+        with profiler.section("map_draw"):
+            background = gm.map_manager.get_background(surface.get_size())
+            full = self.prev_rects is None or background is not self.prev_background
+            if full:
+                surface.blit(background, (0, 0))
+            else:
+                # 用背景蓋掉上一幀畫過的地方
+                for rect in self.prev_rects:
+                    surface.blit(background, rect, rect)
+        with profiler.section("entity_draw"):
+            rects = self.draw_entities(surface, collect=True, view=view)
+        if gm.ui:
+            with profiler.section("ui_draw"):
+                gm.ui.draw(surface)
+                rects.extend(gm.ui.dirty_rects(surface))
+        screen_rect = surface.get_rect()
+        rects = [rect.clip(screen_rect) for rect in rects]
+        dirty = [rect for rect in rects if rect.width and rect.height]
+        if not full:
+            dirty.extend(self.prev_rects)
+        self.prev_rects = rects
+        self.prev_background = background
+        if full:
+            return None
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area > self.full_redraw_ratio * screen_rect.width * screen_rect.height:
+            return None
+        return dirty
+
+    def draw_camera(self, surface, camera):
+        """
+        鏡頭模式：只畫可見範圍內的背景區塊與實體，縮放時先畫到世界比例的畫布再縮放到畫面。
+        畫面每幀都會變動，一律回傳 None（整個 flip）
+        """
+        gm = self.game_manager
+        profiler = gm.profiler
+        self.prev_rects = None  # 回到一般模式時需整個重畫
+        view = camera.view_rect
+        if camera.zoom == 1.0:
+            canvas = surface
+        else:
+            if self.canvas is None or self.canvas.get_size() != view.size:
+                self.canvas = pygame.Surface(view.size)
+            canvas = self.canvas
+        with profiler.section("map_draw"):
+            gm.map_manager.draw_view(canvas, view)
+        with profiler.section("entity_draw"):
+            self.draw_entities(canvas, view=view)
+            if canvas is not surface:
+                size = (round(view.width * camera.zoom), round(view.height * camera.zoom))
+                surface.blit(pygame.transform.scale(canvas, size), (0, 0))
+        if gm.ui:
+            with profiler.section("ui_draw"):
+                gm.ui.draw(surface)
+        return None
+
+    def draw_entities(self, surface, collect=False, view=None):
+        """
+        依序畫投射物（含預排命中的投射物）、敵人（含血條）與塔；collect=True 時回傳各自畫過的範圍。
+        view 為可見的世界範圍時只畫與其重疊的實體，並以 view 左上角為原點
+        """
+        gm = self.game_manager
+        rects = []
+        offset = (0, 0)
+        margin = None
+        enemies = gm.enemies
+        if view is not None:
+            offset = (-view.x, -view.y)
+            margin = view.inflate(TILE_SIZE * 2, TILE_SIZE * 2)  # 含血條等超出 rect 的部分
+            # 敵人由空間索引取出可見格子內的，依出場順序畫以維持原本的重疊順序
+            enemies = gm.enemy_grid.query_rect(margin.left, margin.top, margin.right, margin.bottom)
+            enemies.sort(key=lambda enemy: enemy.spawn_id)
+        shots = gm.shots.place_for_draw() if getattr(gm, "shots", None) is not None else ()
+        for group in (gm.projectiles, shots, enemies, gm.towers):
+            for sprite in group:
+                if margin is not None and not margin.colliderect(sprite.rect):
+                    continue
+                sprite.draw(surface, offset)
+                if collect:
+                    rects.append(sprite.draw_bounds().move(offset))
+        return rects
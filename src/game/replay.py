@@ -0,0 +1,156 @@
+import json
+import struct
+from src.game.map_compiler import CompiledMap
+from src.game.spawn_scheduler import waves_from_json, waves_to_json
+from src.entities.towers.cannon_tower import CannonTower
+from src.entities.towers.machine_tower import MachineTower
+from src.entities.towers.freeze_tower import FreezeTower
+
+# 檔案中以索引記錄塔種，新增塔種只能加在最後面
+TOWER_TYPES = (CannonTower, MachineTower, FreezeTower)
+
+ACTION_PLACE = 0
+ACTION_UPGRADE = 1
+ACTION_SELL = 2
+ACTION_TARGET_MODE = 3
+
+FLAG_SCHEDULED_PROJECTILES = 1
+
+MAGIC = b"TDRP"
+VERSION = 4
+# 檔頭：magic, 版本, seed, rows, cols, 結束 tick, 操作數, 旗標（FLAG_*）, 難度字串長度,
+# 自訂地圖 JSON 長度（0 表示內建地圖）, 自訂波次 JSON 長度（0 表示內建規則）
+_HEADER = struct.Struct("<4sHQHHIIBBII")
+# 每筆操作：tick, 操作種類, row, col, 塔種索引（設定目標方式時為 TARGET_MODES 索引）
+_ACTION = struct.Struct("<IBHHB")
+
+
+class Replay:
+    """
+    一局遊戲的重播資料：seed、難度、地圖大小（自訂地圖、自訂波次時連同其定義），以及每個操作發生在哪個 tick。
+    模擬是固定步長且亂數只來自 seed，所以照 tick 重放操作即可得到相同結果。
+    """
+    def __init__(self, seed, difficulty, map_size, actions=None, end_tick=0, map=None, waves=None,
+                 scheduled_projectiles=False):
+        self.seed = seed
+        self.difficulty = difficulty or "normal"
+        self.map_size = tuple(map_size)
+        self.map = map  # CompiledMap；None 表示依難度與大小使用內建地圖
+        self.waves = waves  # 每波的群組清單；None 表示依內建規則產生
+        self.scheduled_projectiles = scheduled_projectiles  # 錄製時是否使用預排命中的投射物
+        self.actions = actions if actions is not None else []  # [(tick, action, row, col, tower_index)]
+        self.end_tick = end_tick
+
+    def save(self, path):
+        difficulty = self.difficulty.encode("utf-8")
+        map_data = encode_map(self.map)
+        wave_data = encode_waves(self.waves)
+        rows, cols = self.map_size
+        flags = FLAG_SCHEDULED_PROJECTILES if self.scheduled_projectiles else 0
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, self.seed, rows, cols, self.end_tick, len(self.actions), flags,
+                                 len(difficulty), len(map_data), len(wave_data)))
+            f.write(difficulty)
+            f.write(map_data)
+            f.write(wave_data)
+            for action in self.actions:
+                f.write(_ACTION.pack(*action))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, version = struct.unpack_from("<4sH", data, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} 不是重播檔")
+        if version != VERSION:
+            raise ValueError(f"不支援的重播檔版本: {version}")
+        _, _, seed, rows, cols, end_tick, count, flags, name_len, map_len, waves_len = _HEADER.unpack_from(data, 0)
+        offset = _HEADER.size
+        difficulty = data[offset:offset + name_len].decode("utf-8")
+        offset += name_len
+        compiled = decode_map(data[offset:offset + map_len])
+        offset += map_len
+        waves = decode_waves(data[offset:offset + waves_len])
+        offset += waves_len
+        actions = [_ACTION.unpack_from(data, offset + i * _ACTION.size) for i in range(count)]
+        return cls(seed, difficulty, (rows, cols), actions, end_tick, compiled, waves,
+                   bool(flags & FLAG_SCHEDULED_PROJECTILES))
+
+
+def encode_map(compiled):
+    """
+    自訂地圖編成 JSON bytes（存檔與重播檔共用）；內建地圖回傳空 bytes
+    """
+    if compiled is None:
+        return b""
+    return json.dumps(compiled.to_json(), separators=(",", ":")).encode("utf-8")
+
+
+def decode_map(data):
+    if not data:
+        return None
+    return CompiledMap.from_json(json.loads(data.decode("utf-8")))
+
+
+def encode_waves(waves):
+    """
+    自訂波次編成 JSON bytes（存檔與重播檔共用）；使用內建規則時回傳空 bytes
+    """
+    if not waves:
+        return b""
+    return json.dumps(waves_to_json(waves), separators=(",", ":")).encode("utf-8")
+
+
+def decode_waves(data):
+    if not data:
+        return None
+    return waves_from_json(json.loads(data.decode("utf-8")))
+
+
+class ReplayRecorder:
+    """
+    記錄 GameManager 的玩家操作（由 GameManager.record_action 呼叫）
+    """
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        mm = game_manager.map_manager
+        self.replay = Replay(game_manager.seed, game_manager.difficulty, (mm.rows, mm.cols),
+                             map=mm.custom_map, waves=game_manager.wave_manager.waves,
+                             scheduled_projectiles=game_manager.shots is not None)
+
+    def record(self, action, row, col, tower_type=None, mode=None):
+        if mode is not None:
+            tower_index = mode
+        else:
+            tower_index = TOWER_TYPES.index(tower_type) if tower_type is not None else 0
+        # 操作發生在第 tick 次 update 之後、下一次 update 之前
+        self.replay.actions.append((self.game_manager.tick, action, row, col, tower_index))
+
+    def save(self, path):
+        self.replay.end_tick = self.game_manager.tick
+        self.replay.save(path)
+
+
+class ReplayPlayer:
+    """
+    依 tick 把重播檔中的操作送回 GameManager；設定為 game_manager.input_source 後，
+    GameManager.update 每個 tick 開始前會呼叫 apply_due
+    """
+    def __init__(self, replay):
+        self.replay = replay
+        self.index = 0
+
+    def apply_due(self, game_manager):
+        actions = self.replay.actions
+        while self.index < len(actions) and actions[self.index][0] <= game_manager.tick:
+            _, action, row, col, tower_index = actions[self.index]
+            if action == ACTION_TARGET_MODE:
+                game_manager.apply_action(action, row, col, mode=tower_index)
+            else:
+                game_manager.apply_action(action, row, col, TOWER_TYPES[tower_index])
+            self.index += 1
+
+    def finished(self, game_manager):
+        return game_manager.is_game_over() or game_manager.tick >= self.replay.end_tick
+
@@ -0,0 +1,119 @@
+import heapq
+from src.utils.constants import SIM_DT
+
+MAX_INTERCEPT_ITERATIONS = 8
+
+
+def predict_distance(enemy, t):
+    """
+    預測敵人 t 秒後沿路徑走到的距離（狀態效果結束後恢復原速）
+    """
+    status_effects = getattr(enemy.game_manager, "status_effects", None)
+    if status_effects is not None:
+        return status_effects.predict_distance(enemy, t)
+    return enemy.distance + enemy.speed * enemy.speed_factor * t
+
+
+def intercept_time(x, y, speed, enemy, path):
+    """
+    從 (x, y) 以 speed 發射時，擊中沿路徑移動的敵人所需的秒數與命中點；
+    反覆代入求解，不收斂或敵人會先抵達城堡時回傳 None
+    """
+    dx, dy = enemy.x - x, enemy.y - y
+    t = (dx * dx + dy * dy) ** 0.5 / speed
+    for _ in range(MAX_INTERCEPT_ITERATIONS):
+        distance = predict_distance(enemy, t)
+        if distance >= path.exit_distance:
+            return None
+        ax, ay = path.position_at(distance)
+        dx, dy = ax - x, ay - y
+        new_t = (dx * dx + dy * dy) ** 0.5 / speed
+        if abs(new_t - t) < SIM_DT / 2:
+            return new_t, (ax, ay)
+        t = new_t
+    return None
+
+
+class ShotQueue:
+    """
+    預排命中的投射物：發射時算出飛行時間，把命中排進以 tick 排序的 heap，
+    飛行途中不做任何逐幀運算；畫面上的位置只在繪圖時由發射點與命中點內插。
+    這是追蹤式投射物的近似：到了 hit_tick 才把投射物移到目標當下的位置並對目標（仍存活時）呼叫 on_hit，
+    飛行途中不做碰撞判定，不會像追蹤式投射物一樣打中擋在路上的其他敵人，因此遊戲結果可能不同。
+    """
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __iter__(self):
+        return (entry[2] for entry in self.heap)
+
+    def fire(self, projectile):
+        """
+        排定命中；無法預測命中（追不上或目標會先離開地圖）時回傳 False，由呼叫端改用一般投射物
+        """
+        gm = self.game_manager
+        target = projectile.target
+        path = getattr(gm.map_manager, "path", None)
+        if target is None or path is None:
+            return False
+        solution = intercept_time(projectile.x, projectile.y, projectile.speed, target, path)
+        if solution is None:
+            return False
+        t, aim = solution
+        projectile.origin = (projectile.x, projectile.y)
+        projectile.aim = aim
+        projectile.fire_tick = gm.tick
+        projectile.hit_tick = gm.tick + max(1, round(t / SIM_DT))
+        self.schedule(projectile)
+        return True
+
+    def schedule(self, projectile):
+        heapq.heappush(self.heap, (projectile.hit_tick, self.seq, projectile))
+        self.seq += 1
+
+    def update(self):
+        """
+        處理這個 tick 到期的命中
+        """
+        heap = self.heap
+        tick = self.game_manager.tick
+        while heap and heap[0][0] <= tick:
+            projectile = heapq.heappop(heap)[2]
+            target = projectile.target
+            if target is not None and target.is_alive():
+                projectile.x, projectile.y = target.x, target.y
+                projectile.rect.center = (target.x, target.y)
+                projectile.on_hit(target)
+            projectile.kill()
+
+    def entries(self):
+        """
+        依命中順序回傳排定的投射物（存檔用）
+        """
+        return [projectile for _, _, projectile in sorted(self.heap, key=lambda entry: entry[:2])]
+
+    def clear(self):
+        for _, _, projectile in self.heap:
+            projectile.kill()
+        self.heap.clear()
+
+    def place_for_draw(self):
+        """
+        依目前 tick 內插每個投射物的位置並回傳，只在繪圖時呼叫
+        """
+        tick = self.game_manager.tick
+        projectiles = []
+        for hit_tick, _, projectile in self.heap:
+            span = hit_tick - projectile.fire_tick
+            f = min(1.0, (tick - projectile.fire_tick) / span)
+            (ox, oy), (ax, ay) = projectile.origin, projectile.aim
+            projectile.x = ox + (ax - ox) * f
+            projectile.y = oy + (ay - oy) * f
+            projectile.rect.center = (projectile.x, projectile.y)
+            projectiles.append(projectile)
+        return projectiles
@@ -0,0 +1,74 @@
+from src.game.game_manager import GameManager
+from src.game.replay import ReplayPlayer
+from src.utils.constants import TILE_SIZE, SIM_DT, MAP_SIZE_NORMAL
+
+
+class HeadlessSimulator:
+    """
+    無畫面模擬器：使用與正式遊戲相同的 WaveManager、塔、敵人、投射物與碰撞邏輯，
+    但不開視窗、不載入圖片/字型/音效，能以 CPU 最快速度推進遊戲。
+    """
+    def __init__(self, map_size=MAP_SIZE_NORMAL, difficulty="normal", seed=0, vectorized=False,
+                 scheduled_projectiles=False, map_file=None, waves=None):
+        self.game_manager = GameManager(None, map_size=map_size, difficulty=difficulty, headless=True, seed=seed,
+                                        vectorized=vectorized, scheduled_projectiles=scheduled_projectiles,
+                                        map_file=map_file, waves=waves)
+
+    @classmethod
+    def from_replay(cls, replay, vectorized=False):
+        """
+        建立會依 tick 套用重播操作的模擬器，之後用 run_replay() 跑完
+        """
+        sim = cls(replay.map_size, replay.difficulty, replay.seed, vectorized, replay.scheduled_projectiles,
+                  map_file=replay.map, waves=replay.waves)
+        sim.player = ReplayPlayer(replay)
+        sim.game_manager.input_source = sim.player
+        return sim
+
+    def run_replay(self):
+        """
+        以最快速度跑完重播（直到重播結束的 tick 或遊戲結束）
+        """
+        gm = self.game_manager
+        while not self.player.finished(gm):
+            self.step()
+        self.player.apply_due(gm)  # 最後一個 tick 之後的操作
+        return self.result()
+
+    @property
+    def time(self):
+        # 模擬經過的秒數（固定步長，故由 tick 數換算）
+        return self.game_manager.tick * SIM_DT
+
+    def build_tower(self, tower_cls, row, col):
+        """
+        在 (row, col) 格子建塔，金錢不足或格子不可用時回傳 False
+        """
+        pos = (col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+        return self.game_manager.build_tower(pos, tower_cls)
+
+    def step(self):
+        self.game_manager.update(SIM_DT)
+
+    def run(self, max_time=600.0, max_wave=None):
+        """
+        持續推進直到遊戲結束、超過 max_time 秒（模擬時間）或到達 max_wave 波
+        """
+        gm = self.game_manager
+        while not gm.is_game_over() and self.time < max_time:
+            if max_wave is not None and gm.wave_manager.wave > max_wave:
+                break
+            self.step()
+        return self.result()
+
+    def result(self):
+        gm = self.game_manager
+        return {
+            "wave": gm.wave_manager.wave,
+            "score": gm.score,
+            "money": gm.money,
+            "life": gm.life,
+            "time": self.time,
+            "seed": self.game_manager.seed,
+            "game_over": gm.is_game_over(),
+        }
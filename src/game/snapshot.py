@@ -0,0 +1,294 @@
+import struct
+from src.game.game_manager import GameManager
+from src.game.replay import TOWER_TYPES, encode_map, decode_map, encode_waves, decode_waves
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.enemies.fast_enemy import FastEnemy
+from src.entities.enemies.tank_enemy import TankEnemy
+from src.entities.projectiles.bullet import Bullet
+from src.entities.projectiles.cannon_ball import CannonBall
+from src.entities.projectiles.ice_ball import IceBall
+from src.entities.enemies.base_enemy import BaseEnemy
+from src.entities.towers.base_tower import TARGET_MODES
+from src.game.status_effects import EFFECT_KINDS
+
+# 存檔中以索引記錄類別，新增類別只能加在最後面
+ENEMY_TYPES = (BasicEnemy, FastEnemy, TankEnemy)
+PROJECTILE_TYPES = (Bullet, CannonBall, IceBall)
+
+MAGIC = b"TDSV"
+# 只讀取目前版本的存檔；格式有任何改變時遞增版本，舊版存檔不再支援
+VERSION = 9
+
+# 檔頭：magic, 版本, seed, tick, rows, cols, 旗標（FLAG_*）, 難度字串長度, 自訂地圖 JSON 長度（0 表示內建地圖）,
+# 自訂波次 JSON 長度（0 表示內建規則）
+_HEADER = struct.Struct("<4sHQIHHBBII")
+# 遊戲數值：money, life, score, next_enemy_id, enemy_extent, game_over, 固定步長累加器
+_GAME = struct.Struct("<qqqIHBd")
+# 亂數產生器狀態：random.getstate() 的 625 個整數與 gauss_next
+_RNG = struct.Struct("<625IBd")
+# 波次：wave, 本波經過秒數, wave_in_progress, spawn_interval, enemies_per_wave, 待出怪數
+_WAVE = struct.Struct("<IdBdII")
+# 待出怪：出怪時間, 類別
+_SPAWN = struct.Struct("<dB")
+# 塔排程：排程器時間, 塔數
+_TOWER_CLOCK = struct.Struct("<dI")
+# 塔：類別, x, y, level, attack_cooldown, damage, attack_speed, 停放中, 下次攻擊時間, 目標選擇方式（TARGET_MODES 索引）
+_TOWER = struct.Struct("<BiiidqdBdB")
+# 敵人：類別, spawn_id, distance, x, y, hp, max_hp, speed
+_ENEMY = struct.Struct("<BIdddddd")
+# 狀態效果：引擎時間, 下一個序號, 效果數；每個效果為 敵人 spawn_id, 種類, 強度, 結束時間, 序號
+_EFFECT_CLOCK = struct.Struct("<dII")
+_EFFECT = struct.Struct("<IBddI")
+# 投射物：類別, x, y, damage, 目標 spawn_id（-1 表示無目標）
+_PROJECTILE = struct.Struct("<Bddqq")
+# 預排命中的投射物：類別, 發射點 x, y, 命中點 x, y, damage, 目標 spawn_id, 發射 tick, 命中 tick
+_SHOT = struct.Struct("<BddddqqII")
+_COUNT = struct.Struct("<I")
+_KIND = struct.Struct("<B")
+
+KIND_ENEMY = 0
+KIND_PROJECTILE = 1
+
+FLAG_VECTORIZED = 1
+FLAG_SCHEDULED_PROJECTILES = 2
+
+
+def _type_index(obj, types):
+    # 向量化敵人的類別是 EnemyView 子類別，沿 MRO 找到原本的類別
+    for cls in type(obj).__mro__:
+        if cls in types:
+            return types.index(cls)
+    raise ValueError(f"無法存檔的類別: {type(obj).__name__}")
+
+
+def dumps(game_manager):
+    """
+    把遊戲狀態序列化成 bytes（不含圖片、字型等資源，讀檔時重新建立）
+    """
+    gm = game_manager
+    mm = gm.map_manager
+    wm = gm.wave_manager
+    difficulty = (gm.difficulty or "normal").encode("utf-8")
+    map_data = encode_map(mm.custom_map)
+    wave_data = encode_waves(wm.waves)
+    flags = (FLAG_VECTORIZED if gm.enemy_store is not None else 0) | \
+        (FLAG_SCHEDULED_PROJECTILES if gm.shots is not None else 0)
+    parts = [
+        _HEADER.pack(MAGIC, VERSION, gm.seed, gm.tick, mm.rows, mm.cols, flags, len(difficulty), len(map_data),
+                     len(wave_data)),
+        difficulty,
+        map_data,
+        wave_data,
+        _GAME.pack(gm.money, gm.life, gm.score, gm.next_enemy_id, gm.enemy_extent, gm.game_over,
+                   gm.clock.accumulator),
+    ]
+    _, state, gauss = gm.rng.getstate()
+    parts.append(_RNG.pack(*state, gauss is not None, gauss or 0.0))
+    pending = wm.scheduler.entries()
+    parts.append(_WAVE.pack(wm.wave, wm.time, wm.wave_in_progress, wm.spawn_interval, wm.enemies_per_wave,
+                            len(pending)))
+    parts.extend(_SPAWN.pack(time, ENEMY_TYPES.index(cls)) for time, cls in pending)
+
+    # 敵人依 enemies group 的順序存，讀檔時以相同順序加回以維持遊戲邏輯的順序
+    enemies = list(gm.enemies)
+    parts.append(_COUNT.pack(len(enemies)))
+    pack_enemy = _ENEMY.pack
+    for e in enemies:
+        parts.append(pack_enemy(_type_index(e, ENEMY_TYPES), e.spawn_id, e.distance, e.x, e.y, e.hp, e.max_hp,
+                                e.speed))
+
+    # 效果依施加順序存，讀檔時以原本的序號放回 heap
+    status_effects = gm.status_effects
+    effects = status_effects.entries()
+    parts.append(_EFFECT_CLOCK.pack(status_effects.now, status_effects.seq, len(effects)))
+    for enemy, effect in effects:
+        parts.append(_EFFECT.pack(enemy.spawn_id, EFFECT_KINDS.index(effect.kind), effect.magnitude,
+                                  effect.expires, effect.seq))
+
+    # 塔依建塔順序存，同時間冷卻結束的塔依此順序攻擊
+    scheduler = gm.tower_scheduler
+    towers = scheduler.entries()
+    parts.append(_TOWER_CLOCK.pack(scheduler.now, len(towers)))
+    for tower, ready_time in towers:
+        parts.append(_TOWER.pack(TOWER_TYPES.index(type(tower)), tower.x, tower.y, tower.level,
+                                 scheduler.cooldown(tower), tower.damage, tower.attack_speed,
+                                 ready_time is None, ready_time or 0.0, TARGET_MODES.index(tower.target_mode)))
+
+    # entities group 的順序決定 update 順序，投射物照原順序存，敵人只記 spawn_id
+    entities = list(gm.entities)
+    parts.append(_COUNT.pack(len(entities)))
+    for entity in entities:
+        if isinstance(entity, BaseEnemy):
+            parts.append(_KIND.pack(KIND_ENEMY))
+            parts.append(_COUNT.pack(entity.spawn_id))
+        else:
+            target = entity.target
+            target_id = target.spawn_id if target is not None and target.is_alive() else -1
+            parts.append(_KIND.pack(KIND_PROJECTILE))
+            parts.append(_PROJECTILE.pack(_type_index(entity, PROJECTILE_TYPES), entity.x, entity.y,
+                                          entity.damage, target_id))
+
+    if gm.shots is not None:
+        shots = gm.shots.entries()
+        parts.append(_COUNT.pack(len(shots)))
+        for shot in shots:
+            target = shot.target
+            target_id = target.spawn_id if target is not None and target.is_alive() else -1
+            parts.append(_SHOT.pack(_type_index(shot, PROJECTILE_TYPES), *shot.origin, *shot.aim, shot.damage,
+                                    target_id, shot.fire_tick, shot.hit_tick))
+    return b"".join(parts)
+
+
+def _read_header(data):
+    magic, version = struct.unpack_from("<4sH", data, 0)
+    if magic != MAGIC:
+        raise ValueError("不是存檔資料")
+    if version != VERSION:
+        raise ValueError(f"不支援的存檔版本: {version}")
+    _, _, seed, tick, rows, cols, flags, name_len, map_len, waves_len = _HEADER.unpack_from(data, 0)
+    offset = _HEADER.size
+    difficulty = data[offset:offset + name_len].decode("utf-8")
+    offset += name_len
+    compiled = decode_map(data[offset:offset + map_len])
+    offset += map_len
+    waves = decode_waves(data[offset:offset + waves_len])
+    return seed, tick, (rows, cols), flags, difficulty, compiled, waves, offset + waves_len
+
+
+def read_settings(data):
+    """
+    只讀出存檔的難度、地圖大小與自訂地圖（建立視窗用；內建地圖時第三項為 None）
+    """
+    _, _, map_size, _, difficulty, compiled, _, _ = _read_header(data)
+    return difficulty, map_size, compiled
+
+
+def loads(data, screen=None, headless=None, **kwargs):
+    """
+    由 dumps() 的結果建立新的 GameManager；headless 未指定時依 screen 是否為 None 決定，
+    其餘參數（audio_manager、dirty_rects 等）直接傳給 GameManager
+    """
+    seed, tick, map_size, flags, difficulty, compiled, waves, offset = _read_header(data)
+    if headless is None:
+        headless = screen is None
+    gm = GameManager(screen, map_size=map_size, difficulty=difficulty, headless=headless, seed=seed, map_file=compiled,
+                     waves=waves,
+                     vectorized=bool(flags & FLAG_VECTORIZED),
+                     scheduled_projectiles=bool(flags & FLAG_SCHEDULED_PROJECTILES), **kwargs)
+    gm.tick = tick
+
+    money, life, score, next_enemy_id, enemy_extent, game_over, accumulator = _GAME.unpack_from(data, offset)
+    offset += _GAME.size
+    gm.money, gm.life, gm.score = money, life, score
+    gm.game_over = bool(game_over)
+    gm.clock.accumulator = accumulator
+
+    rng = _RNG.unpack_from(data, offset)
+    offset += _RNG.size
+    gm.rng.setstate((3, tuple(rng[:625]), rng[626] if rng[625] else None))
+
+    wm = gm.wave_manager
+    wave, wave_time, in_progress, spawn_interval, per_wave, queued = _WAVE.unpack_from(data, offset)
+    offset += _WAVE.size
+    wm.wave, wm.time, wm.wave_in_progress = wave, wave_time, bool(in_progress)
+    wm.spawn_interval, wm.enemies_per_wave = spawn_interval, per_wave
+    # entries() 已依出怪順序排好，依序排回即可保留同時間出怪的先後
+    wm.scheduler.clear()
+    for time, type_index in _SPAWN.iter_unpack(data[offset:offset + queued * _SPAWN.size]):
+        wm.scheduler.schedule(time, ENEMY_TYPES[type_index])
+    offset += queued * _SPAWN.size
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    start_tile = gm.map_manager.path_tiles[0]
+    by_id = {}
+    for values in _ENEMY.iter_unpack(data[offset:offset + count * _ENEMY.size]):
+        type_index, spawn_id, distance, x, y, hp, max_hp, speed = values
+        enemy_cls = ENEMY_TYPES[type_index]
+        if gm.enemy_store is not None:
+            enemy = gm.enemy_store.spawn(enemy_cls, start_tile)
+            gm.enemy_store.speed[enemy._slot] = speed
+        else:
+            enemy = enemy_cls(start_tile, gm)
+        enemy.distance, enemy.x, enemy.y = distance, x, y
+        enemy.hp, enemy.max_hp, enemy.speed = hp, max_hp, speed
+        enemy.rect.center = (x, y)
+        enemy.spawn_id = spawn_id
+        gm.enemies.add(enemy)
+        gm.enemy_grid.insert(enemy)
+        by_id[spawn_id] = enemy
+        if gm.enemy_store is not None:
+            cell = gm.enemy_grid.cell_of(x, y)
+            gm.enemy_store.cell_x[enemy._slot], gm.enemy_store.cell_y[enemy._slot] = cell
+    offset += count * _ENEMY.size
+    gm.next_enemy_id = next_enemy_id
+    gm.enemy_extent = enemy_extent
+
+    status_effects = gm.status_effects
+    now, next_seq, count = _EFFECT_CLOCK.unpack_from(data, offset)
+    offset += _EFFECT_CLOCK.size
+    status_effects.now = now
+    for spawn_id, kind, magnitude, expires, seq in _EFFECT.iter_unpack(data[offset:offset + count * _EFFECT.size]):
+        status_effects.restore(by_id[spawn_id], EFFECT_KINDS[kind], magnitude, expires, seq)
+    offset += count * _EFFECT.size
+    status_effects.seq = next_seq
+
+    now, count = _TOWER_CLOCK.unpack_from(data, offset)
+    offset += _TOWER_CLOCK.size
+    gm.tower_scheduler.now = now
+    for values in _TOWER.iter_unpack(data[offset:offset + count * _TOWER.size]):
+        _restore_tower(gm, values)
+    offset += count * _TOWER.size
+
+    (count,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    for _ in range(count):
+        (kind,) = _KIND.unpack_from(data, offset)
+        offset += _KIND.size
+        if kind == KIND_ENEMY:
+            (spawn_id,) = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            gm.entities.add(by_id[spawn_id])
+        else:
+            type_index, x, y, damage, target_id = _PROJECTILE.unpack_from(data, offset)
+            offset += _PROJECTILE.size
+            projectile = PROJECTILE_TYPES[type_index].spawn(x, y, by_id.get(target_id), damage, gm)
+            # 直接加入群組：存檔時就是追蹤式投射物，不重新預排
+            gm.projectiles.add(projectile)
+            gm.entities.add(projectile)
+
+    if flags & FLAG_SCHEDULED_PROJECTILES:
+        (count,) = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        # entries() 已依命中順序排好，依序排回即可保留同 tick 命中的先後
+        for values in _SHOT.iter_unpack(data[offset:offset + count * _SHOT.size]):
+            type_index, ox, oy, ax, ay, damage, target_id, fire_tick, hit_tick = values
+            shot = PROJECTILE_TYPES[type_index].spawn(ox, oy, by_id.get(target_id), damage, gm)
+            shot.origin, shot.aim = (ox, oy), (ax, ay)
+            shot.fire_tick, shot.hit_tick = fire_tick, hit_tick
+            gm.shots.schedule(shot)
+        offset += count * _SHOT.size
+    return gm
+
+
+def _restore_tower(gm, values):
+    type_index, x, y, level, cooldown, damage, attack_speed, parked, ready_time, mode = values
+    tower = TOWER_TYPES[type_index](x, y, gm)
+    tower.level, tower.attack_cooldown = level, cooldown
+    tower.damage, tower.attack_speed = damage, attack_speed
+    tower.target_mode = TARGET_MODES[mode]
+    if level > 1 and tower.image_names:
+        tower.set_image()
+    gm.towers.add(tower)
+    gm.tower_scheduler.add(tower, ready_time, bool(parked))
+    gm.map_manager.set_tower(tower)
+
+
+def save(game_manager, path):
+    with open(path, "wb") as f:
+        f.write(dumps(game_manager))
+
+
+def load(path, screen=None, **kwargs):
+    with open(path, "rb") as f:
+        return loads(f.read(), screen=screen, **kwargs)
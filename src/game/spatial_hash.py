@@ -0,0 +1,180 @@
+from src.utils.constants import TILE_SIZE
+
+
+class SpatialHash:
+    """
+    均勻網格索引：以 cell_size（預設 TILE_SIZE）切格，每格記錄格內的物件。
+    範圍查詢只走訪與圓形重疊的格子，並以距離平方比較，不需開根號。
+    物件需有 x, y 屬性；所在格子記錄在物件的 grid_cell 屬性上。
+    watch() 可登記在物件進入某些格子時被呼叫的 callback（例如閒置的塔等待敵人進入射程）。
+    """
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {entity: None}，用 dict 保持插入順序
+        self.count = 0
+        self.watchers = {}  # (cx, cy) -> {watcher: callback}
+
+    def __len__(self):
+        return self.count
+
+    def cell_of(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def insert(self, entity):
+        cell = self.cell_of(entity.x, entity.y)
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = {}
+        bucket[entity] = None
+        entity.grid_cell = cell
+        self.count += 1
+        if self.watchers:
+            self.notify(cell)
+
+    def remove(self, entity):
+        cell = getattr(entity, "grid_cell", None)
+        if cell is None:
+            return
+        bucket = self.cells[cell]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[cell]
+        entity.grid_cell = None
+        self.count -= 1
+
+    def move(self, entity):
+        """
+        物件移動後呼叫；只有跨格時才更新索引
+        """
+        cell = self.cell_of(entity.x, entity.y)
+        old = entity.grid_cell
+        if cell == old:
+            return
+        if old is None:
+            return  # 已被移除的物件不再加入
+        bucket = self.cells[old]
+        del bucket[entity]
+        if not bucket:
+            del self.cells[old]
+        bucket = self.cells.get(cell)
+        if bucket is None:
+            bucket = self.cells[cell] = {}
+        bucket[entity] = None
+        entity.grid_cell = cell
+        if self.watchers:
+            self.notify(cell)
+
+    def watch(self, watcher, cells, callback):
+        """
+        有物件進入 cells 中任一格時呼叫 callback(watcher)；callback 觸發後不會自動取消登記
+        """
+        watcher.watch_cells = cells
+        for cell in cells:
+            bucket = self.watchers.get(cell)
+            if bucket is None:
+                bucket = self.watchers[cell] = {}
+            bucket[watcher] = callback
+
+    def unwatch(self, watcher):
+        for cell in getattr(watcher, "watch_cells", ()):
+            bucket = self.watchers[cell]
+            del bucket[watcher]
+            if not bucket:
+                del self.watchers[cell]
+        watcher.watch_cells = ()
+
+    def notify(self, cell):
+        bucket = self.watchers.get(cell)
+        if bucket:
+            # callback 可能會取消登記，先複製一份
+            for watcher, callback in list(bucket.items()):
+                callback(watcher)
+
+    def any_in(self, cells):
+        """
+        cells 中是否有任何物件
+        """
+        return any(cell in self.cells for cell in cells)
+
+    def cells_in_circle(self, x, y, radius):
+        """
+        回傳與圓形重疊的所有格子（中心點在圓內的物件一定落在這些格子中）
+        """
+        cs = self.cell_size
+        r2 = radius * radius
+        result = []
+        for cx in range(int((x - radius) // cs), int((x + radius) // cs) + 1):
+            left = cx * cs
+            ddx = left - x if x < left else (x - left - cs if x > left + cs else 0)
+            for cy in range(int((y - radius) // cs), int((y + radius) // cs) + 1):
+                top = cy * cs
+                ddy = top - y if y < top else (y - top - cs if y > top + cs else 0)
+                if ddx * ddx + ddy * ddy <= r2:
+                    result.append((cx, cy))
+        return result
+
+    def query_circle(self, x, y, radius):
+        """
+        回傳中心點距離 (x, y) 不超過 radius 的所有物件
+        """
+        cs = self.cell_size
+        r2 = radius * radius
+        cx0, cy0 = int((x - radius) // cs), int((y - radius) // cs)
+        cx1, cy1 = int((x + radius) // cs), int((y + radius) // cs)
+        cells = self.cells
+        result = []
+        for cx in range(cx0, cx1 + 1):
+            # 格子與圓心在 x 方向上的最近距離
+            left = cx * cs
+            if x < left:
+                ddx = left - x
+            elif x > left + cs:
+                ddx = x - left - cs
+            else:
+                ddx = 0
+            ddx2 = ddx * ddx
+            if ddx2 > r2:
+                continue
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    continue
+                top = cy * cs
+                if y < top:
+                    ddy = top - y
+                elif y > top + cs:
+                    ddy = y - top - cs
+                else:
+                    ddy = 0
+                if ddx2 + ddy * ddy > r2:
+                    continue
+                for entity in bucket:
+                    dx = entity.x - x
+                    dy = entity.y - y
+                    if dx * dx + dy * dy <= r2:
+                        result.append(entity)
+        return result
+
+    def query_rect(self, left, top, right, bottom):
+        """
+        粗略篩選（broad phase）：回傳中心點落在與矩形重疊之格子內的所有物件，
+        呼叫端需自行做精確判定
+        """
+        cs = self.cell_size
+        cells = self.cells
+        cx0, cy0 = int(left // cs), int(top // cs)
+        cx1, cy1 = int(right // cs), int(bottom // cs)
+        result = []
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is not None:
+                    result.extend(bucket)
+        return result
+
+    def clear(self):
+        for bucket in self.cells.values():
+            for entity in bucket:
+                entity.grid_cell = None
+        self.cells.clear()
+        self.count = 0
@@ -0,0 +1,99 @@
+import heapq
+import json
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.enemies.fast_enemy import FastEnemy
+from src.entities.enemies.tank_enemy import TankEnemy
+
+# 波次檔中使用的敵人名稱
+ENEMY_NAMES = {"basic": BasicEnemy, "fast": FastEnemy, "tank": TankEnemy}
+DEFAULT_INTERVAL = 0.5
+_EPSILON = 1e-9  # 浮點累加誤差，避免剛好到時間的出怪晚一個 tick
+
+
+class SpawnScheduler:
+    """
+    以 heap 依時間排序的出怪排程；pop_due 一次取出所有已到時間的敵人，
+    與每個 tick 的長度無關。同時間的出怪依排入順序取出。
+    """
+    def __init__(self):
+        self.heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def schedule(self, time, enemy_cls):
+        heapq.heappush(self.heap, (time, self.seq, enemy_cls))
+        self.seq += 1
+
+    def pop_due(self, now):
+        due = []
+        heap = self.heap
+        while heap and heap[0][0] <= now + _EPSILON:
+            due.append(heapq.heappop(heap)[2])
+        return due
+
+    def entries(self):
+        """
+        依出怪順序回傳 [(time, enemy_cls)]
+        """
+        return [(time, enemy_cls) for time, _, enemy_cls in sorted(self.heap)]
+
+    def clear(self):
+        self.heap.clear()
+
+
+def compile_wave(groups):
+    """
+    把一波的群組定義換算成 [(出怪時間, 敵人類別)]。
+    每個群組：enemy、count、interval（出怪間隔）、delay（距同一 stream 上一群最後一隻的秒數）、
+    stream（不同 stream 同時進行，同一 stream 依序進行）。第 k 隻在 開始 + delay + k * interval 出現。
+    """
+    stream_end = {}
+    spawns = []
+    for group in groups:
+        enemy_cls = group["enemy"]
+        if isinstance(enemy_cls, str):
+            if enemy_cls not in ENEMY_NAMES:
+                raise ValueError(f"未知的敵人種類: {enemy_cls}")
+            enemy_cls = ENEMY_NAMES[enemy_cls]
+        count = int(group.get("count", 1))
+        interval = float(group.get("interval", DEFAULT_INTERVAL))
+        delay = float(group.get("delay", 0.0))
+        if count < 0 or interval < 0 or delay < 0:
+            raise ValueError(f"群組數值不可為負: {group}")
+        stream = group.get("stream", 0)
+        start = stream_end.get(stream, 0.0) + delay
+        for k in range(count):
+            spawns.append((start + k * interval, enemy_cls))
+        if count:
+            stream_end[stream] = start + (count - 1) * interval
+    return spawns
+
+
+def load_waves(path):
+    """
+    讀取波次檔（JSON）：{"waves": [{"groups": [群組, ...]}, ...]}，回傳每波的群組清單；
+    先編譯一次以便及早發現錯誤
+    """
+    with open(path, encoding="utf-8") as f:
+        return waves_from_json(json.load(f))
+
+
+def waves_from_json(data):
+    """
+    由波次檔格式的 dict 取出每波的群組清單（load_waves 與存檔、重播檔共用）
+    """
+    waves = [wave["groups"] for wave in data["waves"]]
+    for groups in waves:
+        compile_wave(groups)
+    return waves
+
+
+def waves_to_json(waves):
+    """
+    把每波的群組清單轉回波次檔格式；敵人類別換成波次檔中的名稱
+    """
+    names = {enemy_cls: name for name, enemy_cls in ENEMY_NAMES.items()}
+    return {"waves": [{"groups": [dict(group, enemy=names.get(group["enemy"], group["enemy"])) for group in groups]}
+                      for groups in waves]}
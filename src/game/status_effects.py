@@ -0,0 +1,200 @@
+import heapq
+
+EFFECT_SLOW = "slow"                # magnitude：速度倍率（0.5 表示半速）
+EFFECT_STUN = "stun"                # 完全停止移動，magnitude 不使用
+EFFECT_BURN = "burn"                # magnitude：每秒傷害
+EFFECT_ARMOR_BREAK = "armor_break"  # magnitude：額外承受的傷害比例（0.3 表示受到 130% 傷害）
+
+# 疊加規則：同種效果再次命中時，倍率取最強、時間取最長；燃燒則各自獨立計時並加總
+STACK_RULES = {
+    EFFECT_SLOW: min,
+    EFFECT_STUN: max,
+    EFFECT_ARMOR_BREAK: max,
+    EFFECT_BURN: None,
+}
+# 存檔中以索引記錄效果種類，新增種類只能加在最後面
+EFFECT_KINDS = (EFFECT_SLOW, EFFECT_STUN, EFFECT_BURN, EFFECT_ARMOR_BREAK)
+BURN_MAX_STACKS = 5
+_EPSILON = 1e-9
+
+
+class Effect:
+    """
+    作用在某個敵人身上的一個效果（燃燒每層一個）
+    """
+    __slots__ = ("enemy", "kind", "magnitude", "expires", "seq")
+
+    def __init__(self, enemy, kind, magnitude, expires, seq):
+        self.enemy = enemy
+        self.kind = kind
+        self.magnitude = magnitude
+        self.expires = expires
+        self.seq = seq
+
+
+class StatusEffects:
+    """
+    全域狀態效果引擎：所有效果的結束時間放在同一個 heap（每個效果一個項目），每個 tick 只處理到期的項目；
+    效果被延長時只改 effect.expires，項目取出時發現還沒到期再以新的時間放回。
+    作用中的效果依種類存在引擎的 dict 中（敵人本身不另外保存），
+    效果改變時才重新計算敵人的 speed_factor 與 damage_taken，移動時直接乘上倍率，不需逐一判斷；
+    燃燒傷害每個 tick 對所有燃燒中的敵人一次結算。
+    """
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.now = 0.0
+        self.heap = []  # (expires, seq, effect)
+        self.seq = 0
+        # 種類 -> {敵人: Effect}；燃燒可疊加，值為 [Effect, ...]
+        self.active = {kind: {} for kind in EFFECT_KINDS}
+        self.burning = {}  # enemy -> 每秒燃燒傷害，dict 保持加入順序
+
+    def __len__(self):
+        return len(self.heap)
+
+    def apply(self, enemy, kind, magnitude, duration):
+        """
+        對敵人施加效果，依 STACK_RULES 與既有效果合併
+        """
+        if kind not in STACK_RULES:
+            raise ValueError(f"未知的狀態效果: {kind}")
+        if not enemy.is_alive():
+            return
+        expires = self.now + duration
+        active = self.active[kind]
+        merge = STACK_RULES[kind]
+        if merge is None:
+            stacks = active.get(enemy)
+            if stacks is None:
+                stacks = active[enemy] = []
+            elif len(stacks) >= BURN_MAX_STACKS:
+                # 被擠掉的那層仍留在 heap 中，到期取出時發現已不在清單內就略過
+                stacks.remove(min(stacks, key=lambda effect: (effect.expires, effect.seq)))
+            stacks.append(self._push(Effect(enemy, kind, magnitude, expires, self.seq)))
+        else:
+            effect = active.get(enemy)
+            if effect is None:
+                active[enemy] = self._push(Effect(enemy, kind, magnitude, expires, self.seq))
+            else:
+                effect.magnitude = merge(effect.magnitude, magnitude)
+                effect.expires = max(effect.expires, expires)
+        self.refresh(enemy)
+
+    def _push(self, effect):
+        self.seq = max(self.seq, effect.seq + 1)
+        heapq.heappush(self.heap, (effect.expires, effect.seq, effect))
+        return effect
+
+    def restore(self, enemy, kind, magnitude, expires, seq):
+        """
+        讀檔時依原本的結束時間與順序放回效果
+        """
+        effect = self._push(Effect(enemy, kind, magnitude, expires, seq))
+        if STACK_RULES[kind] is None:
+            self.active[kind].setdefault(enemy, []).append(effect)
+        else:
+            self.active[kind][enemy] = effect
+        self.refresh(enemy)
+
+    def get(self, enemy, kind):
+        """
+        敵人身上該種類的效果；燃燒回傳各層的清單，沒有時回傳 None
+        """
+        return self.active[kind].get(enemy)
+
+    def refresh(self, enemy):
+        """
+        依目前的效果重算敵人的移動與受傷倍率
+        """
+        active = self.active
+        if enemy in active[EFFECT_STUN]:
+            enemy.speed_factor = 0.0
+        else:
+            slow = active[EFFECT_SLOW].get(enemy)
+            enemy.speed_factor = slow.magnitude if slow is not None else 1.0
+        armor = active[EFFECT_ARMOR_BREAK].get(enemy)
+        enemy.damage_taken = 1.0 + armor.magnitude if armor is not None else 1.0
+        burns = active[EFFECT_BURN].get(enemy)
+        if burns:
+            self.burning[enemy] = sum(effect.magnitude for effect in burns)
+        else:
+            self.burning.pop(enemy, None)
+
+    def _remove(self, effect):
+        """
+        移除到期的效果，回傳是否真的移除（燃燒層可能已被擠掉）
+        """
+        active = self.active[effect.kind]
+        enemy = effect.enemy
+        if STACK_RULES[effect.kind] is None:
+            stacks = active.get(enemy)
+            if stacks is None or effect not in stacks:
+                return False
+            stacks.remove(effect)
+            if not stacks:
+                del active[enemy]
+        else:
+            if active.get(enemy) is not effect:
+                return False
+            del active[enemy]
+        return True
+
+    def update(self, dt):
+        """
+        推進時間：移除到期的效果，再結算燃燒傷害。
+        效果在結束時間所在的 tick 仍然有效，下一個 tick 才移除
+        """
+        self.now += dt
+        heap = self.heap
+        limit = self.now - _EPSILON
+        while heap and heap[0][0] < limit:
+            expires, seq, effect = heapq.heappop(heap)
+            if effect.expires > expires:
+                heapq.heappush(heap, (effect.expires, seq, effect))  # 期間被延長過
+                continue
+            if self._remove(effect) and effect.enemy.is_alive():
+                self.refresh(effect.enemy)
+        if self.burning:
+            for enemy, dps in list(self.burning.items()):
+                if not enemy.is_alive():
+                    del self.burning[enemy]
+                    continue
+                enemy.take_damage(dps * dt)
+
+    def remaining(self, enemy, kind):
+        """
+        效果剩餘秒數（多層時取最長）
+        """
+        effect = self.active[kind].get(enemy)
+        if not effect:
+            return 0.0
+        expires = max(stack.expires for stack in effect) if STACK_RULES[kind] is None else effect.expires
+        return max(0.0, expires - self.now)
+
+    def predict_distance(self, enemy, t):
+        """
+        預測敵人 t 秒後沿路徑走到的距離：暈眩期間不動、減速期間依倍率，之後恢復原速
+        """
+        distance = enemy.distance
+        speed = enemy.speed
+        stun = min(t, self.remaining(enemy, EFFECT_STUN))
+        t -= stun
+        slow = min(t, max(0.0, self.remaining(enemy, EFFECT_SLOW) - stun))
+        if slow > 0:
+            distance += speed * self.active[EFFECT_SLOW][enemy].magnitude * slow
+            t -= slow
+        return distance + speed * t
+
+    def entries(self):
+        """
+        依施加順序回傳存活敵人身上的 [(enemy, effect)]（存檔用）
+        """
+        found = []
+        for kind, active in self.active.items():
+            for enemy, value in active.items():
+                if not enemy.is_alive():
+                    continue
+                for effect in (value if STACK_RULES[kind] is None else (value,)):
+                    found.append(effect)
+        found.sort(key=lambda effect: effect.seq)
+        return [(effect.enemy, effect) for effect in found]
@@ -0,0 +1,96 @@
+import heapq
+
+_EPSILON = 1e-9  # 浮點累加誤差，避免剛好冷卻完的塔晚一個 tick
+
+
+class TowerScheduler:
+    """
+    塔的攻擊排程：以 heap 依「下次可攻擊的時間」排序，每個 tick 只喚醒冷卻結束的塔。
+    冷卻結束卻找不到目標時，若射程涵蓋的格子內完全沒有敵人就「停放」：
+    向敵人空間索引登記這些格子，有敵人進入時才重新排入；格子內有敵人但不在射程內時，下個 tick 再檢查。
+    同時間到期的塔依建塔順序處理，結果與逐一更新相同順序。
+    """
+    def __init__(self, game_manager):
+        self.game_manager = game_manager
+        self.grid = game_manager.enemy_grid
+        self.now = 0.0  # 累計的模擬秒數
+        self.heap = []  # (ready_time, order, tower)
+        self.next_order = 0
+
+    def __len__(self):
+        return len(self.heap)
+
+    def add(self, tower, ready_time=None, parked=False):
+        """
+        加入排程；ready_time 未指定時依塔目前的 attack_cooldown 計算，parked=True 時直接停放
+        """
+        tower.schedule_order = self.next_order
+        self.next_order += 1
+        tower.parked = False
+        tower.watch_cells = ()
+        tower.coverage_cells = self.grid.cells_in_circle(tower.x, tower.y, tower.range)
+        if parked:
+            self.park(tower)
+            return
+        if ready_time is None:
+            ready_time = self.now + max(0.0, tower.attack_cooldown)
+        self.push(tower, ready_time)
+
+    def push(self, tower, ready_time):
+        tower.ready_time = ready_time
+        heapq.heappush(self.heap, (ready_time, tower.schedule_order, tower))
+
+    def remove(self, tower):
+        # heap 中的項目在取出時才丟棄（schedule_order 設為 None 表示已移除）
+        self.grid.unwatch(tower)
+        tower.schedule_order = None
+        tower.parked = False
+
+    def park(self, tower):
+        tower.parked = True
+        self.grid.watch(tower, tower.coverage_cells, self.wake)
+
+    def wake(self, tower):
+        """
+        停放中的塔射程格子有敵人進入時由空間索引呼叫
+        """
+        self.grid.unwatch(tower)
+        tower.parked = False
+        self.push(tower, self.now)
+
+    def cooldown(self, tower):
+        """
+        塔剩餘的冷卻秒數（停放中的塔為 0）
+        """
+        if tower.parked:
+            return 0.0
+        return max(0.0, tower.ready_time - self.now)
+
+    def update(self, dt):
+        self.now += dt
+        now = self.now
+        heap = self.heap
+        retry = []
+        while heap and heap[0][0] <= now + _EPSILON:
+            _, order, tower = heapq.heappop(heap)
+            if order != tower.schedule_order or tower.parked:
+                continue  # 已拆除，或已重新排入的舊項目
+            target = tower.find_target()
+            if target:
+                tower.shoot(target)
+                tower.attack_cooldown = tower.attack_speed
+                self.push(tower, now + tower.attack_speed)
+            elif self.grid.any_in(tower.coverage_cells):
+                retry.append(tower)
+            else:
+                self.park(tower)
+        # 射程格子內有敵人但還沒進入射程：下個 tick 再檢查
+        for tower in retry:
+            self.push(tower, now)
+
+    def entries(self):
+        """
+        依建塔順序回傳 [(tower, ready_time 或 None（停放中）)]（存檔用）
+        """
+        towers = sorted(self.game_manager.towers, key=lambda tower: tower.schedule_order)
+        return [(tower, None if tower.parked else tower.ready_time) for tower in towers]
@@ -3,15 +3,18 @@ import random
 from src.entities.enemies.basic_enemy import BasicEnemy
 from src.entities.enemies.fast_enemy import FastEnemy
 from src.entities.enemies.tank_enemy import TankEnemy
+from src.game.spawn_scheduler import SpawnScheduler, compile_wave
 
 class WaveManager:
-    def __init__(self, game_manager, difficulty=None):
+    def __init__(self, game_manager, difficulty=None, waves=None):
         self.game_manager = game_manager
         self.wave = 1
-        self.spawn_timer = 0
-        self.enemies_to_spawn = []
+        self.time = 0.0  # 本波開始後經過的秒數
+        self.scheduler = SpawnScheduler()
         self.wave_in_progress = False
         self.spawn_interval = 0.5  # seconds
+        # 由波次檔讀入的每波群組定義；超過檔案的波數後改用內建規則產生
+        self.waves = waves or []
 
         # 根據難度調整每波怪物基數
         if difficulty == "easy":
@@ -21,30 +24,51 @@ class WaveManager:
         else:  # normal 或未指定
             self.enemies_per_wave = 8
 
+    @property
+    def enemies_to_spawn(self):
+        """
+        尚未出場的敵人類別（依出怪順序）
+        """
+        return [enemy_cls for _, enemy_cls in self.scheduler.entries()]
+
     def update(self, dt):
         if not self.wave_in_progress:
             self.start_wave()
-        if self.enemies_to_spawn:
-            self.spawn_timer += dt
-            if self.spawn_timer >= self.spawn_interval:
-                self.spawn_timer = 0
-                enemy_cls = self.enemies_to_spawn.pop(0)
-                enemy = enemy_cls(self.game_manager.map_manager.path_tiles[0], self.game_manager)
-                self.game_manager.add_enemy(enemy)
+        if self.scheduler:
+            self.time += dt
+            # 一個 tick 內到時間的敵人全部出場，dt 再大也不會延後
+            start_tile = self.game_manager.map_manager.path_tiles[0]
+            for enemy_cls in self.scheduler.pop_due(self.time):
+                self.game_manager.spawn_enemy(enemy_cls, start_tile)
         else:
             # 本波怪已送完，等待全死才進下一波
             if len(self.game_manager.enemies) == 0:
                 self.wave_in_progress = False
                 self.wave += 1
 
-    def start_wave(self):
-        self.enemies_to_spawn = []
-        num = self.enemies_per_wave + self.wave * 2
+    def wave_groups(self, wave):
+        """
+        第 wave 波的群組定義：波次檔有定義時用檔案，否則依內建規則隨機組成
+        """
+        if wave <= len(self.waves):
+            return self.waves[wave - 1]
+        # 使用每局的亂數產生器，確保同 seed 出怪相同
+        rng = getattr(self.game_manager, "rng", random)
+        groups = []
+        num = self.enemies_per_wave + wave * 2
         for i in range(num):
-            if self.wave < 3 or random.random() < 0.7:
-                self.enemies_to_spawn.append(BasicEnemy)
-            elif random.random() < 0.5:
-                self.enemies_to_spawn.append(FastEnemy)
+            if wave < 3 or rng.random() < 0.7:
+                enemy_cls = BasicEnemy
+            elif rng.random() < 0.5:
+                enemy_cls = FastEnemy
             else:
-                self.enemies_to_spawn.append(TankEnemy)
-        self.wave_in_progress = True
\ No newline at end of file
+                enemy_cls = TankEnemy
+            groups.append({"enemy": enemy_cls, "count": 1, "delay": self.spawn_interval})
+        return groups
+
+    def start_wave(self):
+        self.time = 0.0
+        self.scheduler.clear()
+        for time, enemy_cls in compile_wave(self.wave_groups(self.wave)):
+            self.scheduler.schedule(time, enemy_cls)
+        self.wave_in_progress = True
@@ -1,8 +1,10 @@
 import pygame
 from src.utils.constants import FONT_NAME, UI_BG_COLOR
+from src.utils.helpers import get_font, render_text
 from src.entities.towers.cannon_tower import CannonTower
 from src.entities.towers.machine_tower import MachineTower
 from src.entities.towers.freeze_tower import FreezeTower
+from src.entities.towers.base_tower import TARGET_MODES
 
 TOWER_CLASSES = [
     (CannonTower, "加農砲塔"),
@@ -10,10 +12,12 @@ TOWER_CLASSES = [
     (FreezeTower, "冰凍塔")
 ]
 
+TARGET_MODE_NAMES = {"first": "最前", "last": "最後", "strongest": "最強"}
+
 class GameUI:
     def __init__(self, game_manager):
         self.game_manager = game_manager
-        self.font = pygame.font.Font("assets/fonts/NotoSansTC-Black.ttf", 16)
+        self.font = get_font(FONT_NAME, 16)
         self.tower_buttons = []
         self.selected_idx = None
         self.selected_tower = None  # 記錄點擊地圖的塔
@@ -32,9 +36,9 @@ class GameUI:
         width = surface.get_width()
         # 畫上方 UI 區塊背景
         pygame.draw.rect(surface, UI_BG_COLOR, (0, 0, width, 40))
-        money_txt = self.font.render(f"金錢: {self.game_manager.money}", True, (0, 80, 0))
-        life_txt = self.font.render(f"生命: {self.game_manager.life}", True, (180, 0, 0))
-        score_txt = self.font.render(f"分數: {self.game_manager.score}", True, (0, 0, 180))
+        money_txt = render_text(f"金錢: {self.game_manager.money}", 16, (0, 80, 0))
+        life_txt = render_text(f"生命: {self.game_manager.life}", 16, (180, 0, 0))
+        score_txt = render_text(f"分數: {self.game_manager.score}", 16, (0, 0, 180))
         surface.blit(money_txt, (10, 7))
         surface.blit(life_txt, (150, 7))
         surface.blit(score_txt, (280, 7))
@@ -45,14 +49,14 @@ class GameUI:
             else:
                 pygame.draw.rect(surface, (220, 220, 220), rect)
             pygame.draw.rect(surface, (60, 60, 90), rect, 2)
-            txt = pygame.font.Font(FONT_NAME, 16).render(label, True, (30, 30, 80))
+            txt = render_text(label, 16, (30, 30, 80))
             surface.blit(txt, (rect.x + 3, rect.y + 8))
             price = getattr(tower_cls, "cost", 100)
-            price_txt = pygame.font.Font(FONT_NAME, 16).render(f"${price}", True, (80, 90, 20))
+            price_txt = render_text(f"${price}", 16, (80, 90, 20))
             surface.blit(price_txt, (rect.x + 6, rect.y + 40))
 
         if not self.game_manager.selected_tower_type:
-            tip = self.font.render("請先點選上方塔種再蓋塔", True, (200, 40, 40))
+            tip = render_text("請先點選上方塔種再蓋塔", 16, (200, 40, 40))
             # 以畫面寬度計算提示字串置中
             surface.blit(tip, (surface.get_width()//2 , 9))
 
@@ -61,6 +65,21 @@ class GameUI:
             self.draw_tower_range(surface, self.selected_tower)
             self.draw_upgrade_panel(surface, self.selected_tower)
 
+    def dirty_rects(self, surface):
+        """
+        UI 每幀會畫到的區域（髒矩形模式下需要更新）
+        """
+        width = surface.get_width()
+        rects = [pygame.Rect(0, 0, width, 40)]
+        rects.extend(rect.copy() for rect, _, _ in self.tower_buttons)
+        if self.selected_tower:
+            tower = self.selected_tower
+            cx, cy = tower.rect.center
+            rects.append(pygame.Rect(cx - tower.range - 2, cy - tower.range - 2,
+                                     tower.range * 2 + 4, tower.range * 2 + 4))
+            rects.append(pygame.Rect(width-230, 60, 180, 240))
+        return rects
+
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
             pos = pygame.mouse.get_pos()
@@ -69,31 +88,32 @@ class GameUI:
                     self.game_manager.selected_tower_type = tower_cls
                     self.selected_tower = None
                     return True
-            # 點擊地圖上的塔
-            for tower in self.game_manager.towers:
-                if tower.rect.collidepoint(pos):
-                    self.selected_tower = tower
-                    self.game_manager.selected_tower_type = None
-                    return True
+            # 點擊地圖上的塔（塔的 rect 是世界座標）
+            world_pos = self.game_manager.screen_to_world(pos)
+            tower = self.game_manager.map_manager.tower_at_pixel(world_pos)
+            if tower is not None:
+                self.selected_tower = tower
+                self.game_manager.selected_tower_type = None
+                return True
             # 點擊升級或刪除按鈕
             if self.selected_tower:
                 surface = self.game_manager.screen
                 width = surface.get_width()
                 upg_rect = pygame.Rect(width-230+40, 60+130, 110, 30)
                 del_rect = pygame.Rect(width-230+40, 60+165, 110, 30)
+                mode_rect = pygame.Rect(width-230+40, 60+200, 110, 30)
                 if upg_rect.collidepoint(pos) and self.selected_tower.can_upgrade():
-                    if self.selected_tower.upgrade():
-                        pass
-                    else:
-                        pass
+                    self.game_manager.upgrade_tower(self.selected_tower)
+                    return True
+                # 切換目標選擇方式
+                if mode_rect.collidepoint(pos):
+                    tower = self.selected_tower
+                    next_mode = TARGET_MODES[(TARGET_MODES.index(tower.target_mode) + 1) % len(TARGET_MODES)]
+                    self.game_manager.set_target_mode(tower, next_mode)
                     return True
                 # 刪除塔
                 if del_rect.collidepoint(pos):
-                    tower = self.selected_tower
-                    refund = int(tower.cost * 0.75)
-                    self.game_manager.money += refund
-                    self.game_manager.towers.remove(tower)
-                    self.game_manager.entities.remove(tower)
+                    self.game_manager.sell_tower(self.selected_tower)
                     self.selected_tower = None
                     # 可加入刪除音效或提示
                     return True
@@ -108,10 +128,10 @@ class GameUI:
 
     def draw_upgrade_panel(self, surface, tower):
         width = surface.get_width()
-        panel_rect = pygame.Rect(width-230, 60, 180, 200)  # 高度+40
+        panel_rect = pygame.Rect(width-230, 60, 180, 240)  # 高度+40
         pygame.draw.rect(surface, (250, 245, 220), panel_rect)
         pygame.draw.rect(surface, (80, 70, 60), panel_rect, 2)
-        title = self.font.render("塔升級", True, (60, 50, 50))
+        title = render_text("塔升級", 16, (60, 50, 50))
         surface.blit(title, (panel_rect.x+60, panel_rect.y+10))
 
         info = [
@@ -120,7 +140,7 @@ class GameUI:
             f"射速: {tower.attack_speed:.2f} 秒/發"
         ]
         for i, text in enumerate(info):
-            txt = pygame.font.Font(FONT_NAME, 16).render(text, True, (50, 50, 90))
+            txt = render_text(text, 16, (50, 50, 90))
             surface.blit(txt, (panel_rect.x+18, panel_rect.y+50+i*27))
 
         if tower.can_upgrade():
@@ -128,10 +148,10 @@ class GameUI:
             pygame.draw.rect(surface, (100, 180, 90), upgrade_btn)
             pygame.draw.rect(surface, (60, 90, 50), upgrade_btn, 2)
             cost = tower.upgrade_cost()
-            btn_txt = self.font.render(f"升級 (-${cost})", True, (20, 40, 20))
+            btn_txt = render_text(f"升級 (-${cost})", 16, (20, 40, 20))
             surface.blit(btn_txt, (upgrade_btn.x+10, upgrade_btn.y+4))
         else:
-            txt = self.font.render("已達最高等級", True, (180, 60, 60))
+            txt = render_text("已達最高等級", 16, (180, 60, 60))
             surface.blit(txt, (panel_rect.x+42, panel_rect.y+130))
 
         # 新增刪除塔按鈕
@@ -139,14 +159,30 @@ class GameUI:
         delete_btn = pygame.Rect(panel_rect.x+40, panel_rect.y+165, 110, 30)
         pygame.draw.rect(surface, (220, 60, 60), delete_btn)
         pygame.draw.rect(surface, (180, 40, 40), delete_btn, 2)
-        del_txt = self.font.render(f"拆除 (+${refund})", True, (255, 255, 255))
+        del_txt = render_text(f"拆除 (+${refund})", 16, (255, 255, 255))
         surface.blit(del_txt, (delete_btn.x+10, delete_btn.y+4))
 
+        # 目標選擇方式，點擊切換
+        mode_btn = pygame.Rect(panel_rect.x+40, panel_rect.y+200, 110, 30)
+        pygame.draw.rect(surface, (90, 130, 200), mode_btn)
+        pygame.draw.rect(surface, (50, 80, 150), mode_btn, 2)
+        mode_txt = render_text(f"目標: {TARGET_MODE_NAMES[tower.target_mode]}", 16, (255, 255, 255))
+        surface.blit(mode_txt, (mode_btn.x+10, mode_btn.y+4))
+
     def draw_tower_range(self, surface, tower):
         # 畫出攻擊範圍圓圈
         color = (0, 160, 255, 60)  # 半透明藍
         temp_surface = pygame.Surface((tower.range*2, tower.range*2), pygame.SRCALPHA)
         pygame.draw.circle(temp_surface, color, (tower.range, tower.range), tower.range)
         cx, cy = tower.rect.center if hasattr(tower, "rect") else (tower.x, tower.y)
+        camera = getattr(self.game_manager, "camera", None)
+        if camera is not None and not camera.is_identity:
+            # 鏡頭模式換算成螢幕座標並依縮放調整半徑
+            cx, cy = camera.world_to_screen((cx, cy))
+            radius = max(1, int(tower.range * camera.zoom))
+            temp_surface = pygame.transform.scale(temp_surface, (radius * 2, radius * 2))
+            surface.blit(temp_surface, (cx - radius, cy - radius))
+            pygame.draw.circle(surface, (0, 120, 220), (cx, cy), radius, 2)
+            return
         surface.blit(temp_surface, (cx - tower.range, cy - tower.range))
         pygame.draw.circle(surface, (0, 120, 220), (cx, cy), tower.range, 2)
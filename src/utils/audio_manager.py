@@ -1,17 +1,102 @@
 import pygame
 import os
 
+# 音效設定：檔名、頻道群組、同時播放上限、最短重播間隔（毫秒）
+SOUND_SPECS = {
+    "shoot_cannon": ("shoot_cannon.wav", "sfx", 3, 80),
+    "shoot_machine": ("shoot_machine.wav", "sfx", 3, 60),
+    "shoot_freeze": ("shoot_freeze.wav", "sfx", 2, 80),
+    "enemy_die": ("enemy_die.wav", "sfx", 4, 40),
+    "tower_build": ("tower_build.wav", "build", 1, 0),
+    "upgrade": ("upgrade.wav", "ui", 1, 0),
+}
+
+# 保留給 UI 與建塔音效的頻道數，槍砲聲不會佔用
+CHANNEL_GROUPS = {"ui": 1, "build": 1}
+NUM_CHANNELS = 16
+
+
 class AudioManager:
-    def __init__(self):
-        self.sounds = {
-            "shoot_cannon": pygame.mixer.Sound(os.path.join("assets", "sounds", "shoot_cannon.wav")),
-            "shoot_machine": pygame.mixer.Sound(os.path.join("assets", "sounds", "shoot_machine.wav")),
-            "shoot_freeze": pygame.mixer.Sound(os.path.join("assets", "sounds", "shoot_freeze.wav")),
-            "enemy_die": pygame.mixer.Sound(os.path.join("assets", "sounds", "enemy_die.wav")),
-            "tower_build": pygame.mixer.Sound(os.path.join("assets", "sounds", "tower_build.wav")),
-            "upgrade": pygame.mixer.Sound(os.path.join("assets", "sounds", "upgrade.wav")),
-        }
+    """
+    有音量管控的音效管理器：play() 只是登記，同一幀重複觸發的音效合併成一次，
+    在 flush() 時才真正播放。每種音效有同時播放上限與最短重播間隔，
+    UI / 建塔音效使用保留頻道，不會因大量射擊而搶不到聲道。
+    """
+    def __init__(self, specs=SOUND_SPECS, groups=CHANNEL_GROUPS, num_channels=NUM_CHANNELS, clock=None):
+        self.clock = clock or pygame.time.get_ticks
+        self.specs = specs
+        self.sounds = {}
+        for name, (filename, _, _, _) in specs.items():
+            self.sounds[name] = pygame.mixer.Sound(os.path.join("assets", "sounds", filename))
+        pygame.mixer.set_num_channels(num_channels)
+        reserved = sum(groups.values())
+        pygame.mixer.set_reserved(reserved)
+        # 前 reserved 個頻道依序分給保留群組，其餘給 sfx
+        self.channels = {}
+        index = 0
+        for group, count in groups.items():
+            self.channels[group] = [pygame.mixer.Channel(i) for i in range(index, index + count)]
+            index += count
+        self.channels["sfx"] = [pygame.mixer.Channel(i) for i in range(reserved, num_channels)]
+        self.voices = {name: [] for name in specs}  # 各音效目前使用中的頻道
+        self.last_played = {}
+        self.pending = {}  # 本幀待播放的音效（dict 保留觸發順序並去除重複）
 
     def play(self, name):
         if name in self.sounds:
-            self.sounds[name].play()
+            self.pending[name] = None
+
+    def flush(self):
+        """
+        播放本幀登記的音效，每幀呼叫一次
+        """
+        if not self.pending:
+            return
+        now = self.clock()
+        for name in self.pending:
+            self._start(name, now)
+        self.pending.clear()
+
+    def _start(self, name, now):
+        _, group, max_voices, min_interval = self.specs[name]
+        last = self.last_played.get(name)
+        if last is not None and now - last < min_interval:
+            return False
+        sound = self.sounds[name]
+        voices = [ch for ch in self.voices[name] if ch.get_sound() is sound]
+        self.voices[name] = voices
+        if len(voices) >= max_voices:
+            return False
+        channel = next((ch for ch in self.channels[group] if not ch.get_busy()), None)
+        if channel is None:
+            if group == "sfx":
+                return False  # 射擊類音效寧可略過
+            channel = self.channels[group][0]  # 保留群組直接蓋掉舊的
+        channel.play(sound)
+        voices.append(channel)
+        self.last_played[name] = now
+        return True
+
+
+class NullAudioManager:
+    """
+    不輸出聲音的音效管理器（無畫面模擬或未初始化 mixer 時使用）
+    """
+    def play(self, name):
+        pass
+
+    def flush(self):
+        pass
+
+
+def create_audio_manager():
+    """
+    初始化 mixer 並建立 AudioManager；沒有音效裝置時退回 NullAudioManager
+    """
+    try:
+        if not pygame.mixer.get_init():
+            pygame.mixer.init()
+        return AudioManager()
+    except (pygame.error, FileNotFoundError) as e:
+        print(f"無法初始化音效: {e}")
+        return NullAudioManager()
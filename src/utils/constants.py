@@ -9,6 +9,11 @@ TILE_SIZE = 32
 # 遊戲速度
 FPS = 60
 
+# 固定步長模擬：每秒模擬 tick 數與單幀最多補跑的 tick 數（避免卡頓後越追越慢）
+SIM_TICK_RATE = 60
+SIM_DT = 1 / SIM_TICK_RATE
+MAX_SIM_STEPS_PER_FRAME = 8
+
 # 遊戲初始參數
 INIT_MONEY = 500
 INIT_LIFE = 3
@@ -24,4 +29,23 @@ MAP_SIZE_EASY = (15, 20)
 MAP_SIZE_NORMAL = (15, 20)
 MAP_SIZE_HARD = (20, 30)
 
+# 預設視窗大小 (以普通地圖計算)
+SCREEN_WIDTH = MAP_SIZE_NORMAL[1] * TILE_SIZE
+SCREEN_HEIGHT = MAP_SIZE_NORMAL[0] * TILE_SIZE
+
+# 視窗最大尺寸，地圖比視窗大時用鏡頭捲動／縮放
+MAX_WINDOW_WIDTH = 1280
+MAX_WINDOW_HEIGHT = 800
+
+# 鏡頭
+CAMERA_MIN_ZOOM = 0.5
+CAMERA_MAX_ZOOM = 2.0
+CAMERA_PAN_SPEED = 600  # 方向鍵平移速度（螢幕像素/秒）
+MAP_CHUNK_TILES = 8     # 背景快取每塊的格數（邊長）
+MAP_CHUNK_CACHE_SIZE = 96  # 最多保留的背景區塊數
+
+# 地圖檔與編譯快取位置
+MAP_DIR = "assets/maps"
+MAP_CACHE_DIR = ".cache/maps"
+
 # 其他常數可依需求補充
@@ -0,0 +1,36 @@
+from src.utils.constants import SIM_DT, MAX_SIM_STEPS_PER_FRAME
+
+
+class FixedStepClock:
+    """
+    固定步長累加器：把每幀不固定的時間換算成固定 dt 的模擬 tick 數，
+    讓模擬結果與畫面幀率無關。
+    """
+    def __init__(self, step=SIM_DT, max_steps=MAX_SIM_STEPS_PER_FRAME):
+        self.step = step
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, frame_dt):
+        """
+        累加一幀經過的秒數，回傳這一幀應執行的 tick 數
+        """
+        self.accumulator += frame_dt
+        steps = int(self.accumulator // self.step)
+        if steps > self.max_steps:
+            # 嚴重卡頓時丟棄追不上的時間，遊戲變慢但不會凍結
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.step
+        return steps
+
+    @property
+    def alpha(self):
+        """
+        目前時間落在兩個 tick 之間的比例 (0~1)，可供畫面插值
+        """
+        return self.accumulator / self.step
+
+    def reset(self):
+        self.accumulator = 0.0
@@ -1,15 +1,116 @@
+from collections import OrderedDict
 import pygame
+from src.utils.constants import FONT_NAME
 
-def load_image(path, colorkey=None):
+# 圖片快取：(路徑, 尺寸, colorkey, 是否已 convert) -> Surface
+_image_cache = {}
+_quit_hook_registered = False
+
+def _clear_caches():
+    global _quit_hook_registered
+    _image_cache.clear()
+    _font_cache.clear()
+    _text_cache.clear()
+    _quit_hook_registered = False
+
+def _register_quit_hook():
+    """
+    pygame.quit() 後快取的字型與 Surface 失效，註冊在 quit 時一併清空快取
+    """
+    global _quit_hook_registered
+    if not _quit_hook_registered:
+        pygame.register_quit(_clear_caches)
+        _quit_hook_registered = True
+
+def load_image(path, size=None, colorkey=None):
+    """
+    載入圖片（含 convert_alpha 與縮放）並快取，同一組參數只讀檔一次，
+    回傳的 Surface 為共用物件，請勿直接在上面繪圖
+    """
+    # 尚未建立視窗時無法 convert，分開快取，建立視窗後會重新轉換
+    converted = pygame.display.get_surface() is not None
+    key = (path, size, colorkey, converted)
+    image = _image_cache.get(key)
+    if image is not None:
+        return image
     try:
         image = pygame.image.load(path)
-        image = image.convert_alpha()
+        if converted:
+            image = image.convert_alpha()
+        if size is not None:
+            image = pygame.transform.scale(image, size)
         if colorkey is not None:
             image.set_colorkey(colorkey)
-        return image
     except Exception as e:
         print(f"載入圖片失敗: {path} ({e})")
-        return pygame.Surface((32,32))
+        image = pygame.Surface(size or (32, 32))
+    _register_quit_hook()
+    _image_cache[key] = image
+    return image
+
+def cached_surface(key, build):
+    """
+    取得以 key 快取的程式繪製 Surface，第一次呼叫時以 build() 建立
+    """
+    image = _image_cache.get(key)
+    if image is None:
+        image = build()
+        _register_quit_hook()
+        _image_cache[key] = image
+    return image
+
+def clear_image_cache():
+    _image_cache.clear()
+
+# 字型物件快取：(字型, 大小, 是否系統字型) -> Font
+_font_cache = {}
+# 文字 Surface 的 LRU 快取：(字型, 大小, 是否系統字型, 文字, 顏色) -> Surface
+TEXT_CACHE_SIZE = 512
+_text_cache = OrderedDict()
+
+def get_font(name=FONT_NAME, size=16, sysfont=False):
+    """
+    取得快取的字型物件，避免每幀重新建立 Font（讀檔、解析字型很慢）
+    """
+    key = (name, size, sysfont)
+    font = _font_cache.get(key)
+    if font is not None:
+        return font
+    if not pygame.font.get_init():
+        pygame.font.init()
+    if sysfont:
+        font = pygame.font.SysFont(name, size)
+    else:
+        try:
+            font = pygame.font.Font(name, size)
+        except (FileNotFoundError, OSError) as e:
+            print(f"載入字型失敗: {name} ({e})，改用預設字型")
+            font = pygame.font.Font(None, size)
+    _register_quit_hook()
+    _font_cache[key] = font
+    return font
+
+def render_text(text, size, color, name=FONT_NAME, sysfont=False):
+    """
+    繪製文字並快取結果；文字內容不變時直接回傳之前的 Surface，
+    回傳的 Surface 為共用物件，請勿直接在上面繪圖
+    """
+    key = (name, size, sysfont, text, color)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+    surface = get_font(name, size, sysfont).render(text, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
 
 def clamp(val, vmin, vmax):
     return max(vmin, min(val, vmax))
+
+def is_headless(game_manager):
+    """
+    是否為無畫面模擬（不載入圖片、字型與音效）
+    """
+    return getattr(game_manager, "headless", False)
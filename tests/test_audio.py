@@ -0,0 +1,56 @@
+import os
+import unittest
+import pygame
+from src.utils.audio_manager import AudioManager, NullAudioManager
+
+class TestAudioManager(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        try:
+            pygame.mixer.init()
+        except pygame.error:
+            self.skipTest("沒有可用的音效裝置")
+        self.now = 0
+        self.audio = AudioManager(clock=lambda: self.now)
+
+    def test_same_frame_triggers_are_coalesced(self):
+        for _ in range(10):
+            self.audio.play("shoot_machine")
+        self.audio.flush()
+        self.assertEqual(len(self.audio.voices["shoot_machine"]), 1)
+        self.assertEqual(self.audio.pending, {})
+
+    def test_interval_and_voice_cap(self):
+        self.audio.play("shoot_machine")
+        self.audio.flush()
+        self.now += 10  # 未達最短重播間隔
+        self.audio.play("shoot_machine")
+        self.audio.flush()
+        self.assertEqual(len(self.audio.voices["shoot_machine"]), 1)
+        for _ in range(5):
+            self.now += 100
+            self.audio.play("shoot_machine")
+            self.audio.flush()
+        self.assertEqual(len(self.audio.voices["shoot_machine"]), 3)
+
+    def test_reserved_channels_not_used_by_gunfire(self):
+        for name in ("shoot_machine", "shoot_cannon", "shoot_freeze", "enemy_die"):
+            for _ in range(5):
+                self.now += 100
+                self.audio.play(name)
+                self.audio.flush()
+        self.assertFalse(any(ch.get_busy() for ch in self.audio.channels["build"]))
+        self.audio.play("tower_build")
+        self.audio.flush()
+        self.assertTrue(self.audio.channels["build"][0].get_busy())
+
+    def test_null_backend(self):
+        audio = NullAudioManager()
+        audio.play("shoot_machine")
+        audio.flush()
+
+    def tearDown(self):
+        pygame.mixer.quit()
+
+if __name__ == "__main__":
+    unittest.main()
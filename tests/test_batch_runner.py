@@ -0,0 +1,49 @@
+import json
+import unittest
+from src.game.batch_runner import expand_jobs, apply_overrides, run_batch, aggregate
+from src.entities.towers.machine_tower import MachineTower
+from src.entities.enemies.fast_enemy import FastEnemy
+
+SPEC = {
+    "overrides": {"MachineTower.damage": [8, 16]},
+    "layouts": {"guns": [["MachineTower", 6, 1], ["CannonTower", 6, 3]]},
+    "seeds": 2,
+    "max_time": 40,
+    "sample_every": 5,
+}
+
+class TestBatchRunner(unittest.TestCase):
+    def test_expand_jobs(self):
+        jobs = expand_jobs(dict(SPEC, difficulties=["easy", "normal"]))
+        self.assertEqual(len(jobs), 2 * 2 * 2)
+        self.assertEqual({job["params"]["MachineTower.damage"] for job in jobs}, {8, 16})
+        with self.assertRaises(ValueError):
+            expand_jobs({"overrides": {"MachineTower.colour": [1]}})
+        with self.assertRaises(ValueError):
+            expand_jobs({"layouts": {"bad": [["LaserTower", 0, 0]]}})
+
+    def test_overrides_are_restored(self):
+        damage = MachineTower.damage
+        with apply_overrides({"MachineTower.damage": 99, "FastEnemy.name": "x"}):
+            self.assertEqual(MachineTower.damage, 99)
+            self.assertEqual(FastEnemy.name, "x")
+        self.assertEqual(MachineTower.damage, damage)
+        self.assertEqual(FastEnemy.name, "Fast Enemy")
+
+    def test_parallel_matches_serial(self):
+        jobs = expand_jobs(SPEC)
+        serial = run_batch(jobs, workers=1)
+        parallel = run_batch(jobs, workers=2)
+        strip = lambda results: [{k: v for k, v in r.items() if k != "elapsed"} for r in results]
+        self.assertEqual(strip(serial), strip(parallel))
+        self.assertTrue(all(r["towers_built"] == 2 for r in serial))
+        self.assertEqual(len(serial[0]["money_curve"]), 40 // 5 + 1)
+
+        rows = aggregate(serial)
+        self.assertEqual(len(rows), 2)
+        by_damage = {json.loads(row["params"])["MachineTower.damage"]: row for row in rows}
+        self.assertEqual(by_damage[16]["runs"], 2)
+        self.assertGreaterEqual(by_damage[16]["score_mean"], by_damage[8]["score_mean"])
+
+if __name__ == "__main__":
+    unittest.main()
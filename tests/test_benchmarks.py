@@ -0,0 +1,23 @@
+import unittest
+from benchmarks.run import compare, make_game
+from src.utils.constants import MAP_SIZE_NORMAL
+
+class TestBenchmarks(unittest.TestCase):
+    def test_scenario_setup(self):
+        gm = make_game("normal", MAP_SIZE_NORMAL, 50, 6)
+        self.assertEqual(len(gm.enemies), 50)
+        self.assertEqual(len(gm.towers), 6)
+
+    def test_compare_flags_slowdowns(self):
+        baseline = {"a": {"rate": 100.0, "alloc_peak_kb": 100.0}, "b": {"rate": 100.0}}
+        results = {
+            "a": {"rate": 80.0, "unit": "ticks/s", "alloc_peak_kb": 120.0},
+            "b": {"rate": 60.0, "unit": "ticks/s", "alloc_peak_kb": 10.0},
+            "c": {"rate": 1.0, "unit": "fps", "alloc_peak_kb": 10.0},  # 沒有 baseline 不比較
+        }
+        regressions = compare(results, baseline, 0.3)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("b:"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+import pygame
+from src.game.camera import Camera
+from src.game.game_manager import GameManager
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import TILE_SIZE, SIM_DT
+
+class TestCamera(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        pygame.display.set_mode((320, 240))
+
+    def test_coordinate_conversion_and_clamp(self):
+        camera = Camera((400, 300), (4000, 3000))
+        self.assertTrue(camera.is_identity)
+        camera.pan(100, 50)
+        self.assertEqual(camera.screen_to_world((10, 10)), (110, 60))
+        camera.zoom_at(2.0, (200, 150))
+        self.assertEqual(camera.screen_to_world((200, 150)), (300, 200))  # 縮放中心不動
+        self.assertEqual(camera.world_to_screen((300, 200)), (200, 150))
+        camera.pan(-100000, 100000)
+        self.assertEqual((camera.x, camera.y), (0.0, 3000 - 300 / camera.zoom))
+        small = Camera((800, 600), (400, 300))
+        small.pan(50, 50)
+        self.assertTrue(small.is_identity)  # 地圖比畫面小時不能捲動
+
+    def test_chunks_match_static_map(self):
+        gm = GameManager(None, map_size=(40, 60), difficulty="hard", headless=False)
+        mm = gm.map_manager
+        full = pygame.Surface((60 * TILE_SIZE, 40 * TILE_SIZE))
+        mm.draw_static(full)
+        view = pygame.Rect(500, 700, 900, 600)
+        part = pygame.Surface(view.size)
+        mm.draw_view(part, view)
+        self.assertEqual(pygame.image.tobytes(part, "RGB"),
+                         pygame.image.tobytes(full.subsurface(view), "RGB"))
+
+    def test_panned_view_matches_full_render(self):
+        rows, cols = 30, 40
+        world = pygame.Surface((cols * TILE_SIZE, rows * TILE_SIZE))
+        full = GameManager(world, map_size=(rows, cols), difficulty="hard", seed=5)
+        cam = GameManager(pygame.Surface((640, 480)), map_size=(rows, cols), difficulty="hard", seed=5)
+        for gm in (full, cam):
+            gm.ui = None
+            gm.money = 10000
+            for row, col in gm.map_manager.path_tiles[1:40:6]:
+                gm.build_tower((col * TILE_SIZE + 5, (row - 1) * TILE_SIZE + 5), MachineTower)
+            for _ in range(20 * 60):
+                gm.update(SIM_DT)
+        self.assertGreater(len(cam.enemies), 0)
+        cam.camera.pan(300, 200)
+        self.assertFalse(cam.camera.is_identity)
+        full.draw()
+        self.assertIsNone(cam.draw())
+        view = cam.camera.view_rect.clip(world.get_rect())
+        expected = world.subsurface(pygame.Rect(view.topleft, (640, 480)))
+        self.assertEqual(pygame.image.tobytes(cam.screen, "RGB"), pygame.image.tobytes(expected, "RGB"))
+        cam.camera.zoom_at(0.5, (0, 0))
+        cam.draw()  # 縮放模式可正常繪製
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+from src.game.game_manager import GameManager
+from src.entities.towers.cannon_tower import CannonTower
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import TILE_SIZE, SIM_DT, MAP_SIZE_NORMAL
+
+def play(seed, frame_times, ticks):
+    gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=seed)
+    gm.money = 10000
+    for tower_cls, (row, col) in [(MachineTower, (6, 1)), (CannonTower, (6, 3)), (MachineTower, (8, 6))]:
+        gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), tower_cls)
+    i = 0
+    while gm.tick < ticks and not gm.is_game_over():
+        gm.advance(frame_times[i % len(frame_times)])
+        i += 1
+    return gm
+
+def state(gm):
+    return (
+        gm.tick, gm.money, gm.life, gm.score, gm.wave_manager.wave,
+        [type(e).__name__ for e in gm.wave_manager.enemies_to_spawn],
+        [(e.x, e.y, e.hp) for e in gm.enemies],
+        [(p.x, p.y) for p in gm.projectiles],
+    )
+
+class TestDeterminism(unittest.TestCase):
+    def test_same_seed_same_result_at_any_frame_rate(self):
+        ticks = 90 * 60
+        a = play(7, [1 / 144], ticks)
+        b = play(7, [1 / 30, 0.05, 1 / 90, 0.2], ticks)
+        # 補齊到相同 tick 再比較
+        while a.tick < b.tick and not a.is_game_over():
+            a.update(SIM_DT)
+        while b.tick < a.tick and not b.is_game_over():
+            b.update(SIM_DT)
+        self.assertGreaterEqual(a.wave_manager.wave, 3)
+        self.assertEqual(state(a), state(b))
+
+    def test_frame_hitch_is_capped(self):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=1)
+        steps = gm.advance(5.0)
+        self.assertEqual(steps, gm.clock.max_steps)
+        self.assertEqual(gm.tick, gm.clock.max_steps)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -34,6 +34,12 @@ class TestEnemies(unittest.TestCase):
         self.assertGreater(self.gm.money, 0)
         self.assertGreater(self.gm.score, 0)
 
+    def test_enemies_share_cached_image(self):
+        a = BasicEnemy((0,0), self.gm)
+        b = BasicEnemy((0,0), self.gm)
+        self.assertIs(a.image, b.image)
+        self.assertEqual(a.image.get_size(), (24, 24))
+
     def tearDown(self):
         pygame.quit()
 
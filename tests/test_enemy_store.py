@@ -0,0 +1,57 @@
+import unittest
+from src.game.game_manager import GameManager
+from src.game.enemy_store import np
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.enemies.fast_enemy import FastEnemy
+from src.utils.constants import SIM_DT, MAP_SIZE_NORMAL
+
+@unittest.skipIf(np is None, "需要 numpy")
+class TestEnemyStore(unittest.TestCase):
+    def make(self, vectorized):
+        return GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=1,
+                           vectorized=vectorized)
+
+    def test_movement_matches_scalar(self):
+        scalar, vector = self.make(False), self.make(True)
+        pairs = []
+        for cls in (BasicEnemy, FastEnemy):
+            start = scalar.map_manager.path_tiles[0]
+            pairs.append((scalar.spawn_enemy(cls, start), vector.spawn_enemy(cls, start)))
+        pairs[0][0].slow(0.5, 1.0)
+        pairs[0][1].slow(0.5, 1.0)
+        for _ in range(240):
+            for a, _ in pairs:
+                a.update(SIM_DT)
+            vector.enemy_store.update(SIM_DT)
+        for a, b in pairs:
+            self.assertAlmostEqual(a.x, b.x, places=6)
+            self.assertAlmostEqual(a.y, b.y, places=6)
+            self.assertAlmostEqual(a.distance, b.distance, places=6)
+            self.assertEqual(a.rect.center, b.rect.center)
+
+    def test_kill_detaches_and_reuses_slot(self):
+        gm = self.make(True)
+        start = gm.map_manager.path_tiles[0]
+        enemy = gm.spawn_enemy(BasicEnemy, start)
+        self.assertIsInstance(enemy, BasicEnemy)
+        enemy.take_damage(enemy.hp + 5)
+        self.assertFalse(enemy.is_alive())
+        self.assertEqual(enemy.hp, -5)
+        self.assertEqual(len(gm.enemy_store), 0)
+        other = gm.spawn_enemy(FastEnemy, start)
+        self.assertEqual(other._slot, 0)
+        self.assertEqual(enemy.hp, -5)
+        self.assertEqual(len(gm.enemy_grid), 1)
+
+    def test_grows_past_capacity(self):
+        gm = self.make(True)
+        start = gm.map_manager.path_tiles[0]
+        for _ in range(1000):
+            gm.spawn_enemy(BasicEnemy, start)
+        gm.update(SIM_DT)
+        gm.update(SIM_DT)
+        self.assertGreaterEqual(len(gm.enemy_store), 1000)
+        self.assertTrue(all(e.x > 24 for e in gm.enemies))
+
+if __name__ == "__main__":
+    unittest.main()
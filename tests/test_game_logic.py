@@ -33,6 +33,42 @@ class TestGameLogic(unittest.TestCase):
         self.gm.add_projectile(proj)
         self.assertIn(proj, self.gm.projectiles)
 
+    def test_map_background_is_cached(self):
+        self.gm.draw()
+        background = self.gm.map_manager.background
+        self.assertIsNotNone(background)
+        self.gm.draw()
+        self.assertIs(self.gm.map_manager.background, background)
+        self.gm.map_manager.invalidate_background()
+        self.gm.draw()
+        self.assertIsNot(self.gm.map_manager.background, background)
+
+    def test_dirty_rect_renderer_matches_full_redraw(self):
+        from src.entities.towers.machine_tower import MachineTower
+        from src.utils.constants import SIM_DT, TILE_SIZE
+        size = self.screen.get_size()
+        full = GameManager(pygame.Surface(size), seed=3)
+        dirty = GameManager(pygame.Surface(size), seed=3, dirty_rects=True)
+        for gm in (full, dirty):
+            row, col = gm.map_manager.path_tiles[1]
+            gm.build_tower(((col) * TILE_SIZE + 5, (row - 1) * TILE_SIZE + 5), MachineTower)
+        updated = []
+        for frame in range(240):
+            if frame == 60:
+                for gm in (full, dirty):
+                    gm.ui.selected_tower = next(iter(gm.towers))
+            if frame == 120:
+                for gm in (full, dirty):
+                    gm.ui.selected_tower = None
+            for gm in (full, dirty):
+                gm.update(SIM_DT)
+            self.assertIsNone(full.draw())
+            rects = dirty.draw()
+            if rects is not None:
+                updated.append(rects)
+            self.assertEqual(pygame.image.tobytes(full.screen, "RGB"), pygame.image.tobytes(dirty.screen, "RGB"))
+        self.assertTrue(updated)
+
     def tearDown(self):
         pygame.quit()
 
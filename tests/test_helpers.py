@@ -0,0 +1,25 @@
+import unittest
+import pygame
+from src.utils import helpers
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+
+    def test_font_and_text_are_cached(self):
+        self.assertIs(helpers.get_font("Arial", 12, sysfont=True), helpers.get_font("Arial", 12, sysfont=True))
+        a = helpers.render_text("50%", 12, (255, 255, 255), "Arial", sysfont=True)
+        b = helpers.render_text("50%", 12, (255, 255, 255), "Arial", sysfont=True)
+        self.assertIs(a, b)
+        self.assertIsNot(a, helpers.render_text("51%", 12, (255, 255, 255), "Arial", sysfont=True))
+
+    def test_text_cache_is_bounded(self):
+        for i in range(helpers.TEXT_CACHE_SIZE + 50):
+            helpers.render_text(str(i), 12, (0, 0, 0), "Arial", sysfont=True)
+        self.assertLessEqual(len(helpers._text_cache), helpers.TEXT_CACHE_SIZE)
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == "__main__":
+    unittest.main()
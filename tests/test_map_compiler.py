@@ -0,0 +1,130 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import main
+from src.game import snapshot
+from src.game.game_manager import GameManager
+from src.game.replay import Replay, ReplayRecorder
+from src.game.simulator import HeadlessSimulator
+from src.entities.towers.machine_tower import MachineTower
+from src.game.map_compiler import compile_map, compile_tiles, expand_waypoints, load_map, MapFormatError
+from src.game.map_generator import generate_path_tiles, MIN_SIZES
+from src.utils.constants import MAP_SIZE_EASY, MAP_SIZE_NORMAL, MAP_SIZE_HARD, SIM_DT, TILE_SIZE
+
+SMALL_MAP = {
+    "rows": 4, "cols": 5,
+    "waypoints": [[1, 0], [1, 3], [3, 3]],
+    "spots": [".....", "....#", "#...#", "....."],
+}
+
+class TestMapCompiler(unittest.TestCase):
+    def test_builtin_maps_match_generated_paths(self):
+        for difficulty, size in (("easy", MAP_SIZE_EASY), ("normal", MAP_SIZE_NORMAL), ("hard", MAP_SIZE_HARD)):
+            mm = GameManager(None, map_size=size, difficulty=difficulty, headless=True).map_manager
+            legacy = compile_tiles(size[0], size[1], generate_path_tiles(difficulty, *size))
+            self.assertEqual(mm.path_tiles, legacy.path_tiles)
+            self.assertEqual(mm.tower_spots, legacy.spots)
+
+    def test_generated_maps_for_other_sizes(self):
+        for difficulty, (rows, cols) in MIN_SIZES.items():
+            for size in ((rows, cols + 1), (rows * 2, cols * 3), (100, 150)):
+                mm = GameManager(None, map_size=size, difficulty=difficulty, headless=True).map_manager
+                self.assertEqual((mm.rows, mm.cols), size)
+            for size in ((rows - 1, cols), (rows, cols - 1), (10, 10)):
+                with self.assertRaises(MapFormatError):
+                    GameManager(None, map_size=size, difficulty=difficulty, headless=True)
+
+    def test_waypoints_and_spot_mask(self):
+        self.assertEqual(expand_waypoints([(0, 0), (0, 2), (2, 2)]), [(0, 0), (0, 1), (0, 2), (1, 2), (2, 2)])
+        compiled = compile_map(SMALL_MAP)
+        self.assertEqual(compiled.path_tiles, [(1, 0), (1, 1), (1, 2), (1, 3), (2, 3), (3, 3)])
+        self.assertEqual(compiled.spots, [(1, 4), (2, 0), (2, 4)])
+        self.assertEqual((compiled.spawn, compiled.castle), ((1, 0), (3, 3)))
+
+    def test_invalid_maps(self):
+        bad = [
+            dict(SMALL_MAP, waypoints=[[1, 0], [2, 3]]),            # 斜線
+            dict(SMALL_MAP, waypoints=[[1, 0], [1, 7]]),            # 超出地圖
+            dict(SMALL_MAP, waypoints=[[1, 0], [1, 3], [1, 1]]),    # 重複經過
+            dict(SMALL_MAP, spots=["#....", "....#", "#...#", "....."][:3]),
+            dict(SMALL_MAP, spots=[".....", "#...#", "#...#", "....."]),  # 塔位在路徑上
+            dict(SMALL_MAP, castle=[0, 0]),
+            {"rows": 4},
+            dict(SMALL_MAP, waypoints=[[1, 0, 0], [1, 3]]),     # 座標不是兩個數
+            dict(SMALL_MAP, waypoints=[[1, "a"], [1, 3]]),
+            dict(SMALL_MAP, waypoints=3),
+            dict(SMALL_MAP, spots=5),
+            dict(SMALL_MAP, spots=[1, 2, 3, 4]),
+            dict(SMALL_MAP, spawn=3),
+            dict(SMALL_MAP, castle=[3, 3, 0]),
+            [SMALL_MAP],
+        ]
+        for data in bad:
+            with self.assertRaises(MapFormatError):
+                compile_map(data)
+        with self.assertRaises(MapFormatError):
+            compile_tiles(4, 4, [(0, 0), (0, 2)])  # 不連續
+
+    def test_compiled_map_is_cached_by_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "small.json")
+            cache = os.path.join(tmp, "cache")
+            with open(path, "w") as f:
+                json.dump(SMALL_MAP, f)
+            first = load_map(path, cache_dir=cache)
+            self.assertEqual(len(os.listdir(cache)), 1)
+            cached = load_map(path, cache_dir=cache)
+            self.assertEqual((cached.path_tiles, cached.spots, cached.points),
+                             (first.path_tiles, first.spots, first.points))
+            with open(path, "w") as f:
+                json.dump(dict(SMALL_MAP, waypoints=[[1, 0], [1, 4]], spots=None), f)
+            self.assertEqual(load_map(path, cache_dir=cache).castle, (1, 4))
+            self.assertEqual(len(os.listdir(cache)), 2)
+            gm = GameManager(None, headless=True, map_file=path)
+            self.assertEqual((gm.map_manager.rows, gm.map_manager.cols), (4, 5))
+
+    def custom_game(self, tmp):
+        path = os.path.join(tmp, "line.json")
+        with open(path, "w") as f:
+            json.dump({"rows": 6, "cols": 12, "waypoints": [[2, 0], [2, 11]]}, f)
+        gm = GameManager(None, difficulty="normal", headless=True, seed=5, map_file=path)
+        gm.recorder = ReplayRecorder(gm)
+        gm.build_tower((2 * TILE_SIZE + TILE_SIZE // 2, 3 * TILE_SIZE + TILE_SIZE // 2), MachineTower)
+        for _ in range(1200):
+            gm.update(SIM_DT)
+        return gm
+
+    def test_snapshot_and_replay_keep_custom_map(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            gm = self.custom_game(tmp)
+            path = os.path.join(tmp, "game.rpl")
+            gm.recorder.save(path)
+            replay = Replay.load(path)
+        self.assertEqual(replay.map.path_tiles, gm.map_manager.path_tiles)
+        result = HeadlessSimulator.from_replay(replay).run_replay()
+        self.assertEqual((result["money"], result["score"], result["life"]), (gm.money, gm.score, gm.life))
+
+        restored = snapshot.loads(snapshot.dumps(gm))
+        self.assertEqual(restored.map_manager.path_tiles, gm.map_manager.path_tiles)
+        self.assertEqual(restored.map_manager.tower_spots, gm.map_manager.tower_spots)
+        for _ in range(300):
+            gm.update(SIM_DT)
+            restored.update(SIM_DT)
+        self.assertEqual((restored.money, restored.score, restored.life), (gm.money, gm.score, gm.life))
+        # 內建地圖不寫入地圖資料
+        self.assertIsNone(snapshot.read_settings(snapshot.dumps(GameManager(None, headless=True)))[2])
+
+    def test_main_reports_invalid_map(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.json")
+            with open(path, "w") as f:
+                json.dump(dict(SMALL_MAP, waypoints=[[1, 0], [2, 3]]), f)
+            with contextlib.redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(main.main(["--map", path]), 1)
+        self.assertIn("無法載入地圖", err.getvalue())
+
+if __name__ == "__main__":
+    unittest.main()
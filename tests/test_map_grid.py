@@ -0,0 +1,37 @@
+import unittest
+from src.game.game_manager import GameManager
+from src.game.map_manager import TILE_PATH, TILE_SPOT
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import TILE_SIZE, MAP_SIZE_NORMAL
+
+class TestOccupancyGrid(unittest.TestCase):
+    def setUp(self):
+        self.gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=0)
+        self.gm.money = 10000
+        self.mm = self.gm.map_manager
+
+    def test_grid_matches_path_and_spots(self):
+        for row, col in self.mm.path_tiles:
+            self.assertEqual(self.mm.tile_at(row, col), TILE_PATH)
+        for row, col in self.mm.tower_spots:
+            self.assertEqual(self.mm.tile_at(row, col), TILE_SPOT)
+        self.assertIsNone(self.mm.tile_at(-1, 0))
+        self.assertIsNone(self.mm.tile_at(0, self.mm.cols))
+
+    def test_place_select_and_sell(self):
+        row, col = self.mm.tower_spots[0]
+        pos = (col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+        self.assertTrue(self.gm.build_tower(pos, MachineTower))
+        tower = self.gm.tower_at(row, col)
+        self.assertIn(tower, self.gm.towers)
+        self.assertFalse(self.gm.build_tower(pos, MachineTower))  # 已有塔
+        self.assertIs(self.mm.tower_at_pixel(pos), tower)
+        self.assertIsNone(self.mm.tower_at_pixel((col * TILE_SIZE + 1, row * TILE_SIZE + 1)))  # 在格子內但不在塔上
+        path_row, path_col = self.mm.path_tiles[3]
+        self.assertFalse(self.gm.build_tower((path_col * TILE_SIZE + 5, path_row * TILE_SIZE + 5), MachineTower))
+        self.gm.sell_tower(tower)
+        self.assertEqual(self.mm.tile_at(row, col), TILE_SPOT)
+        self.assertTrue(self.gm.build_tower(pos, MachineTower))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+from src.game.path import PathPolyline
+from src.game.game_manager import GameManager
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.utils.constants import TILE_SIZE, SIM_DT, MAP_SIZE_HARD
+
+class TestPathPolyline(unittest.TestCase):
+    def setUp(self):
+        # 含轉角重複格的 L 形路徑
+        self.path = PathPolyline.from_tiles([(0, 0), (0, 1), (0, 2), (0, 2), (1, 2), (2, 2)])
+
+    def test_dedupes_and_measures(self):
+        self.assertEqual(len(self.path.points), 5)
+        self.assertEqual(self.path.length, 4 * TILE_SIZE)
+        self.assertEqual(self.path.exit_distance, 4 * TILE_SIZE - TILE_SIZE / 2)
+
+    def test_position_at(self):
+        half = TILE_SIZE // 2
+        self.assertEqual(self.path.position_at(-5), (half, half))
+        self.assertEqual(self.path.position_at(TILE_SIZE * 1.5), (half + TILE_SIZE * 1.5, half))
+        self.assertEqual(self.path.position_at(TILE_SIZE * 2.25), (half + 2 * TILE_SIZE, half + TILE_SIZE * 0.25))
+        self.assertEqual(self.path.position_at(1e9), (half + 2 * TILE_SIZE, half + 2 * TILE_SIZE))
+
+    def test_enemies_share_path(self):
+        gm = GameManager(None, map_size=MAP_SIZE_HARD, difficulty="hard", headless=True, seed=0)
+        a = BasicEnemy(gm.map_manager.path_tiles[0], gm)
+        b = BasicEnemy(gm.map_manager.path_tiles[0], gm)
+        self.assertIs(a.path, b.path)
+        a.update(SIM_DT)
+        self.assertAlmostEqual(a.distance, a.speed * SIM_DT)
+        while not gm.map_manager.is_enemy_at_end(a):
+            a.update(SIM_DT)
+        self.assertEqual(a.get_map_grid_pos(), gm.map_manager.path_tiles[-1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from src.game.game_manager import GameManager
+from src.utils.constants import MAP_SIZE_NORMAL
+from src.utils.profiler import FrameProfiler
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+    def __call__(self):
+        return self.t
+
+class TestFrameProfiler(unittest.TestCase):
+    def test_sections_and_percentiles(self):
+        clock = FakeClock()
+        profiler = FrameProfiler(capacity=100, clock=clock)
+        for i in range(150):
+            profiler.begin_frame()
+            with profiler.section("update"):
+                clock.t += (i % 100 + 1) / 1000
+            with profiler.section("update"):  # 同一幀多次進入會累加
+                clock.t += 0.001
+            profiler.end_frame(enemies=i)
+        self.assertEqual(len(profiler.frames), 100)  # 環狀緩衝區只保留最近的幀
+        self.assertEqual(profiler.frames[-1]["enemies"], 149)
+        p50, p95, p99 = profiler.percentiles("update")
+        self.assertLess(p50, p95)
+        self.assertLessEqual(p95, p99)
+        self.assertAlmostEqual(p99, profiler.percentiles("total")[2])
+
+    def test_disabled_profiler_records_nothing(self):
+        profiler = FrameProfiler(enabled=False)
+        profiler.begin_frame()
+        with profiler.section("update"):
+            pass
+        profiler.end_frame()
+        self.assertEqual(len(profiler.frames), 0)
+
+    def test_game_stages_and_export(self):
+        profiler = FrameProfiler()
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=0, profiler=profiler)
+        for _ in range(30):
+            profiler.begin_frame()
+            gm.advance(1 / 60)
+            profiler.end_frame(**gm.entity_counts())
+        for name in ("waves", "entities", "collisions"):
+            self.assertIn(name, profiler.sections)
+        with tempfile.TemporaryDirectory() as tmp:
+            profiler.export(os.path.join(tmp, "frames.csv"))
+            profiler.export(os.path.join(tmp, "frames.json"))
+            with open(os.path.join(tmp, "frames.csv"), newline="") as f:
+                rows = list(csv.DictReader(f))
+            with open(os.path.join(tmp, "frames.json")) as f:
+                data = json.load(f)
+        self.assertEqual(len(rows), 30)
+        self.assertIn("enemies", rows[0])
+        self.assertEqual(len(data["frames"]), 30)
+        self.assertIn("total", data["summary"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import gc
+import unittest
+import weakref
+import pygame
+from src.game.game_manager import GameManager
+from src.entities.projectiles.bullet import Bullet
+from src.entities.projectiles.ice_ball import IceBall
+from src.game.simulator import HeadlessSimulator
+
+class DummyEnemy:
+    def __init__(self, x, y):
+        self.x, self.y = x, y
+    def is_alive(self):
+        return True
+
+class TestProjectilePool(unittest.TestCase):
+    def setUp(self):
+        pygame.init()
+        self.gm = GameManager(pygame.Surface((640, 480)), seed=0)
+        Bullet._pool.clear()
+
+    def test_killed_projectile_is_reused(self):
+        target = DummyEnemy(200, 200)
+        bullet = Bullet.spawn(10, 10, target, 5, self.gm)
+        self.gm.add_projectile(bullet)
+        bullet.kill()
+        self.assertIsNone(bullet.target)
+        self.assertEqual(Bullet._pool, [bullet])
+        bullet.kill()  # 重複 kill 不可重複入池
+        self.assertEqual(len(Bullet._pool), 1)
+        again = Bullet.spawn(50, 60, target, 7, self.gm)
+        self.assertIs(again, bullet)
+        self.assertTrue(again.is_alive())
+        self.assertEqual((again.x, again.y, again.damage), (50, 60, 7))
+        self.assertEqual(again.rect.center, (50, 60))
+        self.assertIs(again.target, target)
+
+    def test_same_type_shares_image(self):
+        a = IceBall.spawn(0, 0, None, 1, self.gm)
+        b = IceBall(0, 0, None, 1, self.gm)
+        self.assertIs(a.image, b.image)
+        self.assertIsNot(a.image, Bullet.spawn(0, 0, None, 1, self.gm).image)
+        self.assertEqual(IceBall._pool, [])
+
+    def test_pool_does_not_keep_finished_game(self):
+        sim = HeadlessSimulator(seed=2)
+        gm = sim.game_manager
+        gm.add_projectile(Bullet.spawn(10, 10, None, 5, gm))
+        sim.step()  # 沒有目標的投射物在 update 中 kill 並回到物件池
+        self.assertEqual(len(Bullet._pool), 1)
+        self.assertIsNone(Bullet._pool[0].game_manager)
+        ref = weakref.ref(gm)
+        del sim, gm
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def tearDown(self):
+        pygame.quit()
+
+if __name__ == "__main__":
+    unittest.main()
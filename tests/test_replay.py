@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from src.game.game_manager import GameManager
+from src.game.replay import Replay, ReplayRecorder, ACTION_PLACE
+from src.game.simulator import HeadlessSimulator
+from src.entities.towers.cannon_tower import CannonTower
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import TILE_SIZE, SIM_DT, MAP_SIZE_NORMAL
+
+def center(row, col):
+    return (col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2)
+
+class TestReplay(unittest.TestCase):
+    def record_game(self, scheduled_projectiles=False):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=11,
+                         scheduled_projectiles=scheduled_projectiles)
+        gm.recorder = ReplayRecorder(gm)
+        script = {0: ("place", MachineTower, (6, 1)), 300: ("place", CannonTower, (6, 3)),
+                  900: ("upgrade", None, (6, 1)), 1500: ("sell", None, (6, 3)), 1600: ("place", MachineTower, (8, 6))}
+        for tick in range(2400):
+            if tick in script:
+                kind, tower_cls, (row, col) = script[tick]
+                if kind == "place":
+                    gm.build_tower(center(row, col), tower_cls)
+                elif kind == "upgrade":
+                    gm.upgrade_tower(gm.tower_at(row, col))
+                else:
+                    gm.sell_tower(gm.tower_at(row, col))
+            gm.update(SIM_DT)
+        return gm
+
+    def test_replay_reproduces_game(self):
+        gm = self.record_game()
+        self.assertEqual(len(gm.recorder.replay.actions), 5)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.rpl")
+            gm.recorder.save(path)
+            self.assertLess(os.path.getsize(path), 100)
+            replay = Replay.load(path)
+        self.assertEqual(replay.actions[0][:2], (0, ACTION_PLACE))
+        result = HeadlessSimulator.from_replay(replay).run_replay()
+        self.assertEqual(result["time"], gm.tick * SIM_DT)
+        self.assertEqual((result["money"], result["score"], result["life"], result["wave"]),
+                         (gm.money, gm.score, gm.life, gm.wave_manager.wave))
+
+    def test_replay_keeps_scheduled_projectiles(self):
+        gm = self.record_game(scheduled_projectiles=True)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "game.rpl")
+            gm.recorder.save(path)
+            replay = Replay.load(path)
+        self.assertTrue(replay.scheduled_projectiles)
+        sim = HeadlessSimulator.from_replay(replay)
+        self.assertIsNotNone(sim.game_manager.shots)
+        result = sim.run_replay()
+        self.assertEqual((result["money"], result["score"], result["life"], result["wave"]),
+                         (gm.money, gm.score, gm.life, gm.wave_manager.wave))
+
+    def test_rejects_other_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bad.rpl")
+            with open(path, "wb") as f:
+                f.write(b"\0" * 64)
+            with self.assertRaises(ValueError):
+                Replay.load(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import pygame
+from src.game import snapshot
+from src.game.game_manager import GameManager
+from src.game.shot_queue import intercept_time
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.projectiles.bullet import Bullet
+from src.entities.towers.machine_tower import MachineTower
+from src.entities.towers.cannon_tower import CannonTower
+from src.utils.constants import SIM_DT, TILE_SIZE, MAP_SIZE_NORMAL
+from tests.test_determinism import state
+
+def scheduled_game(seed=7):
+    gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=seed,
+                     scheduled_projectiles=True)
+    gm.money = 10000
+    for tower_cls, (row, col) in [(MachineTower, (6, 1)), (CannonTower, (6, 3)), (MachineTower, (8, 6))]:
+        gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), tower_cls)
+    return gm
+
+def shots(gm):
+    return [(type(s).__name__, s.origin, s.aim, s.fire_tick, s.hit_tick, s.target.spawn_id if s.target else -1)
+            for s in gm.shots.entries()]
+
+class TestShotQueue(unittest.TestCase):
+    def test_intercept_matches_enemy_position(self):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=1)
+        enemy = gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[0])
+        enemy.slow(0.5, 0.4)
+        t, aim = intercept_time(enemy.x + 150, enemy.y + 100, Bullet.speed, enemy, gm.map_manager.path)
+        for _ in range(round(t / SIM_DT)):
+            enemy.update(SIM_DT)
+        self.assertAlmostEqual(enemy.x, aim[0], delta=2)
+        self.assertAlmostEqual(enemy.y, aim[1], delta=2)
+
+    def test_scheduled_shots_skip_per_frame_update(self):
+        gm = scheduled_game()
+        seen = 0
+        for _ in range(30 * 60):
+            gm.update(SIM_DT)
+            seen = max(seen, len(gm.shots))
+            self.assertEqual(len(gm.projectiles), 0)
+        self.assertGreater(seen, 0)
+        self.assertGreater(gm.score, 0)
+        self.assertEqual(gm.entity_counts()["projectiles"], len(gm.shots))
+
+    def test_draw_interpolates_between_origin_and_aim(self):
+        pygame.init()
+        gm = GameManager(pygame.Surface((960, 720)), map_size=MAP_SIZE_NORMAL, seed=3, scheduled_projectiles=True)
+        enemy = gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[0])
+        bullet = Bullet.spawn(enemy.x + 200, enemy.y, enemy, 1, gm)
+        gm.add_projectile(bullet)
+        half = gm.tick + (bullet.hit_tick - gm.tick) // 2
+        while gm.tick < half:
+            gm.update(SIM_DT)
+        gm.draw()
+        (ox, oy), (ax, ay) = bullet.origin, bullet.aim
+        self.assertLess(min(ox, ax) - 1, bullet.x)
+        self.assertLess(bullet.x, max(ox, ax) + 1)
+        self.assertNotEqual((bullet.x, bullet.y), (ox, oy))
+        while gm.tick < bullet.hit_tick:
+            gm.update(SIM_DT)
+        self.assertEqual(len(gm.shots), 0)
+        self.assertLess(enemy.hp, enemy.max_hp)
+
+    def test_snapshot_keeps_scheduled_shots(self):
+        gm = scheduled_game()
+        while gm.tick < 20 * 60 or not gm.shots:
+            gm.update(SIM_DT)
+        restored = snapshot.loads(snapshot.dumps(gm))
+        self.assertEqual(shots(restored), shots(gm))
+        for _ in range(600):
+            gm.update(SIM_DT)
+            restored.update(SIM_DT)
+        self.assertEqual(state(restored), state(gm))
+        self.assertEqual(shots(restored), shots(gm))
+
+if __name__ == "__main__":
+    unittest.main()
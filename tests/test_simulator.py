@@ -0,0 +1,27 @@
+import unittest
+from src.game.simulator import HeadlessSimulator
+from src.entities.towers.machine_tower import MachineTower
+
+class TestHeadlessSimulator(unittest.TestCase):
+    def test_runs_without_display(self):
+        sim = HeadlessSimulator()
+        result = sim.run(max_time=120.0)
+        self.assertTrue(result["game_over"])
+        self.assertLessEqual(result["life"], 0)
+
+    def test_build_tower_and_shoot(self):
+        sim = HeadlessSimulator()
+        # 找緊鄰路徑起點的塔位
+        start_row, start_col = sim.game_manager.map_manager.path_tiles[1]
+        row, col = start_row - 1, start_col
+        self.assertIn((row, col), sim.game_manager.map_manager.tower_spots)
+        money = sim.game_manager.money
+        self.assertTrue(sim.build_tower(MachineTower, row, col))
+        self.assertEqual(sim.game_manager.money, money - MachineTower.cost)
+        self.assertFalse(sim.build_tower(MachineTower, row, col))
+        self.assertTrue(sim.build_tower(MachineTower, row, col + 2))
+        sim.run(max_time=30.0)
+        self.assertGreater(sim.game_manager.score, 0)
+
+if __name__ == "__main__":
+    unittest.main()
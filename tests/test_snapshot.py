@@ -0,0 +1,66 @@
+import os
+import tempfile
+import time
+import unittest
+from src.game import snapshot
+from src.game.enemy_store import np
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.game.game_manager import GameManager
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import SIM_DT, TILE_SIZE, MAP_SIZE_NORMAL
+from tests.test_determinism import play, state
+
+class TestSnapshot(unittest.TestCase):
+    def assert_restored_game_continues_identically(self, gm):
+        data = snapshot.dumps(gm)
+        restored = snapshot.loads(data)
+        self.assertEqual(state(restored), state(gm))
+        for _ in range(600):
+            gm.update(SIM_DT)
+            restored.update(SIM_DT)
+        self.assertEqual(state(restored), state(gm))
+
+    def test_round_trip_mid_wave(self):
+        gm = play(7, [1 / 60], 60 * 60)
+        while not gm.projectiles:  # 確保存檔時有飛行中的投射物
+            gm.update(SIM_DT)
+        self.assert_restored_game_continues_identically(gm)
+
+    @unittest.skipIf(np is None, "需要 numpy")
+    def test_round_trip_vectorized(self):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=7, vectorized=True)
+        gm.money = 10000
+        row, col = gm.map_manager.path_tiles[1]
+        gm.build_tower(((col) * TILE_SIZE + 5, (row - 1) * TILE_SIZE + 5), MachineTower)
+        for _ in range(40 * 60):
+            gm.update(SIM_DT)
+        self.assertIsNotNone(snapshot.loads(snapshot.dumps(gm)).enemy_store)
+        self.assert_restored_game_continues_identically(gm)
+
+    def test_file_round_trip_and_speed(self):
+        gm = play(3, [1 / 60], 10 * 60)
+        start_tile = gm.map_manager.path_tiles[0]
+        for _ in range(5000):
+            gm.spawn_enemy(BasicEnemy, start_tile)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "save.bin")
+            start = time.perf_counter()
+            snapshot.save(gm, path)
+            restored = snapshot.load(path)
+            elapsed = time.perf_counter() - start
+            self.assertLess(os.path.getsize(path), 5000 * 100)
+        self.assertEqual(len(restored.enemies), len(gm.enemies))
+        self.assertLess(elapsed, 1.0)
+
+    def test_rejects_other_data(self):
+        with self.assertRaises(ValueError):
+            snapshot.loads(b"\0" * 64)
+
+    def test_rejects_other_versions(self):
+        data = bytearray(snapshot.dumps(play(3, [1 / 60], 60)))
+        data[4:6] = (snapshot.VERSION - 1).to_bytes(2, "little")
+        with self.assertRaises(ValueError):
+            snapshot.loads(bytes(data))
+
+if __name__ == "__main__":
+    unittest.main()
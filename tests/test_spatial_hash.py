@@ -0,0 +1,72 @@
+import random
+import unittest
+import pygame
+from src.game.game_manager import GameManager
+from src.game.spatial_hash import SpatialHash
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.projectiles.bullet import Bullet
+from src.utils.constants import MAP_SIZE_HARD
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+class TestSpatialHash(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.grid = SpatialHash(48)
+        self.points = [Point(rng.uniform(0, 1440), rng.uniform(0, 960)) for _ in range(500)]
+        for p in self.points:
+            self.grid.insert(p)
+
+    def brute_force(self, x, y, r):
+        return {p for p in self.points if (p.x - x) ** 2 + (p.y - y) ** 2 <= r * r}
+
+    def test_query_matches_brute_force(self):
+        for x, y, r in [(100, 100, 90), (700, 480, 120), (0, 0, 32), (1440, 960, 200)]:
+            self.assertEqual(set(self.grid.query_circle(x, y, r)), self.brute_force(x, y, r))
+
+    def test_move_and_remove(self):
+        p = self.points[0]
+        p.x, p.y = 1000.5, 20.25
+        self.grid.move(p)
+        self.assertIn(p, self.grid.query_circle(1000, 20, 5))
+        self.grid.remove(p)
+        self.grid.remove(p)
+        self.points.remove(p)
+        self.assertEqual(len(self.grid), 499)
+        self.assertEqual(set(self.grid.query_circle(1000, 20, 300)), self.brute_force(1000, 20, 300))
+
+    def test_query_rect_is_superset(self):
+        left, top, right, bottom = 300, 200, 420, 260
+        found = set(self.grid.query_rect(left, top, right, bottom))
+        inside = {p for p in self.points if left <= p.x <= right and top <= p.y <= bottom}
+        self.assertTrue(inside <= found)
+
+class TestBroadPhaseCollisions(unittest.TestCase):
+    def test_hits_match_spritecollide(self):
+        rng = random.Random(5)
+        gm = GameManager(None, map_size=MAP_SIZE_HARD, difficulty="hard", headless=True, seed=5)
+        for _ in range(200):
+            enemy = BasicEnemy((0, 0), gm)
+            enemy.x, enemy.y = rng.uniform(0, 1440), rng.uniform(0, 960)
+            enemy.rect.center = (enemy.x, enemy.y)
+            gm.add_enemy(enemy)
+        projectiles = []
+        # 以下投射物改掉了 on_hit，不可留在跨遊戲共用的物件池中
+        self.addCleanup(Bullet._pool.clear)
+        for _ in range(300):
+            p = Bullet(rng.uniform(0, 1440), rng.uniform(0, 960), None, 1, gm)
+            p.rect.center = (p.x, p.y)
+            projectiles.append(p)
+            gm.add_projectile(p)
+        expected = {p: pygame.sprite.spritecollide(p, gm.enemies, False) for p in projectiles}
+        hits = {}
+        for p in projectiles:
+            p.on_hit = lambda enemy, p=p: hits.setdefault(p, []).append(enemy)
+        gm.check_collisions()
+        self.assertEqual({p: v for p, v in expected.items() if v}, hits)
+
+if __name__ == "__main__":
+    unittest.main()
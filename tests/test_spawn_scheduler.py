@@ -0,0 +1,101 @@
+import os
+import tempfile
+import unittest
+from src.game.game_manager import GameManager
+from src.game.spawn_scheduler import SpawnScheduler, compile_wave, load_waves
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.enemies.fast_enemy import FastEnemy
+from src.entities.enemies.tank_enemy import TankEnemy
+from src.game import snapshot
+from src.game.replay import Replay, ReplayRecorder
+from src.game.simulator import HeadlessSimulator
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import TILE_SIZE, MAP_SIZE_NORMAL
+
+class TestSpawnScheduler(unittest.TestCase):
+    def test_streams_run_in_parallel(self):
+        spawns = compile_wave([
+            {"enemy": "basic", "count": 3, "interval": 1.0},
+            {"enemy": "tank", "count": 1, "delay": 0.5},
+            {"enemy": "fast", "count": 2, "interval": 0.25, "delay": 0.5, "stream": 1},
+        ])
+        self.assertEqual(sorted(spawns, key=lambda s: s[0]), [
+            (0.0, BasicEnemy), (0.5, FastEnemy), (0.75, FastEnemy), (1.0, BasicEnemy),
+            (2.0, BasicEnemy), (2.5, TankEnemy)])
+        with self.assertRaises(ValueError):
+            compile_wave([{"enemy": "dragon"}])
+
+    def test_pop_due_returns_everything_due(self):
+        scheduler = SpawnScheduler()
+        for time, enemy_cls in [(1.0, TankEnemy), (0.1, BasicEnemy), (0.1, FastEnemy)]:
+            scheduler.schedule(time, enemy_cls)
+        self.assertEqual(scheduler.pop_due(0.05), [])
+        self.assertEqual(scheduler.pop_due(0.5), [BasicEnemy, FastEnemy])
+        self.assertEqual(len(scheduler), 1)
+
+    def test_large_dt_spawns_whole_batch(self):
+        waves = [[{"enemy": "basic", "count": 2000, "interval": 0.001}]]
+        gm = GameManager(None, headless=True, seed=1, waves=waves)
+        gm.wave_manager.update(1.0)
+        self.assertEqual(len(gm.enemies), 1000 + 1)
+        gm.wave_manager.update(1.0)
+        self.assertEqual(len(gm.enemies), 2000)
+        self.assertEqual(gm.wave_manager.enemies_to_spawn, [])
+
+    def test_timing_independent_of_step(self):
+        waves = [[{"enemy": "basic", "count": 5, "interval": 0.3, "delay": 0.2},
+                  {"enemy": "fast", "count": 5, "interval": 0.7, "stream": 1}]]
+        counts = []
+        for dt in (1 / 60, 1 / 7):
+            gm = GameManager(None, headless=True, seed=1, waves=waves)
+            t = 0.0
+            while t < 2.0 - 1e-9:
+                gm.wave_manager.update(dt)
+                t += dt
+            counts.append(len(gm.enemies))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_example_file_and_fallback(self):
+        waves = load_waves("assets/waves/example.json")
+        gm = GameManager(None, headless=True, seed=3, waves=waves)
+        wm = gm.wave_manager
+        wm.wave = len(waves) + 1
+        wm.start_wave()
+        self.assertEqual(len(wm.enemies_to_spawn), wm.enemies_per_wave + wm.wave * 2)
+
+    def test_snapshot_keeps_schedule(self):
+        waves = [[{"enemy": "tank", "count": 4, "interval": 1.0},
+                  {"enemy": "fast", "count": 4, "interval": 1.0, "stream": 1}]]
+        gm = GameManager(None, headless=True, seed=5, waves=waves)
+        for _ in range(90):
+            gm.update(1 / 60)
+        restored = snapshot.loads(snapshot.dumps(gm))
+        self.assertEqual(restored.wave_manager.scheduler.entries(), gm.wave_manager.scheduler.entries())
+        self.assertEqual(restored.wave_manager.time, gm.wave_manager.time)
+
+    def test_snapshot_and_replay_keep_custom_waves(self):
+        waves = load_waves("assets/waves/example.json")
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=5, waves=waves)
+        gm.recorder = ReplayRecorder(gm)
+        for row, col in [(6, 1), (6, 3), (8, 6)]:
+            gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), MachineTower)
+        while gm.wave_manager.wave < 2:
+            gm.update(1 / 60)
+        restored = snapshot.loads(snapshot.dumps(gm))
+        self.assertEqual(restored.wave_manager.waves, waves)
+        # 之後進入檔案中的第 3 波與內建規則的第 4 波
+        for _ in range(3600):
+            gm.update(1 / 60)
+            restored.update(1 / 60)
+        self.assertEqual((restored.next_enemy_id, restored.score), (gm.next_enemy_id, gm.score))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "waves.rpl")
+            gm.recorder.save(path)
+            replay = Replay.load(path)
+        self.assertEqual(replay.waves, waves)
+        result = HeadlessSimulator.from_replay(replay).run_replay()
+        self.assertEqual((result["score"], result["wave"]), (gm.score, gm.wave_manager.wave))
+
+if __name__ == "__main__":
+    unittest.main()
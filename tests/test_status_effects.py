@@ -0,0 +1,129 @@
+import unittest
+from src.game import snapshot
+from src.game.game_manager import GameManager
+from src.game.status_effects import EFFECT_SLOW, EFFECT_STUN, EFFECT_BURN, EFFECT_ARMOR_BREAK, BURN_MAX_STACKS
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.enemies.tank_enemy import TankEnemy
+from src.entities.projectiles.ice_ball import IceBall
+from src.entities.towers.freeze_tower import FreezeTower
+from src.utils.constants import SIM_DT, TILE_SIZE, MAP_SIZE_NORMAL
+from tests.test_determinism import state
+
+class TestStatusEffects(unittest.TestCase):
+    def setUp(self):
+        self.gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=1)
+        self.gm.wave_manager.update = lambda dt: None
+        self.effects = self.gm.status_effects
+
+    def spawn(self, enemy_cls=BasicEnemy):
+        return self.gm.spawn_enemy(enemy_cls, self.gm.map_manager.path_tiles[0])
+
+    def run_ticks(self, n):
+        for _ in range(n):
+            self.gm.update(SIM_DT)
+
+    def test_slow_keeps_strongest_ratio_and_longest_time(self):
+        enemy = self.spawn()
+        enemy.slow(0.5, 1.0)
+        enemy.slow(0.8, 2.0)
+        self.assertEqual(enemy.speed_factor, 0.5)
+        self.assertAlmostEqual(self.effects.remaining(enemy, EFFECT_SLOW), 2.0)
+        self.assertIsNotNone(self.effects.get(enemy, EFFECT_SLOW))
+        self.run_ticks(round(2.0 / SIM_DT))
+        self.assertEqual(enemy.speed_factor, 0.5)
+        self.run_ticks(1)
+        self.assertEqual(enemy.speed_factor, 1.0)
+        self.assertIsNone(self.effects.get(enemy, EFFECT_SLOW))
+
+    def test_slowed_enemy_moves_at_reduced_speed_until_expiry(self):
+        slowed, normal = self.spawn(), self.spawn()
+        slowed.slow(0.5, 1.0)
+        self.run_ticks(round(1.0 / SIM_DT))
+        self.assertAlmostEqual(slowed.distance, normal.distance / 2)
+        self.run_ticks(60)
+        self.assertAlmostEqual(normal.distance - slowed.distance, normal.speed * 0.5)
+
+    def test_stun_overrides_slow(self):
+        enemy = self.spawn()
+        enemy.slow(0.5, 2.0)
+        enemy.add_effect(EFFECT_STUN, 1, 0.5)
+        self.assertEqual(enemy.speed_factor, 0.0)
+        self.run_ticks(30)
+        self.assertEqual(enemy.distance, 0)
+        self.run_ticks(1)
+        self.assertEqual(enemy.speed_factor, 0.5)
+
+    def test_predict_distance_follows_effects(self):
+        enemy = self.spawn()
+        enemy.add_effect(EFFECT_STUN, 1, 0.5)
+        enemy.slow(0.5, 1.5)
+        predicted = self.effects.predict_distance(enemy, 2.0)
+        self.run_ticks(120)
+        self.assertAlmostEqual(enemy.distance, predicted, delta=enemy.speed * SIM_DT)
+
+    def test_burn_stacks_are_capped(self):
+        enemy = self.spawn(TankEnemy)
+        for _ in range(BURN_MAX_STACKS + 2):
+            enemy.add_effect(EFFECT_BURN, 10, 1.0)
+        self.assertEqual(len(self.effects.get(enemy, EFFECT_BURN)), BURN_MAX_STACKS)
+        self.assertEqual(self.effects.burning[enemy], 10 * BURN_MAX_STACKS)
+        hp = enemy.hp
+        self.run_ticks(60)
+        self.assertAlmostEqual(hp - enemy.hp, 10 * BURN_MAX_STACKS)
+        self.run_ticks(1)
+        self.assertNotIn(enemy, self.effects.burning)
+
+    def test_burn_kills_and_forgets_enemy(self):
+        enemy = self.spawn()
+        enemy.add_effect(EFFECT_BURN, enemy.hp * 2, 5.0)
+        self.run_ticks(60)
+        self.assertFalse(enemy.is_alive())
+        self.assertNotIn(enemy, self.effects.burning)
+        self.run_ticks(5 * 60)
+        self.assertEqual(len(self.effects), 0)
+
+    def test_armor_break_amplifies_damage(self):
+        enemy = self.spawn(TankEnemy)
+        enemy.add_effect(EFFECT_ARMOR_BREAK, 0.5, 1.0)
+        enemy.add_effect(EFFECT_ARMOR_BREAK, 0.25, 1.0)
+        hp = enemy.hp
+        enemy.take_damage(10)
+        self.assertAlmostEqual(hp - enemy.hp, 15)
+
+    def test_refreshed_effect_leaves_single_live_heap_entry(self):
+        enemy = self.spawn()
+        for i in range(10):
+            enemy.slow(0.5, 0.1 * (i + 1))
+            self.run_ticks(1)
+        self.assertEqual(len(self.effects), 1)
+        self.run_ticks(round(1.0 / SIM_DT) + 1)
+        self.assertEqual(enemy.speed_factor, 1.0)
+        self.assertEqual(len(self.effects), 0)
+
+    def test_ice_ball_applies_slow(self):
+        enemy = self.spawn(TankEnemy)
+        IceBall.spawn(enemy.x, enemy.y, enemy, 1, self.gm).on_hit(enemy)
+        self.assertEqual(enemy.speed_factor, IceBall.slow_effect)
+        self.assertAlmostEqual(self.effects.remaining(enemy, EFFECT_SLOW), IceBall.slow_time)
+
+    def test_snapshot_keeps_effects(self):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, difficulty="normal", headless=True, seed=4)
+        gm.money = 10000
+        for row, col in [(6, 1), (8, 6)]:
+            gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), FreezeTower)
+        while not len(gm.status_effects):
+            gm.update(SIM_DT)
+        enemy = next(iter(gm.enemies))
+        enemy.add_effect(EFFECT_BURN, 3, 2.0)
+        enemy.add_effect(EFFECT_ARMOR_BREAK, 0.3, 1.0)
+        restored = snapshot.loads(snapshot.dumps(gm))
+        effects = lambda g: [(e.spawn_id, f.kind, f.magnitude, f.expires, f.seq) for e, f in g.status_effects.entries()]
+        self.assertEqual(effects(restored), effects(gm))
+        for _ in range(600):
+            gm.update(SIM_DT)
+            restored.update(SIM_DT)
+        self.assertEqual(state(restored), state(gm))
+        self.assertEqual(effects(restored), effects(gm))
+
+if __name__ == "__main__":
+    unittest.main()
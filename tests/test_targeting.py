@@ -0,0 +1,113 @@
+import random
+import unittest
+from src.game import snapshot
+from src.game.game_manager import GameManager
+from src.game.enemy_store import np
+from src.game.path import PathPolyline
+from src.game.replay import ReplayRecorder, ReplayPlayer
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import SIM_DT, TILE_SIZE, MAP_SIZE_HARD, MAP_SIZE_NORMAL
+
+class TestTargeting(unittest.TestCase):
+    def setUp(self):
+        self.gm = GameManager(None, map_size=MAP_SIZE_HARD, difficulty="hard", headless=True, seed=2)
+        self.gm.wave_manager.update = lambda dt: None
+        self.gm.money = 10 ** 6
+        self.path = self.gm.map_manager.path
+
+    def place_enemies(self, distances):
+        enemies = []
+        for d in distances:
+            enemy = self.gm.spawn_enemy(BasicEnemy, self.gm.map_manager.path_tiles[0])
+            enemy.distance = d
+            enemy.x, enemy.y = self.path.position_at(d)
+            enemies.append(enemy)
+        return enemies
+
+    def test_coverage_matches_sampled_path(self):
+        path = PathPolyline([(0, 0), (100, 0), (100, 100), (0, 100)])
+        intervals = path.coverage(50, 50, 60)
+        for step in range(0, int(path.length) + 1):
+            x, y = path.position_at(step)
+            inside = (x - 50) ** 2 + (y - 50) ** 2 <= 60 ** 2
+            covered = any(a - 1e-6 <= step <= b + 1e-6 for a, b in intervals)
+            self.assertEqual(inside, covered, step)
+        self.assertEqual(path.coverage(500, 500, 10), [])
+
+    def test_target_is_in_range_and_matches_mode(self):
+        rng = random.Random(4)
+        enemies = self.place_enemies([rng.uniform(0, self.path.exit_distance) for _ in range(300)])
+        for enemy in enemies:
+            enemy.hp = rng.randint(1, 100)
+        for row, col in self.gm.map_manager.tower_spots[::7]:
+            tower = MachineTower(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2, self.gm)
+            in_range = [e for e in enemies if tower.distance_to(e) <= tower.range + 1e-6]
+            for mode in ("first", "last", "strongest"):
+                tower.target_mode = mode
+                target = tower.find_target()
+                if not in_range:
+                    self.assertIsNone(target)
+                    continue
+                self.assertIn(target, in_range)
+                if mode == "first":
+                    self.assertEqual(target.distance, max(e.distance for e in in_range))
+                elif mode == "last":
+                    self.assertEqual(target.distance, min(e.distance for e in in_range))
+                else:
+                    self.assertEqual(target.hp, max(e.hp for e in in_range))
+
+    def test_dead_enemies_are_skipped(self):
+        row, col = self.gm.map_manager.path_tiles[2]
+        tower = MachineTower(col * TILE_SIZE + TILE_SIZE // 2, (row - 1) * TILE_SIZE + TILE_SIZE // 2, self.gm)
+        front, back = self.place_enemies([2 * TILE_SIZE + 10, 2 * TILE_SIZE - 10])
+        self.assertIs(tower.find_target(), front)
+        front.kill()
+        self.assertIs(tower.find_target(), back)
+
+    @unittest.skipIf(np is None, "需要 numpy")
+    def test_vectorized_index_matches_scalar(self):
+        rng = random.Random(5)
+        distances = [rng.choice([TILE_SIZE * 3.0, rng.uniform(0, self.path.exit_distance)]) for _ in range(200)]
+        hps = [rng.randint(1, 100) for _ in distances]
+        games = []
+        for vectorized in (False, True):
+            gm = GameManager(None, map_size=MAP_SIZE_HARD, difficulty="hard", headless=True, seed=2,
+                             vectorized=vectorized)
+            self.gm = gm
+            enemies = self.place_enemies(distances)
+            for enemy, hp in zip(enemies, hps):
+                enemy.hp = hp
+            for enemy in enemies[::5]:
+                enemy.kill()
+            towers = [MachineTower(col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2, gm)
+                      for row, col in gm.map_manager.tower_spots[::11]]
+            games.append(towers)
+        for scalar, vector in zip(*games):
+            for mode in ("first", "last", "strongest"):
+                scalar.target_mode = vector.target_mode = mode
+                a, b = scalar.find_target(), vector.find_target()
+                self.assertEqual(a and a.spawn_id, b and b.spawn_id)
+                if a is not None:  # 同一個 tick 中被擊殺的敵人要被略過
+                    a.kill()
+                    b.kill()
+                    a, b = scalar.find_target(), vector.find_target()
+                    self.assertEqual(a and a.spawn_id, b and b.spawn_id)
+
+    def test_target_mode_is_replayed_and_saved(self):
+        gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=9)
+        gm.recorder = ReplayRecorder(gm)
+        row, col = gm.map_manager.path_tiles[2]
+        gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, (row - 1) * TILE_SIZE + TILE_SIZE // 2), MachineTower)
+        tower = gm.tower_at(row - 1, col)
+        self.assertFalse(gm.set_target_mode(tower, "random"))
+        self.assertTrue(gm.set_target_mode(tower, "strongest"))
+        self.assertEqual(snapshot.loads(snapshot.dumps(gm)).tower_at(row - 1, col).target_mode, "strongest")
+
+        replayed = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=9)
+        replayed.input_source = ReplayPlayer(gm.recorder.replay)
+        replayed.update(SIM_DT)
+        self.assertEqual(replayed.tower_at(row - 1, col).target_mode, "strongest")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import unittest
+from src.game.game_manager import GameManager
+from src.game import snapshot
+from src.entities.enemies.basic_enemy import BasicEnemy
+from src.entities.towers.machine_tower import MachineTower
+from src.utils.constants import SIM_DT, TILE_SIZE, MAP_SIZE_NORMAL
+
+def build(gm, row, col, tower_cls=MachineTower):
+    gm.build_tower((col * TILE_SIZE + TILE_SIZE // 2, row * TILE_SIZE + TILE_SIZE // 2), tower_cls)
+    return gm.tower_at(row, col)
+
+class TestTowerScheduler(unittest.TestCase):
+    def setUp(self):
+        self.gm = GameManager(None, map_size=MAP_SIZE_NORMAL, headless=True, seed=1)
+        self.gm.wave_manager.update = lambda dt: None
+        self.gm.money = 10000
+        self.shots = []
+
+    def count_shots(self, tower):
+        shoot = tower.shoot
+        tower.shoot = lambda target: (self.shots.append((self.gm.tick, target)), shoot(target))
+
+    def test_idle_tower_parks_and_wakes_when_enemy_enters(self):
+        gm = self.gm
+        start_row, start_col = gm.map_manager.path_tiles[0]
+        near = build(gm, start_row - 1, start_col + 1)
+        far = build(gm, 12, 18)
+        self.assertNotIn(gm.map_manager.path_tiles[0], [(c[1], c[0]) for c in far.coverage_cells])
+        gm.update(SIM_DT)
+        self.assertTrue(near.parked and far.parked)
+        self.assertEqual(len(gm.tower_scheduler), 0)
+        self.count_shots(near)
+        gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[0])
+        self.assertFalse(near.parked)
+        self.assertTrue(far.parked)
+        gm.update(SIM_DT)
+        self.assertEqual(len(self.shots), 1)
+
+    def test_fire_rate_matches_attack_speed(self):
+        gm = self.gm
+        row, col = gm.map_manager.path_tiles[3]
+        tower = build(gm, row - 1, col)
+        self.count_shots(tower)
+        enemy = gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[3])
+        enemy.speed = 0
+        enemy.distance = 3 * TILE_SIZE  # 停在第 4 格（路徑前段為直線）
+        enemy.hp = enemy.max_hp = 10 ** 9
+        for _ in range(round(5.0 / SIM_DT)):
+            gm.update(SIM_DT)
+        # 第一發在第一個 tick，之後每 attack_speed 秒一發
+        self.assertEqual(len(self.shots), int(5.0 / MachineTower.attack_speed))
+        ticks = [tick for tick, _ in self.shots]
+        self.assertEqual({b - a for a, b in zip(ticks, ticks[1:])}, {round(MachineTower.attack_speed / SIM_DT)})
+
+    def test_sold_tower_stops_and_unwatches(self):
+        gm = self.gm
+        start_row, start_col = gm.map_manager.path_tiles[0]
+        tower = build(gm, start_row - 1, start_col + 1)
+        gm.update(SIM_DT)
+        self.assertTrue(tower.parked)
+        gm.sell_tower(tower)
+        self.assertFalse(gm.enemy_grid.watchers)
+        self.count_shots(tower)
+        gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[0])
+        for _ in range(60):
+            gm.update(SIM_DT)
+        self.assertEqual(self.shots, [])
+
+    def test_snapshot_keeps_parked_and_ready_towers(self):
+        gm = self.gm
+        start_row, start_col = gm.map_manager.path_tiles[0]
+        build(gm, start_row - 1, start_col + 1)
+        build(gm, 12, 18)
+        gm.spawn_enemy(BasicEnemy, gm.map_manager.path_tiles[0])
+        for _ in range(45):
+            gm.update(SIM_DT)
+        restored = snapshot.loads(snapshot.dumps(gm))
+        describe = lambda g: [(t.x, t.y, ready) for t, ready in g.tower_scheduler.entries()]
+        self.assertEqual(describe(restored), describe(gm))
+        self.assertEqual([t.parked for t in restored.towers], [t.parked for t in gm.towers])
+
+if __name__ == "__main__":
+    unittest.main()